@@ -0,0 +1,37 @@
+"""form field stats
+
+Revision ID: 5d2e8f0a6c31
+Revises: b41c9e2d7a10
+Create Date: 2026-10-17 11:40:27.503119
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8f0a6c31'
+down_revision: Union[str, None] = 'b41c9e2d7a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('form_field_stats',
+    sa.Column('form_id', sa.UUID(), nullable=False),
+    sa.Column('field_id', sa.String(), nullable=False),
+    sa.Column('option_value', sa.String(), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['form_id'], ['forms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('form_id', 'field_id', 'option_value')
+    )
+    # Existing responses are not counted here; run
+    # `python -m app.commands.rebuild_form_stats --all` after upgrading.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('form_field_stats')
@@ -0,0 +1,59 @@
+"""webhooks
+
+Revision ID: 7b5d0e3f9a42
+Revises: 3c8e1f5a9b27
+Create Date: 2026-10-17 23:41:08.513926
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b5d0e3f9a42'
+down_revision: Union[str, None] = '3c8e1f5a9b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('webhook_subscriptions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('form_id', sa.UUID(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('secret', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('last_success_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_failure_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('consecutive_failures', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['form_id'], ['forms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_webhook_subscriptions_form_id', 'webhook_subscriptions', ['form_id'], unique=False)
+    op.create_table('webhook_outbox',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('subscription_id', sa.UUID(), nullable=False),
+    sa.Column('response_id', sa.UUID(), nullable=False),
+    sa.Column('response_created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['subscription_id'], ['webhook_subscriptions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_webhook_outbox_next_attempt_at', 'webhook_outbox', ['next_attempt_at'], unique=False)
+    op.create_index('ix_webhook_outbox_subscription_id', 'webhook_outbox', ['subscription_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_webhook_outbox_subscription_id', table_name='webhook_outbox')
+    op.drop_index('ix_webhook_outbox_next_attempt_at', table_name='webhook_outbox')
+    op.drop_table('webhook_outbox')
+    op.drop_index('ix_webhook_subscriptions_form_id', table_name='webhook_subscriptions')
+    op.drop_table('webhook_subscriptions')
@@ -0,0 +1,44 @@
+"""response archive chunks
+
+Revision ID: a4f6c2e9d185
+Revises: e7a14c9b3d52
+Create Date: 2026-10-17 20:12:44.305117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f6c2e9d185'
+down_revision: Union[str, None] = 'e7a14c9b3d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('response_archive_chunks',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('form_id', sa.UUID(), nullable=False),
+    sa.Column('path', sa.String(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('first_created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('first_id', sa.UUID(), nullable=False),
+    sa.Column('last_created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_id', sa.UUID(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['form_id'], ['forms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_response_archive_chunks_form_id_first', 'response_archive_chunks',
+                    ['form_id', 'first_created_at', 'first_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Archived rows stay in their files; restore them before downgrading
+    op.drop_index('ix_response_archive_chunks_form_id_first', table_name='response_archive_chunks')
+    op.drop_table('response_archive_chunks')
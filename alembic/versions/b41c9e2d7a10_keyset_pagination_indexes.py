@@ -0,0 +1,32 @@
+"""keyset pagination indexes
+
+Revision ID: b41c9e2d7a10
+Revises: 627fb59cea79
+Create Date: 2026-10-17 09:12:04.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41c9e2d7a10'
+down_revision: Union[str, None] = '627fb59cea79'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite indexes backing the (created_at, id) keyset pagination.
+    # The leading column also serves plain lookups by form_id / owner_id.
+    op.create_index('ix_responses_form_id_created_at_id', 'responses', ['form_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_forms_owner_id_created_at_id', 'forms', ['owner_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_forms_owner_id_created_at_id', table_name='forms')
+    op.drop_index('ix_responses_form_id_created_at_id', table_name='responses')
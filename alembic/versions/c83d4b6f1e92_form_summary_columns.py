@@ -0,0 +1,35 @@
+"""form summary columns
+
+Revision ID: c83d4b6f1e92
+Revises: 9a7f3c1e5b24
+Create Date: 2026-10-17 15:22:38.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c83d4b6f1e92'
+down_revision: Union[str, None] = '9a7f3c1e5b24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('forms', sa.Column('title', sa.String(), nullable=True))
+    op.add_column('forms', sa.Column('field_count', sa.Integer(), nullable=True))
+    # Backfill from the stored definitions; new writes are kept in sync by the ORM.
+    op.execute(
+        "UPDATE forms SET title = data->>'title', "
+        "field_count = COALESCE(jsonb_array_length(data->'fields'), 0)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('forms', 'field_count')
+    op.drop_column('forms', 'title')
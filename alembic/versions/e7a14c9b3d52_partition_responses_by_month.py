@@ -0,0 +1,103 @@
+"""partition responses by month
+
+Revision ID: e7a14c9b3d52
+Revises: c83d4b6f1e92
+Create Date: 2026-10-17 18:41:07.116204
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a14c9b3d52'
+down_revision: Union[str, None] = 'c83d4b6f1e92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months of partitions created beyond the current one; afterwards
+# `python -m app.commands.manage_partitions ensure` keeps them ahead.
+PARTITIONS_AHEAD = 3
+
+
+def _months(first: date, last: date):
+    month = first
+    while month <= last:
+        yield month
+        month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _create_responses_table(name: str, *constraints, created_at_nullable: bool = False, **kw) -> None:
+    op.create_table(name,
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('form_id', sa.UUID(), nullable=False),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=created_at_nullable),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['form_id'], ['forms.id'], name='responses_form_id_fkey'),
+    *constraints,
+    **kw
+    )
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_responses_form_id_created_at_id', 'responses', ['form_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_responses_data_path_ops', 'responses', ['data'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'data': 'jsonb_path_ops'})
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Copies every response; run during a maintenance window on large installs.
+    op.rename_table('responses', 'responses_unpartitioned')
+    op.execute('ALTER INDEX ix_responses_form_id_created_at_id RENAME TO ix_responses_unpartitioned_form_id_created_at_id')
+    op.execute('ALTER INDEX ix_responses_data_path_ops RENAME TO ix_responses_unpartitioned_data_path_ops')
+    # Frees the name for the new table's FK, which later migrations refer to
+    op.execute('ALTER TABLE responses_unpartitioned RENAME CONSTRAINT responses_form_id_fkey TO responses_unpartitioned_form_id_fkey')
+
+    # The partition key has to be part of the primary key, and NOT NULL
+    _create_responses_table(
+        'responses',
+        sa.PrimaryKeyConstraint('id', 'created_at', name='responses_partitioned_pkey'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    _create_indexes()
+    op.execute('CREATE TABLE responses_default PARTITION OF responses DEFAULT')
+
+    # Monthly partitions from the oldest response through PARTITIONS_AHEAD months from now
+    oldest = op.get_bind().execute(sa.text('SELECT min(created_at) FROM responses_unpartitioned')).scalar()
+    now = datetime.now(timezone.utc)
+    first = date((oldest or now).year, (oldest or now).month, 1)
+    last_index = now.year * 12 + now.month - 1 + PARTITIONS_AHEAD
+    for month in _months(first, date(last_index // 12, last_index % 12 + 1, 1)):
+        end = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        op.execute(
+            f"CREATE TABLE responses_p{month.year:04d}{month.month:02d} PARTITION OF responses "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"
+        )
+
+    op.execute(
+        'INSERT INTO responses (id, form_id, data, created_at, updated_at) '
+        'SELECT id, form_id, data, COALESCE(created_at, now()), updated_at FROM responses_unpartitioned'
+    )
+    op.drop_table('responses_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('responses', 'responses_partitioned')
+    op.execute('ALTER INDEX ix_responses_form_id_created_at_id RENAME TO ix_responses_partitioned_form_id_created_at_id')
+    op.execute('ALTER INDEX ix_responses_data_path_ops RENAME TO ix_responses_partitioned_data_path_ops')
+    op.execute('ALTER TABLE responses_partitioned RENAME CONSTRAINT responses_form_id_fkey TO responses_partitioned_form_id_fkey')
+    _create_responses_table('responses', sa.PrimaryKeyConstraint('id'), created_at_nullable=True)
+    _create_indexes()
+    op.execute(
+        'INSERT INTO responses (id, form_id, data, created_at, updated_at) '
+        'SELECT id, form_id, data, created_at, updated_at FROM responses_partitioned'
+    )
+    # Dropping the parent drops every partition with it
+    op.drop_table('responses_partitioned')
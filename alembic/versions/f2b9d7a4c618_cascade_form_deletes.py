@@ -0,0 +1,38 @@
+"""cascade form deletes
+
+Revision ID: f2b9d7a4c618
+Revises: a4f6c2e9d185
+Create Date: 2026-10-17 21:03:29.642871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b9d7a4c618'
+down_revision: Union[str, None] = 'a4f6c2e9d185'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('forms', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_forms_deleted_at', 'forms', ['deleted_at'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NOT NULL'))
+    # Recreating the constraint on the partitioned parent applies it to every partition
+    op.drop_constraint('responses_form_id_fkey', 'responses', type_='foreignkey')
+    op.create_foreign_key('responses_form_id_fkey', 'responses', 'forms', ['form_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('responses_form_id_fkey', 'responses', type_='foreignkey')
+    op.create_foreign_key('responses_form_id_fkey', 'responses', 'forms', ['form_id'], ['id'])
+    # Forms still awaiting a purge are deleted for good
+    op.execute('DELETE FROM forms WHERE deleted_at IS NOT NULL')
+    op.drop_index('ix_forms_deleted_at', table_name='forms', postgresql_where=sa.text('deleted_at IS NOT NULL'))
+    op.drop_column('forms', 'deleted_at')
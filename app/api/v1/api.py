@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 
 # Import endpoint modules
-from app.api.v1.endpoints import auth, users, forms, responses # Add forms, responses
+from app.api.v1.endpoints import auth, users, forms, jobs, responses, webhooks # Add forms, responses
 
 api_router = APIRouter()
 
@@ -9,5 +9,7 @@ api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(forms.router, prefix="/forms", tags=["Forms"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
 # Include the responses router - note it handles paths like /forms/{form_id}/responses/
-api_router.include_router(responses.router, tags=["Responses"]) # No prefix needed here as paths are absolute
\ No newline at end of file
+api_router.include_router(responses.router, tags=["Responses"]) # No prefix needed here as paths are absolute
+api_router.include_router(webhooks.router, tags=["Webhooks"]) # Paths nested under /forms/{form_id}/webhooks
\ No newline at end of file
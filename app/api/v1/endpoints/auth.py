@@ -9,6 +9,18 @@ from app.dependencies import get_db
 
 router = APIRouter()
 
+
+def hasher_busy_exception() -> HTTPException:
+    """
+    Returned when the password hashing pool is saturated (login/registration storm).
+    """
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=user.User, status_code=status.HTTP_201_CREATED)
 async def register_user(
     *,
@@ -24,7 +36,10 @@ async def register_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The user with this email already exists in the system.",
         )
-    user = await crud_user.create_user(db=db, user_in=user_in)
+    try:
+        user = await crud_user.create_user(db=db, user_in=user_in)
+    except security.PasswordHasherBusy:
+        raise hasher_busy_exception()
     return user
 
 
@@ -38,7 +53,13 @@ async def login_for_access_token(
     'username' field in the form is used for the email.
     """
     user = await crud_user.get_user_by_email(db, email=form_data.username)
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user:
+        try:
+            verified, new_hash = await security.verify_and_update_password(form_data.password, user.hashed_password)
+        except security.PasswordHasherBusy:
+            raise hasher_busy_exception()
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -46,8 +67,14 @@ async def login_for_access_token(
         )
     if not user.is_active:
          raise HTTPException(status_code=400, detail="Inactive user")
+    if new_hash:
+        # Hash settings changed since this password was stored; upgrade it now
+        # that we know the plaintext.
+        await crud_user.update_password_hash(db, db_user=user, hashed_password=new_hash)
 
     access_token = security.create_access_token(
-        data={"sub": user.email} # 'sub' is standard claim for subject (user identifier)
+        # 'sub' is standard claim for subject (user identifier);
+        # 'uid' lets get_current_user resolve the principal from its cache by id
+        data={"sub": user.email, "uid": str(user.id)}
     )
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
@@ -1,13 +1,19 @@
 import uuid
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud import crud_form
+from app.core import conditional, form_patch, json_patch, pagination, serialization
+from app.core.config import settings
+from app.api.v1.endpoints.jobs import accepted
+from app.crud import crud_form, crud_form_stats, crud_job, job_runner
 from app.models import  user
 from app.schemas import form as form_schema
-from app.dependencies import get_current_user, get_db
+from app.schemas import job as job_schema
+from app.schemas import summary as summary_schema
+from app.dependencies import get_current_user, get_db, get_read_db
 
 router = APIRouter()
 
@@ -21,38 +27,169 @@ async def create_form(
 ):
     """
     Create new form owned by the current user, using a client-provided ID.
+    One INSERT ... RETURNING; the owner comes from the authenticated user.
     """
-    form = await crud_form.create_form(db=db, form_in=form_in, owner_id=current_user.id)
+    form = await crud_form.create_form(db=db, form_in=form_in, owner=current_user)
     if form is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Form with ID '{form_in.id}' already exists.",
         )
-    # Ensure owner data is loaded for the response schema
-    # crud function should handle this with eager loading or refresh
+    if settings.TRUSTED_SERIALIZATION:
+        return Response(content=form.body, status_code=status.HTTP_201_CREATED, media_type="application/json")
     return form
 
 
-@router.get("/", response_model=List[form_schema.Form])
-async def read_forms(
+def _check_bulk_size(count: int) -> None:
+    if count > settings.FORM_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.FORM_BULK_MAX_ITEMS} forms per request.",
+        )
+
+
+def _check_bulk_ids(ids: List[uuid.UUID]) -> None:
+    _check_bulk_size(len(ids))
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Form ids must be unique.")
+
+
+def _created_forms_response(forms: List[crud_form.CachedForm]):
+    if settings.TRUSTED_SERIALIZATION:
+        # Splice the snapshots' serialized bodies instead of re-serializing
+        content = b"[" + b",".join(form.body for form in forms) + b"]"
+        return Response(content=content, status_code=status.HTTP_201_CREATED, media_type="application/json")
+    return forms
+
+
+@router.post(":batch", response_model=List[form_schema.Form], status_code=status.HTTP_201_CREATED)
+async def create_forms(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch_in: form_schema.FormBatchCreate,
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    Create many forms owned by the current user in one request, with one
+    multi-row INSERT in one transaction: either all are created or, if any
+    id is already taken, none are (409 listing the taken ids).
+    """
+    _check_bulk_ids([form_in.id for form_in in batch_in.forms])
+    forms, conflicts = await crud_form.create_forms(db=db, forms_in=batch_in.forms, owner=current_user)
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Some form ids already exist.", "ids": [str(form_id) for form_id in conflicts]},
+        )
+    return _created_forms_response(forms)
+
+
+@router.post(":batchDelete", response_model=form_schema.FormBatchDeleteResult, status_code=status.HTTP_202_ACCEPTED)
+async def delete_forms(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch_in: form_schema.FormBatchDelete,
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    Delete many of the current user's forms with one UPDATE. Like
+    DELETE /forms/{form_id}, the forms disappear at once and their responses
+    are purged by a background job (`job_id`). Ids that are missing, already
+    deleted or not owned by the current user are reported in `not_found`.
+    """
+    _check_bulk_ids(batch_in.ids)
+    deleted, job = await crud_form.mark_forms_deleted(db=db, form_ids=batch_in.ids, owner_id=current_user.id)
+    job_runner.wake()
+    deleted_ids = set(deleted)
+    return {
+        "deleted": [form_id for form_id in batch_in.ids if form_id in deleted_ids],
+        "not_found": [form_id for form_id in batch_in.ids if form_id not in deleted_ids],
+        "job_id": job.id if job is not None else None,
+    }
+
+
+@router.post("/{form_id}:clone", response_model=List[form_schema.Form], status_code=status.HTTP_201_CREATED)
+async def clone_form(
+    *,
     db: AsyncSession = Depends(get_db),
+    form_id: uuid.UUID,
+    clone_in: form_schema.FormClone,
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    Create copies of a form (e.g. a template), owned by the current user,
+    with one multi-row INSERT in one transaction. Pass the new `ids`, or a
+    `count` to have ids generated. Allowed for the source's owner and for
+    superusers. Responses are not copied.
+    """
+    if clone_in.ids is not None:
+        _check_bulk_ids(clone_in.ids)
+        ids = clone_in.ids
+    else:
+        _check_bulk_size(clone_in.count)
+        ids = [uuid.uuid4() for _ in range(clone_in.count)]
+    source = await crud_form.get_form_cached(db=db, form_id=form_id)
+    if source is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
+    if source.owner_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+
+    forms, conflicts = await crud_form.clone_form(
+        db=db, source=source, ids=ids, owner=current_user, title=clone_in.title
+    )
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Some form ids already exist.", "ids": [str(conflict) for conflict in conflicts]},
+        )
+    return _created_forms_response(forms)
+
+
+@router.get("/", response_model=Union[List[form_schema.Form], List[form_schema.FormListItem]])
+async def read_forms(
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    view: str = Query("full", pattern="^(full|summary)$", description="'summary' returns only id, title, field_count and timestamps"),
     current_user: user.User = Depends(get_current_user),
 ):
     """
-    Retrieve forms owned by the current user.
+    Retrieve forms owned by the current user, newest first.
+    When more forms exist, the X-Next-Cursor response header holds the cursor
+    for the next page. `view=summary` is a single narrow query intended for
+    dashboard lists; it does not include the definition or the owner.
     """
-    forms = await crud_form.get_forms_by_owner(
-        db=db, owner_id=current_user.id, skip=skip, limit=limit
+    try:
+        after = pagination.decode_cursor(cursor)
+    except pagination.InvalidCursor as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    # Fetch one extra row to know whether another page exists
+    get_page = crud_form.get_form_summaries_by_owner if view == "summary" else crud_form.get_forms_by_owner
+    forms = await get_page(
+        db=db, owner_id=current_user.id, skip=skip, limit=limit + 1, after=after
     )
+    headers = {}
+    if len(forms) > limit:
+        forms = forms[:limit]
+        last = forms[-1]
+        headers[pagination.NEXT_CURSOR_HEADER] = pagination.encode_cursor(last.created_at, last.id)
+    if view == "summary":
+        return serialization.json_response([serialization.form_list_item_to_dict(row) for row in forms], headers=headers)
+    if settings.TRUSTED_SERIALIZATION:
+        # Stored data was validated on write; skip response_model re-validation
+        return serialization.json_response(serialization.forms_json(forms), headers=headers)
+    response.headers.update(headers)
     return forms
 
 
 @router.get("/{form_id}", response_model=form_schema.Form)
 async def read_form(
     *,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     form_id: uuid.UUID,
     # Note: For now, allows any authenticated user to *read* a form definition
     # You might want owner-only access or a public flag later.
@@ -60,16 +197,73 @@ async def read_form(
 ):
     """
     Get a specific form by ID.
+    Carries a strong ETag (a hash of the representation) and a public
+    Cache-Control; a matching If-None-Match gets a 304, which needs no
+    database access while the form is in the form cache.
     """
-    db_form = await crud_form.get_form(db=db, form_id=form_id)
+    db_form = await crud_form.get_form_cached(db=db, form_id=form_id)
     if db_form is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
     # Optional: Add ownership check if reading should be restricted
     # if db_form.owner_id != current_user.id:
     #     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    cache_control = f"public, max-age={settings.FORM_HTTP_MAX_AGE}"
+    if conditional.if_none_match(request, db_form.etag):
+        return conditional.not_modified(db_form.etag, cache_control)
+    headers = {"ETag": db_form.etag, "Cache-Control": cache_control}
+    if settings.TRUSTED_SERIALIZATION:
+        # The snapshot keeps its serialized body, so warm reads don't re-serialize
+        return Response(content=db_form.body, media_type="application/json", headers=headers)
+    response.headers.update(headers)
     return db_form
 
 
+@router.get("/{form_id}/summary", response_model=summary_schema.FormSummary)
+async def read_form_summary(
+    *,
+    db: AsyncSession = Depends(get_read_db),
+    form_id: uuid.UUID,
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    Get per-option answer counts for the form's choice fields. Only allowed by the owner.
+    Served from incrementally maintained counters, so the cost does not grow
+    with the number of responses.
+    """
+    form = await crud_form.get_form_cached(db=db, form_id=form_id)
+    if form is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
+    if form.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+
+    counts = await crud_form_stats.get_counts(db=db, form_id=form_id)
+    return crud_form_stats.build_summary(form, counts)
+
+
+@router.post("/{form_id}/summary:rebuild", response_model=job_schema.Job, status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_form_summary(
+    *,
+    db: AsyncSession = Depends(get_db),
+    form_id: uuid.UUID,
+    response: Response,
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    Recount the form's answer counters from its stored responses, in a
+    background job. Only allowed by the owner. Returns the job; poll
+    GET /jobs/{job_id} for completion.
+    """
+    form = await crud_form.get_form_cached(db=db, form_id=form_id)
+    if form is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
+    if form.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+
+    job = await crud_job.create_job(db, kind=crud_job.REBUILD_STATS, owner_id=current_user.id, form_id=form_id)
+    job_runner.wake()
+    return accepted(response, job)
+
+
 @router.put("/{form_id}", response_model=form_schema.Form)
 async def update_form(
     *,
@@ -80,27 +274,97 @@ async def update_form(
 ):
     """
     Update a form. Only allowed by the owner.
+    The ownership check is part of the UPDATE ... RETURNING, so a successful
+    update is a single round trip; the form is only looked up again to tell
+    a missing form (404) from someone else's (403).
     """
-    db_form = await crud_form.get_form(db=db, form_id=form_id)
-    if db_form is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
-    if db_form.owner_id != current_user.id:
+    updated_form = await crud_form.update_form(db=db, form_id=form_id, form_in=form_in, owner=current_user)
+    if updated_form is None:
+        db_form = await crud_form.get_form_cached(db=db, form_id=form_id)
+        if db_form is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
-
-    updated_form = await crud_form.update_form(db=db, db_form=db_form, form_in=form_in)
+    if settings.TRUSTED_SERIALIZATION:
+        return Response(content=updated_form.body, media_type="application/json")
     return updated_form
 
 
-@router.delete("/{form_id}", response_model=form_schema.Form)
+@router.patch("/{form_id}", response_model=form_schema.FormPatchResult)
+async def patch_form(
+    *,
+    db: AsyncSession = Depends(get_db),
+    form_id: uuid.UUID,
+    operations: List[form_schema.FormPatchOperation],
+    updated_at: Optional[datetime] = Query(
+        None, description="The form's updated_at as last seen by the client; the patch fails with 409 if it has changed since"
+    ),
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    Partially update a form with RFC 6902 JSON Patch operations on its
+    definition (e.g. `[{"op": "replace", "path": "/fields/3/label", "value": "Name"}]`).
+    Only the fields the patch touches are validated. Only allowed by the owner.
+
+    Optimistic concurrency: pass the `updated_at` you last saw (for a form
+    that was never updated, its `created_at`) and the patch is only applied
+    if nobody else changed the form since. Returns the new `updated_at` to
+    send with the next patch.
+    """
+    patch = [operation.to_patch() for operation in operations]
+    form = await crud_form.get_form_cached(db=db, form_id=form_id)
+    # Without a client version the patch applies to the latest definition; a
+    # stale cache snapshot just costs one retry against a fresh read.
+    for attempt in range(2):
+        if form is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
+        if form.owner_id != current_user.id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        base_version = crud_form.form_version(form)
+        if updated_at is not None and base_version != updated_at:
+            if attempt == 0:
+                form = await crud_form.get_form_fresh(db=db, form_id=form_id)
+                continue
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"msg": "Form was modified since updated_at", "updated_at": base_version.isoformat()},
+            )
+
+        try:
+            data = form_patch.apply_form_patch(form.data, patch)
+        except json_patch.JsonPatchTestFailed as exc:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+        except json_patch.JsonPatchError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        except form_patch.FormPatchValidationError as exc:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=exc.errors)
+
+        new_version = await crud_form.update_form_data_if_unchanged(
+            db=db, form_id=form_id, data=data, expected_version=base_version
+        )
+        if new_version is not None:
+            return form_schema.FormPatchResult(
+                id=form_id, updated_at=new_version, title=data.get("title"), field_count=len(data["fields"])
+            )
+        if updated_at is not None or attempt:
+            # Another write landed between our read and the update
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Form was modified concurrently, please retry")
+        form = await crud_form.get_form_fresh(db=db, form_id=form_id)
+
+
+@router.delete("/{form_id}", response_model=form_schema.Form, status_code=status.HTTP_202_ACCEPTED)
 async def delete_form(
     *,
     db: AsyncSession = Depends(get_db),
     form_id: uuid.UUID,
+    response: Response,
     current_user: user.User = Depends(get_current_user),
 ):
     """
     Delete a form. Only allowed by the owner.
-    This will also delete all associated responses due to cascade settings.
+    The form disappears immediately and the deleted form is returned; its
+    responses are purged by a background job in bounded batches (Location
+    points at its status), so this returns quickly however many responses
+    the form has.
     """
     db_form = await crud_form.get_form(db=db, form_id=form_id) # Fetch to check ownership first
     if db_form is None:
@@ -108,11 +372,10 @@ async def delete_form(
     if db_form.owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
 
-    deleted_form = await crud_form.remove_form(db=db, form_id=form_id)
-    # remove_form should return the deleted object or None if deletion failed unexpectedly
-    # If using status_code 204 (No Content) on success, return Response(status_code=204) instead
-    if deleted_form:
-        return deleted_form # Return the data of the deleted form
-    else:
-        # This case should ideally not happen if the ownership check passed
-         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found for deletion")
\ No newline at end of file
+    deleted, job = await crud_form.mark_forms_deleted(db=db, form_ids=[form_id], owner_id=current_user.id)
+    if not deleted:
+        # Deleted by a concurrent request since the ownership check
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found for deletion")
+    job_runner.wake()
+    response.headers["Location"] = f"{settings.API_V1_STR}/jobs/{job.id}"
+    return db_form
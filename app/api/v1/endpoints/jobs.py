@@ -0,0 +1,68 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import export
+from app.core.config import settings
+from app.crud import crud_job, job_handlers
+from app.models import user
+from app.schemas import job as job_schema
+from app.dependencies import get_current_user, get_db
+
+router = APIRouter()
+
+
+def accepted(response: Response, job) -> job_schema.Job:
+    """
+    Shape a 202 reply for an endpoint that queued `job`.
+    """
+    response.status_code = status.HTTP_202_ACCEPTED
+    response.headers["Location"] = f"{settings.API_V1_STR}/jobs/{job.id}"
+    return job_schema.Job.model_validate(job)
+
+
+async def _get_own_job(db: AsyncSession, job_id: uuid.UUID, current_user: user.User):
+    job = await crud_job.get_job(db=db, job_id=job_id)
+    # Other users' jobs are reported as missing, not forbidden
+    if job is None or job.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}", response_model=job_schema.Job)
+async def read_job(
+    *,
+    db: AsyncSession = Depends(get_db), # Primary: status changes must be seen at once
+    job_id: uuid.UUID,
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    Status, progress and result of a background job. Only allowed by the
+    user who started it. Poll until `status` is succeeded or failed.
+    """
+    return await _get_own_job(db, job_id, current_user)
+
+
+@router.get("/{job_id}/result")
+async def read_job_result(
+    *,
+    db: AsyncSession = Depends(get_db),
+    job_id: uuid.UUID,
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    Download the file produced by a finished export job.
+    """
+    job = await _get_own_job(db, job_id, current_user)
+    if job.kind != crud_job.EXPORT_RESPONSES:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job has no downloadable result")
+    if job.status != crud_job.SUCCEEDED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job.status}")
+    file_format = job.result["format"]
+    return FileResponse(
+        job_handlers.export_path(job.result["file"]),
+        media_type=export.CONTENT_TYPES[file_format],
+        filename=f"responses-{job.form_id}.{file_format}",
+    )
@@ -1,13 +1,21 @@
+import asyncio
 import uuid
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import Response as HTTPResponse
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.endpoints.jobs import accepted
+from app.schemas import job as job_schema
 from app.schemas import response as response_schema
-from app.crud import crud_form, crud_response
+from app.crud import crud_form, crud_form_stats, crud_job, crud_response, job_runner, response_batcher
+from app.core import conditional, export, filters, live, pagination, serialization, validation
+from app.core.config import settings
+from app.db.session import read_session_factory
 from app.models import user as user_model
-from app.dependencies import get_current_user, get_db # Assuming responses might need auth later
+from app.dependencies import charge_submissions, get_current_user, get_db, get_read_db, get_submission_db, max_submission_batch # Assuming responses might need auth later
 
 router = APIRouter()
 
@@ -16,7 +24,7 @@ router = APIRouter()
 @router.post("/forms/{form_id}/responses/", response_model=response_schema.Response, status_code=status.HTTP_201_CREATED)
 async def create_response_for_form(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_submission_db), # 429 before any DB work when over limits
     form_id: uuid.UUID,
     response_in: response_schema.ResponseCreate,
     # No current_user dependency here = public submission allowed
@@ -26,8 +34,8 @@ async def create_response_for_form(
     Submit a new response to a specific form.
     Currently public, but could check form settings later (e.g., require login).
     """
-    # 1. Check if form exists
-    form = await crud_form.get_form(db=db, form_id=form_id)
+    # 1. Check if form exists (served from the in-process form cache when warm)
+    form = await crud_form.get_form_cached(db=db, form_id=form_id)
     if form is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
 
@@ -36,46 +44,324 @@ async def create_response_for_form(
     #    # If requireLogin is true, you'd need a current_user dependency
     #    pass
 
-    # 2. TODO: Add Server-Side Validation
-    #    Compare response_in.data keys/values against form.data["fields"] definition
-    #    - Check required fields are present
-    #    - Check data types (e.g., email format)
-    #    - Check against options for multiple_choice/dropdown/checkbox
-    #    - Check minLength/maxLength etc.
-    #    If validation fails, raise HTTPException 400 Bad Request
+    # 2. Server-Side Validation
+    #    The form definition is compiled once per (form_id, updated_at) and cached,
+    #    so this only runs the precomputed per-field checks.
+    try:
+        validation.validate_response(form, response_in.data)
+    except validation.ResponseValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=validation.format_errors(exc.errors),
+        )
 
     # 3. Create the response
+    #    With write-behind ingestion enabled the row is queued and committed as
+    #    part of a multi-row INSERT; we still wait for that commit before replying.
+    batcher = response_batcher.response_batcher
+    if batcher is not None and batcher.running:
+        try:
+            return await batcher.submit(form_id=form_id, data=response_in.data, form=form)
+        except response_batcher.FormDeleted:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
     response = await crud_response.create_response(
-        db=db, response_in=response_in, form_id=form_id
+        db=db, response_in=response_in, form_id=form_id, form=form
     )
     return response
 
 
+@router.post("/forms/{form_id}/responses:batch", response_model=List[response_schema.Response], status_code=status.HTTP_201_CREATED)
+async def create_responses_for_form(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(get_submission_db),
+    form_id: uuid.UUID,
+    batch_in: response_schema.ResponseBatchCreate,
+):
+    """
+    Submit many responses to a form in one request.
+    All responses are validated first; they are then written with a single
+    multi-row INSERT in one transaction, so either all are stored or none.
+    Each response counts against the submission rate limits, so a batch can
+    hold at most RESPONSE_BULK_MAX_ITEMS responses and no more than the
+    smallest applicable burst (SUBMISSION_BURST_PER_IP / _PER_FORM or the
+    form's rateLimit settings); larger batches get a 413 naming the limit.
+    """
+    largest = max_submission_batch(request, form_id)
+    if len(batch_in.responses) > largest:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {largest} responses per batch.",
+        )
+    charge_submissions(request, form_id, len(batch_in.responses) - 1)
+
+    form = await crud_form.get_form_cached(db=db, form_id=form_id)
+    if form is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
+
+    errors = []
+    for index, response_in in enumerate(batch_in.responses):
+        try:
+            validation.validate_response(form, response_in.data)
+        except validation.ResponseValidationError as exc:
+            errors.append({"index": index, "errors": validation.format_errors(exc.errors)})
+    if errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+
+    responses = await crud_response.create_responses(
+        db=db, responses_in=batch_in.responses, form_id=form_id, form=form
+    )
+    return responses
+
+
 @router.get("/forms/{form_id}/responses/", response_model=List[response_schema.Response])
 async def read_responses_for_form(
     *,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    http_response: HTTPResponse,
+    db: AsyncSession = Depends(get_read_db),
     form_id: uuid.UUID,
     skip: int = Query(0, ge=0),
     limit: int = Query(1000, ge=1, le=5000), # Allow fetching more responses at once
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    filter_expressions: List[str] = Query(
+        [], alias="filter",
+        description="Answer filter, repeatable: <field_id>:eq|contains:<text>, <field_id>:exists, <field_id>:gt|gte|lt|lte:<number>",
+    ),
     current_user: user_model.User = Depends(get_current_user), # Only owner can view responses
 ):
     """
-    Retrieve all responses for a specific form. Only allowed by the owner.
+    Retrieve all responses for a specific form, oldest first. Only allowed by the owner.
+    When more responses exist, the X-Next-Cursor response header holds the
+    cursor for the next page. `filter` predicates are ANDed and run in the database.
+    Archived responses are merged in when the page reaches back to them.
+    Pages carry an ETag derived from the form's newest response and response
+    total; a matching If-None-Match gets a 304 without fetching the page.
     """
+    try:
+        after = pagination.decode_cursor(cursor)
+        predicates = filters.parse_filters(filter_expressions)
+    except (pagination.InvalidCursor, filters.InvalidFilter) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
     # 1. Check if form exists and if current user owns it
-    form = await crud_form.get_form(db=db, form_id=form_id)
+    form = await crud_form.get_form_cached(db=db, form_id=form_id)
     if form is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
     if form.owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
 
-    # 2. Fetch responses
-    responses = await crud_response.get_responses_by_form(
-        db=db, form_id=form_id, skip=skip, limit=limit
-    )
+    # 2. Conditional GET: the page can only change when a response is added
+    marker = await crud_response.get_change_marker(db=db, form_id=form_id, form_created_at=form.created_at)
+    etag = conditional.version_etag(form_id, *marker, request.url.query)
+    cache_control = "private, no-cache" # Owner-only data: browser may keep it, must revalidate
+    if conditional.if_none_match(request, etag):
+        return conditional.not_modified(etag, cache_control)
+
+    # 3. Fetch responses (one extra row tells us whether another page exists)
+    try:
+        responses = await crud_response.get_responses_by_form(
+            db=db, form_id=form_id, skip=skip, limit=limit + 1, after=after, predicates=predicates,
+            form_created_at=form.created_at, archived_until=marker[2],
+        )
+    except filters.InvalidFilter as exc: # Filter too sparse to page through the archive
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if len(responses) > limit:
+        responses = responses[:limit]
+        last = responses[-1]
+        headers[pagination.NEXT_CURSOR_HEADER] = pagination.encode_cursor(last.created_at, last.id)
+    if settings.TRUSTED_SERIALIZATION:
+        # Stored data was validated on write; skip response_model re-validation
+        return serialization.json_response(serialization.responses_json(responses), headers=headers)
+    http_response.headers.update(headers)
     return responses
 
+@router.get("/forms/{form_id}/responses/live")
+async def stream_live_responses(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(get_db), # Primary: the backfill must not lag behind the feed
+    form_id: uuid.UUID,
+    cursor: Optional[str] = Query(None, description="Also send the responses after this cursor (a listing's X-Next-Cursor or an event id)"),
+    aggregates: bool = Query(False, description="Also send the form summary whenever answer counts change"),
+    current_user: user_model.User = Depends(get_current_user),
+):
+    """
+    Server-sent events with the form's new responses, as they are submitted.
+    Only allowed by the owner. Replaces polling the listing endpoint:
+    - `responses`: a batch of new responses, oldest first. Bursts are
+      coalesced into at most one batch per LIVE_FLUSH_INTERVAL_MS. The
+      event id is the cursor of the batch's last response, so a reconnecting
+      EventSource (Last-Event-ID) resumes where it left off.
+    - `lagged`: the client fell behind and `dropped` responses (null when
+      resuming past more than LIVE_MAX_PENDING) were skipped; page through
+      the listing from `cursor` to fill the gap (dedupe by id).
+    - `summary` (with `aggregates=true`): the updated per-option counts, as
+      GET /forms/{form_id}/summary returns them.
+    Only submissions handled by the same server process are pushed.
+    """
+    try:
+        after = pagination.decode_cursor(request.headers.get("Last-Event-ID") or cursor)
+    except pagination.InvalidCursor as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    form = await crud_form.get_form_cached(db=db, form_id=form_id)
+    if form is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
+    if form.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+
+    try:
+        subscription = live.live_hub.subscribe(form_id)
+    except live.TooManySubscribers:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live feeds open, retry later",
+            headers={"Retry-After": "5"},
+        )
+    try:
+        # Read after subscribing, so anything committed meanwhile shows up in
+        # one or the other (or both: duplicate responses are skipped by id
+        # below; a submission committed while the counts are read may be
+        # counted twice in the feed, GET /forms/{form_id}/summary stays exact)
+        counts = await crud_form_stats.get_counts(db=db, form_id=form_id) if aggregates else None
+        backlog = []
+        if after is not None:
+            backlog = await crud_response.get_responses_by_form(
+                db=db, form_id=form_id, limit=settings.LIVE_MAX_PENDING + 1, after=after,
+                form_created_at=form.created_at,
+            )
+    except BaseException:
+        live.live_hub.unsubscribe(subscription)
+        raise
+
+    flush_interval = settings.LIVE_FLUSH_INTERVAL_MS / 1000
+
+    def responses_event(responses):
+        last = responses[-1]
+        event_id = pagination.encode_cursor(last.created_at, last.id)
+        return event_id, live.sse_event("responses", {"responses": serialization.responses_json(responses)}, event_id)
+
+    async def events():
+        last_id = request.headers.get("Last-Event-ID") or cursor
+        seen = set()
+        try:
+            if counts is not None:
+                yield live.sse_event("summary", crud_form_stats.build_summary(form, counts))
+            if backlog:
+                sent = backlog[:settings.LIVE_MAX_PENDING]
+                seen.update(response.id for response in sent)
+                last_id, chunk = responses_event(sent)
+                yield chunk
+                if len(backlog) > len(sent):
+                    yield live.sse_event("lagged", {"dropped": None, "cursor": last_id})
+            loop = asyncio.get_running_loop()
+            next_flush = 0.0
+            while True:
+                if not await subscription.wait(settings.LIVE_HEARTBEAT_SECONDS):
+                    yield b": keep-alive\n\n"
+                    continue
+                # Coalesce bursts: at most one batch per flush interval
+                delay = next_flush - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_flush = loop.time() + flush_interval
+                responses, deltas, dropped = subscription.drain()
+                responses = sorted(
+                    (response for response in responses if response.id not in seen),
+                    key=lambda response: (response.created_at, response.id),
+                )
+                if responses:
+                    last_id, chunk = responses_event(responses)
+                    yield chunk
+                if dropped:
+                    yield live.sse_event("lagged", {"dropped": dropped, "cursor": last_id})
+                if counts is not None and deltas:
+                    crud_form_stats.merge_counts(counts, deltas)
+                    yield live.sse_event("summary", crud_form_stats.build_summary(form, counts))
+        finally:
+            live.live_hub.unsubscribe(subscription)
+
+    # The session (shared with get_current_user) is only torn down after the
+    # stream ends; hand its connection back now rather than hold it for as
+    # long as the feed stays open. Everything the stream needs is loaded.
+    await db.close()
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: keep reverse proxies (nginx) from holding events back
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/forms/{form_id}/responses/export")
+async def export_responses_for_form(
+    *,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    form_id: uuid.UUID,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    current_user: user_model.User = Depends(get_current_user),
+):
+    """
+    Stream every response of a form as CSV or NDJSON. Only allowed by the owner.
+    Archived responses come first, then the rest from a server-side cursor;
+    rows are written out as they arrive, so memory use does not depend on
+    the number of responses.
+    CSV columns follow the field order of the form; multi-select answers are
+    joined with "; ".
+    """
+    form = await crud_form.get_form_cached(db=db, form_id=form_id)
+    if form is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
+    if form.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+
+    columns = export.export_columns(form.data)
+    session_factory = read_session_factory(request)
+
+    async def body():
+        # The request-scoped session may be closed before streaming finishes,
+        # so the export owns its session for the lifetime of the stream.
+        async with session_factory() as export_db:
+            rows = crud_response.stream_responses_by_form(db=export_db, form_id=form_id, form_created_at=form.created_at)
+            chunks = export.iter_csv(rows, columns) if format == "csv" else export.iter_ndjson(rows)
+            async for chunk in chunks:
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=export.CONTENT_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="responses-{form_id}.{format}"'},
+    )
+
+
+@router.post("/forms/{form_id}/responses:export", response_model=job_schema.Job, status_code=status.HTTP_202_ACCEPTED)
+async def start_responses_export(
+    *,
+    db: AsyncSession = Depends(get_db),
+    form_id: uuid.UUID,
+    http_response: HTTPResponse,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    current_user: user_model.User = Depends(get_current_user),
+):
+    """
+    Export every response of a form to a file in a background job, for forms
+    too large to stream in one request. Only allowed by the owner. Poll
+    GET /jobs/{job_id}, then download GET /jobs/{job_id}/result.
+    """
+    form = await crud_form.get_form_cached(db=db, form_id=form_id)
+    if form is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
+    if form.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+
+    job = await crud_job.create_job(
+        db, kind=crud_job.EXPORT_RESPONSES, owner_id=current_user.id, form_id=form_id, params={"format": format}
+    )
+    job_runner.wake()
+    return accepted(http_response, job)
+
 # Optional: Get a single specific response? Less common use case.
 # @router.get("/responses/{response_id}", response_model=schemas.Response)
 # async def read_response( ... )
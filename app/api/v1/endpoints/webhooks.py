@@ -0,0 +1,88 @@
+import uuid
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import webhook_targets
+from app.core.config import settings
+from app.crud import crud_form, crud_webhook
+from app.models import user
+from app.schemas import webhook as webhook_schema
+from app.dependencies import get_current_user, get_db
+
+router = APIRouter()
+
+
+async def _check_owner(db: AsyncSession, form_id: uuid.UUID, current_user: user.User) -> None:
+    form = await crud_form.get_form_cached(db=db, form_id=form_id)
+    if form is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Form not found")
+    if form.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+
+
+@router.post("/forms/{form_id}/webhooks", response_model=webhook_schema.WebhookCreated, status_code=status.HTTP_201_CREATED)
+async def create_webhook(
+    *,
+    db: AsyncSession = Depends(get_db),
+    form_id: uuid.UUID,
+    webhook_in: webhook_schema.WebhookCreate,
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    Subscribe a URL to the form's new responses. Only allowed by the owner.
+    Responses are POSTed in JSON batches, signed with the returned secret
+    (shown only here): X-Formflow-Signature is "t=<unix time>,v1=<hex>",
+    the HMAC-SHA256 of "<unix time>.<raw body>".
+    The URL must be https and its host must resolve to public addresses only.
+    """
+    await _check_owner(db, form_id, current_user)
+    try:
+        await webhook_targets.check_url(str(webhook_in.url))
+    except webhook_targets.UnsafeTarget as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+    if await crud_webhook.count_subscriptions(db=db, form_id=form_id) >= settings.WEBHOOK_MAX_PER_FORM:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A form can have at most {settings.WEBHOOK_MAX_PER_FORM} webhooks.",
+        )
+    return await crud_webhook.create_subscription(db=db, form_id=form_id, webhook_in=webhook_in)
+
+
+@router.get("/forms/{form_id}/webhooks", response_model=List[webhook_schema.Webhook])
+async def read_webhooks(
+    *,
+    db: AsyncSession = Depends(get_db),
+    form_id: uuid.UUID,
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    List the form's webhooks with their delivery health. Only allowed by the owner.
+    """
+    await _check_owner(db, form_id, current_user)
+    subscriptions = await crud_webhook.get_subscriptions(db=db, form_id=form_id)
+    pending = await crud_webhook.count_pending(db=db, subscription_ids=[s.id for s in subscriptions])
+    webhooks = []
+    for subscription in subscriptions:
+        webhook = webhook_schema.Webhook.model_validate(subscription)
+        webhook.pending_deliveries = pending.get(subscription.id, 0)
+        webhooks.append(webhook)
+    return webhooks
+
+
+@router.delete("/forms/{form_id}/webhooks/{webhook_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_webhook(
+    *,
+    db: AsyncSession = Depends(get_db),
+    form_id: uuid.UUID,
+    webhook_id: uuid.UUID,
+    current_user: user.User = Depends(get_current_user),
+):
+    """
+    Remove a webhook; deliveries still pending for it are dropped. Only allowed by the owner.
+    """
+    await _check_owner(db, form_id, current_user)
+    if not await crud_webhook.remove_subscription(db=db, form_id=form_id, subscription_id=webhook_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
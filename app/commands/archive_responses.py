@@ -0,0 +1,58 @@
+"""
+Move responses past their form's retention window into compressed archive chunks.
+
+Run from cron (daily is plenty). The window is RESPONSE_ARCHIVE_AFTER_DAYS,
+overridable per form via FormData.settings["archiveAfterDays"]; forms where
+it is 0 are skipped. Archived responses stay visible through listing and
+export, which read the chunks back from ARCHIVE_DIR:
+
+    python -m app.commands.archive_responses --form-id <uuid> [--form-id <uuid> ...]
+    python -m app.commands.archive_responses --all [--chunk-rows 10000]
+"""
+import argparse
+import asyncio
+import uuid
+from typing import List
+
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.crud import crud_archive, crud_form
+from app.db.session import AsyncSessionFactory, engine
+from app.models.form import Form
+
+
+async def archive(form_ids: List[uuid.UUID], chunk_rows: int) -> None:
+    for form_id in form_ids:
+        # Each chunk commits on its own, so an interrupted run loses nothing
+        async with AsyncSessionFactory() as db:
+            form = await crud_form.get_form(db=db, form_id=form_id)
+            if form is None:
+                print(f"{form_id}: not found, skipped")
+                continue
+            cutoff = crud_archive.archive_cutoff(form.data)
+            if cutoff is None:
+                continue
+            archived = await crud_archive.archive_form(db, form=form, cutoff=cutoff, chunk_rows=chunk_rows)
+            print(f"{form_id}: {archived} responses archived (before {cutoff.isoformat()})")
+
+
+async def main(form_ids: List[uuid.UUID], all_forms: bool, chunk_rows: int) -> None:
+    try:
+        if all_forms:
+            async with AsyncSessionFactory() as db:
+                form_ids = list((await db.scalars(select(Form.id))).all())
+        await archive(form_ids, chunk_rows)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--form-id", type=uuid.UUID, action="append", dest="form_ids")
+    group.add_argument("--all", action="store_true", dest="all_forms")
+    parser.add_argument("--chunk-rows", type=int, default=settings.ARCHIVE_CHUNK_ROWS,
+                        help="responses per archive file")
+    args = parser.parse_args()
+    asyncio.run(main(args.form_ids or [], args.all_forms, args.chunk_rows))
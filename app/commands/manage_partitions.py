@@ -0,0 +1,50 @@
+"""
+Manage the monthly partitions of the responses table.
+
+Run `ensure` from cron (daily is plenty) so partitions always exist ahead of
+the rows that will land in them; rows that arrive without a partition go to
+responses_default and are moved into their month once it is created:
+
+    python -m app.commands.manage_partitions ensure [--ahead 3]
+    python -m app.commands.manage_partitions list
+"""
+import argparse
+import asyncio
+
+from app.core.config import settings
+from app.db import partitions
+from app.db.session import engine
+
+
+async def ensure(ahead: int) -> None:
+    async with engine.connect() as conn:
+        if not await partitions.is_partitioned(conn):
+            raise SystemExit("responses is not partitioned; run `alembic upgrade head` first")
+    created = await partitions.ensure_partitions(engine, ahead=ahead)
+    print(f"created: {', '.join(created)}" if created else "all partitions present")
+
+
+async def show() -> None:
+    async with engine.connect() as conn:
+        for name in await partitions.list_partitions(conn):
+            print(name)
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        if args.command == "ensure":
+            await ensure(args.ahead)
+        else:
+            await show()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    ensure_parser = subcommands.add_parser("ensure", help="create the current and upcoming monthly partitions")
+    ensure_parser.add_argument("--ahead", type=int, default=settings.RESPONSE_PARTITIONS_AHEAD,
+                               help="months to create beyond the current one")
+    subcommands.add_parser("list", help="list existing partitions")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,51 @@
+"""
+Recompute per-field answer counters from the responses table.
+
+Run after a form definition changes (options renamed or added, fields turned
+into choice fields) or after upgrading onto the form_field_stats migration:
+
+    python -m app.commands.rebuild_form_stats --form-id <uuid> [--form-id <uuid> ...]
+    python -m app.commands.rebuild_form_stats --all
+"""
+import argparse
+import asyncio
+import uuid
+from typing import List
+
+from sqlalchemy.future import select
+
+from app.crud import crud_form, crud_form_stats
+from app.db.session import AsyncSessionFactory, engine
+from app.models.form import Form
+
+
+async def rebuild(form_ids: List[uuid.UUID]) -> None:
+    for form_id in form_ids:
+        # One transaction per form keeps locks short on large installations
+        async with AsyncSessionFactory() as db:
+            form = await crud_form.get_form(db=db, form_id=form_id)
+            if form is None:
+                print(f"{form_id}: not found, skipped")
+                continue
+            counts = await crud_form_stats.rebuild_counts(db, form=form)
+            total = counts.get(crud_form_stats.TOTAL_KEY, 0)
+            print(f"{form_id}: {total} responses, {len(counts)} counters")
+
+
+async def main(form_ids: List[uuid.UUID], all_forms: bool) -> None:
+    try:
+        if all_forms:
+            async with AsyncSessionFactory() as db:
+                form_ids = list((await db.scalars(select(Form.id))).all())
+        await rebuild(form_ids)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--form-id", type=uuid.UUID, action="append", dest="form_ids")
+    group.add_argument("--all", action="store_true", dest="all_forms")
+    args = parser.parse_args()
+    asyncio.run(main(args.form_ids or [], args.all_forms))
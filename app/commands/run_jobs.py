@@ -0,0 +1,47 @@
+"""
+Run background jobs and webhook delivery outside the API process.
+
+Use with JOBS_ENABLED=false / WEBHOOKS_ENABLED=false on the API processes to
+keep this work off the servers handling requests, or alongside them to add
+capacity; any number of these can run at once, each claiming different jobs
+and outbox entries:
+
+    python -m app.commands.run_jobs [--workers N] [--no-webhooks]
+"""
+import argparse
+import asyncio
+import signal
+
+from app.core.config import settings
+from app.crud.job_runner import JobRunner
+from app.crud.webhook_dispatcher import WebhookDispatcher
+from app.db.session import engine
+
+
+async def main(workers: int, webhooks: bool) -> None:
+    runner = JobRunner(concurrency=workers)
+    dispatcher = WebhookDispatcher() if webhooks else None
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await runner.start()
+        if dispatcher is not None:
+            await dispatcher.start()
+        print(f"Running jobs with {runner.concurrency} workers" + (", delivering webhooks" if dispatcher else ""))
+        await stop.wait()
+    finally:
+        if dispatcher is not None:
+            await dispatcher.stop()
+        # Running jobs are put back in the queue for the next worker
+        await runner.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=settings.JOB_WORKERS)
+    parser.add_argument("--no-webhooks", action="store_false", dest="webhooks", help="don't deliver webhooks")
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.webhooks))
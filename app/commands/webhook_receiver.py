@@ -0,0 +1,65 @@
+"""
+Local stub webhook receiver for trying out and testing webhook delivery.
+
+Accepts POSTs, checks X-Formflow-Signature against --secret and prints one
+line per batch. --fail-rate makes it answer a share of requests with a 503
+to exercise retries; --delay-ms slows every reply down:
+
+    python -m app.commands.webhook_receiver --port 9000 --secret <secret> [--fail-rate 0.2] [--delay-ms 0]
+
+Then subscribe http://localhost:9000/ with POST /forms/{form_id}/webhooks.
+"""
+import argparse
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import orjson
+
+from app.core.webhook_signature import SIGNATURE_HEADER, verify
+
+
+def make_handler(secret: str, fail_rate: float, delay: float):
+    class Handler(BaseHTTPRequestHandler):
+        received = 0
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if delay:
+                time.sleep(delay)
+            if secret and not verify(secret, self.headers.get(SIGNATURE_HEADER, ""), body):
+                print("rejected: bad signature")
+                self.send_response(401)
+            elif random.random() < fail_rate:
+                print("answered 503 (simulated failure)")
+                self.send_response(503)
+            else:
+                payload = orjson.loads(body)
+                Handler.received += len(payload["responses"])
+                print(
+                    f"{self.headers.get('X-Formflow-Delivery')}: {len(payload['responses'])} responses "
+                    f"for form {payload['form_id']} ({Handler.received} total)"
+                )
+                self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--secret", default="", help="verify signatures with this secret (skipped if empty)")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.secret, args.fail_rate, args.delay_ms / 1000))
+    print(f"Listening on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,153 @@
+import asyncio
+import gzip
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, List
+
+import orjson
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Archived responses are stored as gzipped NDJSON "chunks", one file per
+# archival batch, at <ARCHIVE_DIR>/<form_id>/<chunk_id>.ndjson.gz. Each line
+# is one response ({"id", "form_id", "data", "created_at", "updated_at"}), in
+# (created_at, id) order. Files are immutable once written: they are created
+# under a temporary name, fsynced and renamed into place before the manifest
+# row pointing at them (response_archive_chunks) is committed, so a crash
+# can leave an orphaned file but never a manifest row without its file.
+#
+# File I/O runs in a worker thread to keep the event loop free. Decoded
+# chunks are kept in a small LRU cache, as paging through old data reads the
+# same chunk for several consecutive pages.
+
+CHUNK_SUFFIX = ".ndjson.gz"
+COMPRESSION_LEVEL = 6
+
+
+class ArchivedResponse:
+    """
+    Read-only stand-in for a Response row loaded from an archive chunk.
+    Has the same attributes, so serialization and export treat both alike.
+    """
+    __slots__ = ("id", "form_id", "data", "created_at", "updated_at")
+
+    def __init__(self, id, form_id, data, created_at, updated_at):
+        self.id = id
+        self.form_id = form_id
+        self.data = data
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+
+chunk_cache: TTLCache[List[ArchivedResponse]] = TTLCache(
+    maxsize=settings.ARCHIVE_CHUNK_CACHE_SIZE, ttl=300.0
+)
+
+
+def archive_root() -> Path:
+    return Path(settings.ARCHIVE_DIR)
+
+
+def chunk_path(form_id: uuid.UUID, chunk_id: uuid.UUID) -> str:
+    """
+    Path of a chunk relative to ARCHIVE_DIR, as stored in the manifest.
+    """
+    return f"{form_id}/{chunk_id}{CHUNK_SUFFIX}"
+
+
+def _encode(rows: Iterable[Any]) -> bytes:
+    lines = [
+        orjson.dumps({
+            "id": row.id,
+            "form_id": row.form_id,
+            "data": row.data,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+        })
+        for row in rows
+    ]
+    return gzip.compress(b"\n".join(lines) + b"\n", compresslevel=COMPRESSION_LEVEL)
+
+
+def _decode(payload: bytes) -> List[ArchivedResponse]:
+    rows = []
+    for line in gzip.decompress(payload).splitlines():
+        if not line:
+            continue
+        item = orjson.loads(line)
+        rows.append(ArchivedResponse(
+            uuid.UUID(item["id"]),
+            uuid.UUID(item["form_id"]),
+            item["data"],
+            datetime.fromisoformat(item["created_at"]),
+            datetime.fromisoformat(item["updated_at"]) if item["updated_at"] else None,
+        ))
+    return rows
+
+
+def _write_file(relative_path: str, payload: bytes) -> None:
+    target = archive_root() / relative_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(payload)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _read_file(relative_path: str) -> List[ArchivedResponse]:
+    with open(archive_root() / relative_path, "rb") as chunk_file:
+        return _decode(chunk_file.read())
+
+
+async def write_chunk(relative_path: str, rows: List[Any]) -> int:
+    """
+    Compress `rows` (Response-like objects, in key order) into a new chunk
+    file. Returns the compressed size in bytes.
+    """
+    def encode_and_write():
+        payload = _encode(rows)
+        _write_file(relative_path, payload)
+        return len(payload)
+    return await asyncio.to_thread(encode_and_write)
+
+
+async def read_chunk(chunk_id: uuid.UUID, relative_path: str) -> List[ArchivedResponse]:
+    """
+    All responses in a chunk, in (created_at, id) order.
+    """
+    rows = chunk_cache.get(chunk_id)
+    if rows is None:
+        rows = await asyncio.to_thread(_read_file, relative_path)
+        chunk_cache.set(chunk_id, rows)
+    return rows
+
+
+async def delete_chunk_file(relative_path: str) -> None:
+    def unlink():
+        try:
+            os.unlink(archive_root() / relative_path)
+        except FileNotFoundError:
+            pass
+    await asyncio.to_thread(unlink)
+
+
+async def remove_form_archive(form_id: uuid.UUID) -> None:
+    """
+    Delete every archive file of a form (after its manifest rows are gone).
+    """
+    await asyncio.to_thread(shutil.rmtree, archive_root() / str(form_id), True)
+
@@ -0,0 +1,44 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+# Conditional GET helpers (RFC 9110 §13): strong ETags and If-None-Match.
+
+
+def content_etag(body: bytes) -> str:
+    """
+    Strong ETag for an exact representation.
+    """
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def version_etag(*parts: Any) -> str:
+    """
+    Strong ETag derived from values that change whenever the representation
+    does (ids, timestamps, counters, the query string), without serializing it.
+    """
+    return content_etag("\x1f".join("" if part is None else str(part) for part in parts).encode())
+
+
+def _opaque(tag: str) -> str:
+    # If-None-Match uses the weak comparison function: W/ prefixes are ignored
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """
+    True if the request's If-None-Match header matches `etag`, i.e. the
+    client's copy is current and a 304 can be sent.
+    """
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(_opaque(tag.strip()) == _opaque(etag) for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    # A 304 repeats the validator and caching headers the 200 would have had
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
@@ -15,15 +15,159 @@ class Settings(BaseSettings):
 
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    # Optional read replicas, comma-separated. Read-only endpoints are routed
+    # to them (round-robin); everything else goes to DATABASE_URL.
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_REPLICA_POOL_SIZE: int = int(os.getenv("DB_REPLICA_POOL_SIZE", 5))
+    DB_REPLICA_MAX_OVERFLOW: int = int(os.getenv("DB_REPLICA_MAX_OVERFLOW", 10))
+    # After a user writes, their reads go to the primary for this many seconds
+    # so they see their own changes despite replication lag.
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+
+    # Log every SQL statement (debugging only; very noisy)
+    SQL_ECHO: bool = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
+
+    # Observability: Prometheus metrics on /metrics, and a warning with a
+    # per-statement breakdown for requests slower than SLOW_REQUEST_MS
+    # (0 disables). A request that runs the same statement
+    # N_PLUS_ONE_THRESHOLD or more times is flagged as a likely N+1.
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    SLOW_REQUEST_MS: float = float(os.getenv("SLOW_REQUEST_MS", 0))
+    N_PLUS_ONE_THRESHOLD: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))
 
     # JWT settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "default_secret")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
+    # Password hashing. Changing BCRYPT_ROUNDS re-hashes each user's password
+    # on their next successful login.
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    # bcrypt runs in a dedicated thread pool so it never blocks the event loop.
+    # Requests beyond PASSWORD_HASH_MAX_PENDING (queued + running) get a 503.
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
+    # In-process form definition cache (public submission / read hot path)
+    FORM_CACHE_MAXSIZE: int = int(os.getenv("FORM_CACHE_MAXSIZE", 2048))
+    FORM_CACHE_TTL_SECONDS: float = float(os.getenv("FORM_CACHE_TTL_SECONDS", 30))
+
+    # Cache-Control max-age for public form definitions (GET /forms/{form_id});
+    # lets browsers and a CDN serve them, revalidating with ETags afterwards.
+    FORM_HTTP_MAX_AGE: int = int(os.getenv("FORM_HTTP_MAX_AGE", 30))
+
+    # Serialize stored form/response data straight to JSON on read instead of
+    # re-validating it through the response_model (it was validated on write).
+    TRUSTED_SERIALIZATION: bool = os.getenv("TRUSTED_SERIALIZATION", "true").lower() in ("1", "true", "yes")
+
+    # Authenticated-principal cache: skips the users lookup on authenticated
+    # requests. The TTL bounds how long a change made by another process
+    # (or directly in the DB) can go unnoticed.
+    PRINCIPAL_CACHE_MAXSIZE: int = int(os.getenv("PRINCIPAL_CACHE_MAXSIZE", 10000))
+    PRINCIPAL_CACHE_TTL_SECONDS: float = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 30))
+
+    # Write-behind response ingestion (opt-in): submissions are queued and
+    # flushed as multi-row INSERTs once MAX_SIZE rows or MAX_DELAY_MS elapse.
+    RESPONSE_BATCHING_ENABLED: bool = os.getenv("RESPONSE_BATCHING_ENABLED", "false").lower() in ("1", "true", "yes")
+    RESPONSE_BATCH_MAX_SIZE: int = int(os.getenv("RESPONSE_BATCH_MAX_SIZE", 500))
+    RESPONSE_BATCH_MAX_DELAY_MS: int = int(os.getenv("RESPONSE_BATCH_MAX_DELAY_MS", 10))
+    RESPONSE_BATCH_MAX_CONCURRENT_FLUSHES: int = int(os.getenv("RESPONSE_BATCH_MAX_CONCURRENT_FLUSHES", 2))
+    # Upper bound on items accepted by POST /forms/{form_id}/responses:batch
+    RESPONSE_BULK_MAX_ITEMS: int = int(os.getenv("RESPONSE_BULK_MAX_ITEMS", 1000))
+    # Upper bound on forms created, cloned or deleted by one bulk request
+    FORM_BULK_MAX_ITEMS: int = int(os.getenv("FORM_BULK_MAX_ITEMS", 200))
+
+    # Months of responses partitions kept ahead of the current one by
+    # `python -m app.commands.manage_partitions ensure`.
+    RESPONSE_PARTITIONS_AHEAD: int = int(os.getenv("RESPONSE_PARTITIONS_AHEAD", 3))
+
+    # Background jobs (exports, stats rebuilds, purges) are stored in the jobs
+    # table and run by up to JOB_WORKERS concurrent workers per process. Set
+    # JOBS_ENABLED=false to run them only in a separate
+    # `python -m app.commands.run_jobs` process. A job whose worker stops
+    # heartbeating for JOB_LEASE_SECONDS is picked up again; failures are
+    # retried up to JOB_MAX_ATTEMPTS times. Finished jobs (and export files)
+    # are kept for JOB_RETENTION_DAYS.
+    JOBS_ENABLED: bool = os.getenv("JOBS_ENABLED", "true").lower() in ("1", "true", "yes")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", 2))
+    JOB_POLL_SECONDS: float = float(os.getenv("JOB_POLL_SECONDS", 2))
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", 300))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    JOB_RETENTION_DAYS: int = int(os.getenv("JOB_RETENTION_DAYS", 7))
+    EXPORT_DIR: str = os.getenv("EXPORT_DIR", str(BASE_DIR / "exports"))
+
+    # Webhooks: new responses are queued in an outbox with the response and
+    # POSTed to each form's subscribers in signed batches of up to
+    # WEBHOOK_BATCH_SIZE, gathering submissions for WEBHOOK_BATCH_DELAY_MS
+    # first. At most WEBHOOK_CONCURRENCY requests are in flight per process.
+    # Failed deliveries are retried with exponential backoff from
+    # WEBHOOK_RETRY_BASE_SECONDS and dropped after WEBHOOK_MAX_ATTEMPTS.
+    # WEBHOOKS_ENABLED=false leaves delivery to `python -m app.commands.run_jobs`.
+    # Targets must be https URLs of public hosts (see app.core.webhook_targets);
+    # WEBHOOK_ALLOW_HTTP / WEBHOOK_ALLOW_PRIVATE_TARGETS are for local testing.
+    WEBHOOKS_ENABLED: bool = os.getenv("WEBHOOKS_ENABLED", "true").lower() in ("1", "true", "yes")
+    WEBHOOK_BATCH_SIZE: int = int(os.getenv("WEBHOOK_BATCH_SIZE", 100))
+    WEBHOOK_BATCH_DELAY_MS: int = int(os.getenv("WEBHOOK_BATCH_DELAY_MS", 200))
+    WEBHOOK_CONCURRENCY: int = int(os.getenv("WEBHOOK_CONCURRENCY", 8))
+    WEBHOOK_TIMEOUT_SECONDS: float = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", 10))
+    WEBHOOK_MAX_ATTEMPTS: int = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", 8))
+    WEBHOOK_RETRY_BASE_SECONDS: float = float(os.getenv("WEBHOOK_RETRY_BASE_SECONDS", 10))
+    WEBHOOK_POLL_SECONDS: float = float(os.getenv("WEBHOOK_POLL_SECONDS", 2))
+    WEBHOOK_MAX_PER_FORM: int = int(os.getenv("WEBHOOK_MAX_PER_FORM", 10))
+    WEBHOOK_ALLOW_HTTP: bool = os.getenv("WEBHOOK_ALLOW_HTTP", "false").lower() in ("1", "true", "yes")
+    WEBHOOK_ALLOW_PRIVATE_TARGETS: bool = os.getenv("WEBHOOK_ALLOW_PRIVATE_TARGETS", "false").lower() in ("1", "true", "yes")
+
+    # Live response feed (GET /forms/{form_id}/responses/live, server-sent
+    # events): new responses are pushed at most every LIVE_FLUSH_INTERVAL_MS,
+    # with a keep-alive comment every LIVE_HEARTBEAT_SECONDS when idle. A
+    # feed that falls LIVE_MAX_PENDING responses behind drops the excess and
+    # is told to backfill. At most LIVE_MAX_SUBSCRIBERS feeds per process (0 = no cap).
+    LIVE_FLUSH_INTERVAL_MS: int = int(os.getenv("LIVE_FLUSH_INTERVAL_MS", 500))
+    LIVE_HEARTBEAT_SECONDS: float = float(os.getenv("LIVE_HEARTBEAT_SECONDS", 15))
+    LIVE_MAX_PENDING: int = int(os.getenv("LIVE_MAX_PENDING", 1000))
+    LIVE_MAX_SUBSCRIBERS: int = int(os.getenv("LIVE_MAX_SUBSCRIBERS", 1000))
+
+    # Deleted forms are hidden at once; their responses are then purged by a
+    # job in batches of FORM_PURGE_BATCH_SIZE rows, pausing
+    # FORM_PURGE_BATCH_PAUSE_MS between batches.
+    FORM_PURGE_BATCH_SIZE: int = int(os.getenv("FORM_PURGE_BATCH_SIZE", 5000))
+    FORM_PURGE_BATCH_PAUSE_MS: int = int(os.getenv("FORM_PURGE_BATCH_PAUSE_MS", 50))
+
+    # Cold-response archival (`python -m app.commands.archive_responses`):
+    # responses older than RESPONSE_ARCHIVE_AFTER_DAYS (0 = never; per form
+    # via FormData.settings["archiveAfterDays"]) are moved out of the database
+    # into gzipped NDJSON files of up to ARCHIVE_CHUNK_ROWS rows under
+    # ARCHIVE_DIR. Listing and export read them back transparently.
+    ARCHIVE_DIR: str = os.getenv("ARCHIVE_DIR", str(BASE_DIR / "archive"))
+    RESPONSE_ARCHIVE_AFTER_DAYS: int = int(os.getenv("RESPONSE_ARCHIVE_AFTER_DAYS", 0))
+    ARCHIVE_CHUNK_ROWS: int = int(os.getenv("ARCHIVE_CHUNK_ROWS", 10000))
+    ARCHIVE_CHUNK_CACHE_SIZE: int = int(os.getenv("ARCHIVE_CHUNK_CACHE_SIZE", 8))
+    # Filtered listings reaching into the archive decode chunks until a page
+    # of matches is found; past this many chunks (0 = no limit) they get a 400
+    ARCHIVE_FILTER_MAX_CHUNKS: int = int(os.getenv("ARCHIVE_FILTER_MAX_CHUNKS", 20))
+
+    # Admission control for public submissions. Token buckets per form and
+    # per client IP (requests/second and burst size; a rate of 0 disables the
+    # limit), overridable per form via FormData.settings["rateLimit"]. At most
+    # SUBMISSION_MAX_CONCURRENCY submissions do DB work at once (0 = no cap).
+    # Rejections are a 429 with Retry-After, before any DB session is opened.
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    SUBMISSION_RATE_PER_FORM: float = float(os.getenv("SUBMISSION_RATE_PER_FORM", 50))
+    SUBMISSION_BURST_PER_FORM: float = float(os.getenv("SUBMISSION_BURST_PER_FORM", 200))
+    SUBMISSION_RATE_PER_IP: float = float(os.getenv("SUBMISSION_RATE_PER_IP", 5))
+    SUBMISSION_BURST_PER_IP: float = float(os.getenv("SUBMISSION_BURST_PER_IP", 20))
+    SUBMISSION_MAX_CONCURRENCY: int = int(os.getenv("SUBMISSION_MAX_CONCURRENCY", 32))
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+
     class Config:
         case_sensitive = True
 
+    @property
+    def replica_urls(self) -> list:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
 settings = Settings()
 
 print(f"Loaded DATABASE_URL: {settings.DATABASE_URL}")
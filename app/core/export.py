@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, List, Mapping
+
+# Rows are buffered into chunks of this many before being handed to the
+# StreamingResponse, which keeps syscalls down without growing memory.
+ROWS_PER_CHUNK = 500
+
+MULTI_VALUE_SEPARATOR = "; "
+
+# Spreadsheets run a cell starting with one of these as a formula, and the
+# answers are typed by anyone who can submit the form: such text cells get a
+# leading apostrophe (CSV only; numbers are written as they are)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_columns(form_data: Mapping[str, Any]) -> List[str]:
+    """
+    Answer columns in the order the fields appear in the form definition.
+    Non-input fields (descriptions) have no answers and are skipped.
+    """
+    fields = sorted(form_data.get("fields", []), key=lambda field: field.get("order", 0))
+    return [field["id"] for field in fields if field.get("type") != "description"]
+
+
+def _flatten(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return _escape(MULTI_VALUE_SEPARATOR.join(str(item) for item in value))
+    if isinstance(value, dict):
+        return json.dumps(value, separators=(",", ":"))
+    if isinstance(value, str):
+        return _escape(value)
+    return value
+
+
+def _escape(text: str) -> str:
+    return "'" + text if text.startswith(FORMULA_PREFIXES) else text
+
+
+async def iter_csv(rows: AsyncIterator[Any], columns: List[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["response_id", "submitted_at", *(_escape(column) for column in columns)])
+    pending = 1
+    async for row in rows:
+        answers = row.data or {}
+        writer.writerow([
+            row.id,
+            row.created_at.isoformat() if row.created_at else "",
+            *(_flatten(answers.get(column)) for column in columns),
+        ])
+        pending += 1
+        if pending >= ROWS_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+async def iter_ndjson(rows: AsyncIterator[Any]) -> AsyncIterator[str]:
+    lines: List[str] = []
+    async for row in rows:
+        lines.append(json.dumps({
+            "id": str(row.id),
+            "form_id": str(row.form_id),
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "data": row.data,
+        }, separators=(",", ":")))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield "\n".join(lines) + "\n"
+            lines.clear()
+    if lines:
+        yield "\n".join(lines) + "\n"
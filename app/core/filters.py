@@ -0,0 +1,108 @@
+import operator
+import re
+from typing import Any, Iterable, List, Mapping, NamedTuple, Union
+
+# Response filter language, one predicate per `filter` query parameter
+# (multiple predicates are ANDed):
+#
+#   <field_id>:eq:<text>          answer equals text, or text is one of the chosen options
+#   <field_id>:contains:<text>    multi-select answer includes text
+#   <field_id>:exists             field was answered
+#   <field_id>:gt|gte|lt|lte:<n>  numeric answer compared with n
+#
+# e.g. ?filter=fld_color:eq:blue&filter=fld_age:gte:18
+#
+# Predicates are compiled to JSONB operators by crud_response: eq/contains
+# become @> containment tests served by the jsonb_path_ops GIN index on
+# responses.data; exists and ranges become @? jsonpath checks evaluated in the
+# database on the rows selected by the form_id index. `matches` evaluates the
+# same predicates in Python, for archived responses that are no longer in the
+# database.
+
+FIELD_ID_RE = re.compile(r"^[A-Za-z0-9_\-]{1,128}$")
+
+VALUE_OPS = frozenset({"eq", "contains"})
+RANGE_OPS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+MAX_PREDICATES = 10
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+class Predicate(NamedTuple):
+    field_id: str
+    op: str
+    value: Union[str, float, None] = None
+
+
+def parse_filter(expression: str) -> Predicate:
+    parts = expression.split(":", 2)
+    field_id = parts[0]
+    if not FIELD_ID_RE.match(field_id):
+        raise InvalidFilter(f"Invalid field id in filter '{expression}'")
+    if len(parts) == 2 and parts[1] == "exists":
+        return Predicate(field_id, "exists")
+    if len(parts) != 3:
+        raise InvalidFilter(f"Filter '{expression}' must look like <field_id>:<op>:<value>")
+    op, raw_value = parts[1], parts[2]
+    if op in VALUE_OPS:
+        return Predicate(field_id, op, raw_value)
+    if op in RANGE_OPS:
+        try:
+            number = float(raw_value)
+        except ValueError:
+            raise InvalidFilter(f"Filter '{expression}' needs a numeric value")
+        if number != number or number in (float("inf"), float("-inf")):
+            raise InvalidFilter(f"Filter '{expression}' needs a finite number")
+        return Predicate(field_id, op, number)
+    raise InvalidFilter(f"Unknown filter operator '{op}'")
+
+
+def parse_filters(expressions: Iterable[str]) -> List[Predicate]:
+    predicates = [parse_filter(expression) for expression in expressions]
+    if len(predicates) > MAX_PREDICATES:
+        raise InvalidFilter(f"At most {MAX_PREDICATES} filters are allowed")
+    return predicates
+
+
+def jsonpath_key(field_id: str) -> str:
+    """
+    Quote a (pre-validated) field id as a jsonpath member accessor.
+    """
+    return f'$."{field_id}"'
+
+
+def jsonpath_range(predicate: Predicate) -> str:
+    """
+    jsonpath that matches when the numeric answer satisfies the range predicate.
+    The value is a validated float, so it can be inlined safely.
+    """
+    return f"{jsonpath_key(predicate.field_id)} ? (@ {RANGE_OPS[predicate.op]} {predicate.value!r})"
+
+
+_RANGE_FUNCS = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def matches(predicate: Predicate, answers: Mapping[str, Any]) -> bool:
+    """
+    Python equivalent of the JSONB operators crud_response compiles
+    `predicate` to (strict-typed @> containment, lax-mode jsonpath).
+    """
+    if predicate.field_id not in answers:
+        return False
+    if predicate.op == "exists":
+        return True
+    answer = answers[predicate.field_id]
+    if predicate.op in RANGE_OPS:
+        # Lax jsonpath unwraps arrays; non-numbers never match
+        candidates = answer if isinstance(answer, list) else [answer]
+        compare = _RANGE_FUNCS[predicate.op]
+        return any(_is_number(value) and compare(value, predicate.value) for value in candidates)
+    if isinstance(answer, list):
+        return predicate.value in answer
+    return predicate.op == "eq" and answer == predicate.value
@@ -0,0 +1,59 @@
+from typing import Any, Dict, List, Mapping, Sequence
+
+from pydantic import ValidationError
+
+from app.core import json_patch
+from app.schemas.form import FormData, FormField
+
+
+class FormPatchValidationError(Exception):
+    """
+    Raised when a patched form definition is not a valid FormData.
+    `errors` are pydantic-style error dicts with locations in the form.
+    """
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        super().__init__("Patched form failed validation")
+        self.errors = errors
+
+
+def _errors(exc: ValidationError, prefix: tuple) -> List[Dict[str, Any]]:
+    return [
+        {"loc": list(prefix + tuple(error["loc"])), "msg": error["msg"], "type": error["type"]}
+        for error in exc.errors()
+    ]
+
+
+def apply_form_patch(data: Mapping[str, Any], operations: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply JSON Patch `operations` to a stored form definition and return the
+    new, normalized definition.
+
+    Only what the patch touched is validated: fields the patch did not modify
+    are the very same objects as in `data` (the patch is copy-on-write), are
+    already valid and are kept as they are. The small top-level part (title,
+    description, settings) is always re-validated. `data` is not modified.
+    """
+    patched = json_patch.apply_patch(data, operations)
+    if not isinstance(patched, dict) or not isinstance(patched.get("fields"), list):
+        raise FormPatchValidationError([{"loc": ["fields"], "msg": "Form must have a list of fields", "type": "list_type"}])
+
+    untouched = {id(field) for field in data.get("fields") or []}
+    errors: List[Dict[str, Any]] = []
+    fields = []
+    for index, field in enumerate(patched["fields"]):
+        if id(field) in untouched:
+            fields.append(field)
+            continue
+        try:
+            fields.append(FormField.model_validate(field).model_dump())
+        except ValidationError as exc:
+            errors.extend(_errors(exc, ("fields", index)))
+    try:
+        header = FormData.model_validate({**patched, "fields": []}).model_dump()
+    except ValidationError as exc:
+        errors.extend(_errors(exc, ()))
+    if errors:
+        raise FormPatchValidationError(errors)
+    header["fields"] = fields
+    return header
@@ -0,0 +1,157 @@
+import copy
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Union
+
+# RFC 6902 JSON Patch (with RFC 6901 JSON Pointers) over plain JSON values.
+#
+# Patches are applied copy-on-write: the input document is never modified,
+# and only the containers on the path of an operation are (shallowly) copied.
+# Everything the patch does not touch is shared with the input, so the cost
+# of a patch is proportional to the edit rather than to the document, and a
+# caller can tell which sub-objects were changed by identity.
+
+Json = Any
+Container = Union[Dict[str, Json], List[Json]]
+
+
+class JsonPatchError(ValueError):
+    """
+    The patch is malformed or cannot be applied (bad pointer, missing target).
+    """
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """
+    A "test" operation did not match the document.
+    """
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container: Container, token: str, pointer: str, *, append: bool = False) -> Union[int, str]:
+    if isinstance(container, dict):
+        return token
+    if isinstance(container, list):
+        if append and token == "-":
+            return len(container)
+        if not token.isdigit() or (token != "0" and token.startswith("0")):
+            raise JsonPatchError(f"Invalid array index {token!r} in {pointer!r}")
+        index = int(token)
+        if index > len(container) or (index == len(container) and not append):
+            raise JsonPatchError(f"Array index out of range in {pointer!r}")
+        return index
+    raise JsonPatchError(f"{pointer!r} does not point into an object or array")
+
+
+def resolve(document: Json, pointer: str) -> Json:
+    node = document
+    for token in parse_pointer(pointer):
+        key = _index(node, token, pointer)
+        if isinstance(node, dict) and key not in node:
+            raise JsonPatchError(f"{pointer!r} does not exist")
+        node = node[key]
+    return node
+
+
+def _update(node: Json, tokens: Sequence[str], pointer: str, action: Callable[[Container, str], None]) -> Json:
+    """
+    Copy `node` and the containers down to the parent of the target, then let
+    `action` modify that (copied) parent in place.
+    """
+    if isinstance(node, dict):
+        node = dict(node)
+    elif isinstance(node, list):
+        node = list(node)
+    else:
+        raise JsonPatchError(f"{pointer!r} does not point into an object or array")
+    if len(tokens) == 1:
+        action(node, tokens[0])
+        return node
+    key = _index(node, tokens[0], pointer)
+    if isinstance(node, dict) and key not in node:
+        raise JsonPatchError(f"{pointer!r} does not exist")
+    node[key] = _update(node[key], tokens[1:], pointer, action)
+    return node
+
+
+def _add(document: Json, pointer: str, value: Json) -> Json:
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        return value
+
+    def action(parent: Container, token: str) -> None:
+        key = _index(parent, token, pointer, append=True)
+        if isinstance(parent, list):
+            parent.insert(key, value)
+        else:
+            parent[key] = value
+    return _update(document, tokens, pointer, action)
+
+
+def _remove(document: Json, pointer: str) -> Json:
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        raise JsonPatchError("Cannot remove the whole document")
+
+    def action(parent: Container, token: str) -> None:
+        key = _index(parent, token, pointer)
+        if isinstance(parent, dict) and key not in parent:
+            raise JsonPatchError(f"{pointer!r} does not exist")
+        del parent[key]
+    return _update(document, tokens, pointer, action)
+
+
+def _replace(document: Json, pointer: str, value: Json) -> Json:
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        return value
+
+    def action(parent: Container, token: str) -> None:
+        key = _index(parent, token, pointer)
+        if isinstance(parent, dict) and key not in parent:
+            raise JsonPatchError(f"{pointer!r} does not exist")
+        parent[key] = value
+    return _update(document, tokens, pointer, action)
+
+
+def apply_patch(document: Json, operations: Sequence[Mapping[str, Json]]) -> Json:
+    """
+    Apply RFC 6902 `operations` (dicts with "op", "path" and "value"/"from")
+    and return the new document. Atomic: on error nothing is returned, and the
+    input is left untouched either way.
+    """
+    for operation in operations:
+        op = operation.get("op")
+        path = operation.get("path")
+        if not isinstance(path, str):
+            raise JsonPatchError("Every operation needs a string 'path'")
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JsonPatchError(f"'{op}' needs a 'value'")
+        if op in ("move", "copy") and not isinstance(operation.get("from"), str):
+            raise JsonPatchError(f"'{op}' needs a string 'from'")
+
+        if op == "add":
+            document = _add(document, path, operation["value"])
+        elif op == "remove":
+            document = _remove(document, path)
+        elif op == "replace":
+            document = _replace(document, path, operation["value"])
+        elif op == "move":
+            source = operation["from"]
+            if path.startswith(source + "/"):
+                raise JsonPatchError("Cannot move a value into one of its own children")
+            value = resolve(document, source)
+            document = _add(_remove(document, source), path, value)
+        elif op == "copy":
+            document = _add(document, path, copy.deepcopy(resolve(document, operation["from"])))
+        elif op == "test":
+            if resolve(document, path) != operation["value"]:
+                raise JsonPatchTestFailed(f"Test failed at {path!r}")
+        else:
+            raise JsonPatchError(f"Unknown operation {op!r}")
+    return document
@@ -0,0 +1,131 @@
+import asyncio
+import uuid
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from app.core import serialization
+from app.core.config import settings
+
+# In-process pub/sub for the live response feed (GET /forms/{form_id}/responses/live).
+#
+# The submission paths publish each committed batch of responses, with the
+# answer counts they add, to the form's subscribers. Publishing never blocks
+# and costs a dict lookup when nobody is listening. Each subscriber buffers
+# what arrives until its stream takes it; the buffer is bounded, so a slow
+# consumer loses responses (and is told how many, to backfill with a cursor)
+# instead of growing memory or slowing submissions down.
+#
+# The hub only sees submissions handled by its own process.
+
+# (field_id, option_value) -> count, as in crud_form_stats.Counts
+Counts = Dict[Tuple[str, str], int]
+
+
+class TooManySubscribers(Exception):
+    pass
+
+
+class LiveSubscription:
+    """
+    One open feed: responses and count deltas published since the last `drain`.
+    """
+
+    def __init__(self, form_id: uuid.UUID, max_pending: int):
+        self.form_id = form_id
+        self.max_pending = max_pending
+        self._responses: List[Any] = []
+        self._counts: Counts = {}
+        self._dropped = 0
+        self._ready = asyncio.Event()
+
+    def push(self, responses: List[Any], counts: Mapping[Tuple[str, str], int]) -> int:
+        """
+        Buffer published responses; returns how many didn't fit.
+        """
+        room = max(self.max_pending - len(self._responses), 0)
+        dropped = max(len(responses) - room, 0)
+        if dropped:
+            self._dropped += dropped
+            responses = responses[:room]
+        self._responses.extend(responses)
+        # Counts are small (one entry per chosen option) and always kept, so
+        # aggregates stay exact even when responses are dropped
+        for key, count in counts.items():
+            self._counts[key] = self._counts.get(key, 0) + count
+        self._ready.set()
+        return dropped
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait until something was published; False on timeout.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def drain(self) -> Tuple[List[Any], Counts, int]:
+        """
+        Take everything buffered: (responses, count deltas, responses dropped).
+        """
+        taken = self._responses, self._counts, self._dropped
+        self._responses, self._counts, self._dropped = [], {}, 0
+        self._ready.clear()
+        return taken
+
+
+class LiveHub:
+    def __init__(self, *, max_subscribers: int, max_pending: int):
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self._subscribers: Dict[uuid.UUID, Set[LiveSubscription]] = {}
+        self._count = 0
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, form_id: uuid.UUID) -> LiveSubscription:
+        if self.max_subscribers and self._count >= self.max_subscribers:
+            raise TooManySubscribers()
+        subscription = LiveSubscription(form_id, self.max_pending)
+        self._subscribers.setdefault(form_id, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: LiveSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.form_id)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        self._count -= 1
+        if not subscribers:
+            del self._subscribers[subscription.form_id]
+
+    def publish(self, form_id: uuid.UUID, responses: List[Any], counts: Mapping[Tuple[str, str], int]) -> None:
+        """
+        Hand newly committed responses of a form to its subscribers.
+        """
+        subscribers = self._subscribers.get(form_id)
+        if not subscribers:
+            return
+        for subscription in subscribers:
+            self.dropped += subscription.push(responses, counts)
+        self.published += len(responses)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": self._count,
+            "forms": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+def sse_event(event: str, data: Any, event_id: Optional[str] = None) -> bytes:
+    """
+    Encode one server-sent event with a JSON payload.
+    """
+    head = f"event: {event}\n" + (f"id: {event_id}\n" if event_id else "")
+    return head.encode() + b"data: " + serialization.dumps(data) + b"\n\n"
+
+
+live_hub = LiveHub(max_subscribers=settings.LIVE_MAX_SUBSCRIBERS, max_pending=settings.LIVE_MAX_PENDING)
@@ -0,0 +1,286 @@
+import logging
+import re
+import time
+from contextvars import ContextVar
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Minimal Prometheus text-format metrics (exposition format 0.0.4).
+#
+# Label values are bounded by construction: routes are path templates
+# ("/api/v1/forms/{form_id}"), never raw paths.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> (per-bucket counts, sum, count)
+        self._values: Dict[Labels, Tuple[List[int], float, int]] = {}
+        self._lock = Lock()
+
+    def observe(self, *labels: str, value: float) -> None:
+        with self._lock:
+            counts, total, count = self._values.get(labels) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[labels] = (counts, total + value, count + 1)
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        names = self.labelnames + ("le",)
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    yield f"{self.name}_bucket{_format_labels(names, labels + (repr(float(bound)),))} {bucket_count}"
+                yield f"{self.name}_bucket{_format_labels(names, labels + ('+Inf',))} {count}"
+                yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}"
+                yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+# A collector returns (metric name, type, help, [(labels dict, value), ...])
+# and is evaluated at scrape time; used for state owned by other modules
+# (caches, the password hasher, the response batcher).
+Sample = Tuple[Dict[str, str], float]
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Collector] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "formflow_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")
+))
+http_duration = registry.register(Histogram(
+    "formflow_http_request_duration_seconds", "Time to response headers, by route.", ("method", "route")
+))
+db_queries = registry.register(Histogram(
+    "formflow_db_queries_per_request", "SQL statements executed per request.", ("method", "route"), QUERY_COUNT_BUCKETS
+))
+db_time = registry.register(Histogram(
+    "formflow_db_time_seconds", "Time spent executing SQL per request.", ("method", "route")
+))
+relationship_loads = registry.register(Counter(
+    "formflow_db_relationship_loads_total",
+    "Extra queries issued to load relationships (selectinload/lazy loads).", ("method", "route")
+))
+n_plus_one = registry.register(Counter(
+    "formflow_db_n_plus_one_total",
+    "Requests that ran the same statement N_PLUS_ONE_THRESHOLD or more times.", ("method", "route")
+))
+slow_requests = registry.register(Counter(
+    "formflow_slow_requests_total", "Requests slower than SLOW_REQUEST_MS.", ("method", "route")
+))
+
+submissions_rejected = registry.register(Counter(
+    "formflow_submissions_rejected_total", "Public submissions refused by admission control.", ("reason",)
+))
+
+
+class RequestStats:
+    """
+    SQL activity of one request, filled in by the engine/session hooks below
+    while `request_stats` points at it.
+    """
+
+    __slots__ = ("queries", "db_time", "relationship_loads", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.relationship_loads = 0
+        # normalized statement -> [executions, total seconds]
+        self.statements: Dict[str, List[float]] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.queries += 1
+        self.db_time += elapsed
+        entry = self.statements.setdefault(normalize_statement(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        return [(statement, int(count)) for statement, (count, _) in self.statements.items() if count >= threshold]
+
+    def breakdown(self, limit: int = 5) -> List[Tuple[str, int, float]]:
+        """
+        The `limit` most expensive statements as (statement, executions, seconds).
+        """
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [(statement, int(count), elapsed) for statement, (count, elapsed) in ranked]
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+_IN_LIST = re.compile(r"IN \((?:[^()]*)\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    # Expanded IN lists differ in length between requests; collapse them so the
+    # same query shape is counted as one statement.
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+# Start times are keyed by execution context, and a failed statement drops
+# its own in handle_error, so an error can't leave a stale entry behind for
+# the next statement on the pooled connection to be timed against.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", {})[context] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop(context, None)
+    stats = request_stats.get()
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None:
+        conn.info.get("query_started", {}).pop(exception_context.execution_context, None)
+
+
+def _do_orm_execute(orm_execute_state):
+    if orm_execute_state.is_relationship_load:
+        stats = request_stats.get()
+        if stats is not None:
+            stats.relationship_loads += 1
+
+
+def instrument_engine(engine) -> None:
+    """
+    Attribute the SQL run through `engine` (an AsyncEngine) to the current
+    request. Work done outside a request (background flushes, CLI commands)
+    is not counted.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+# AsyncSession runs on a sync Session underneath; this catches relationship
+# loads from every session in the process.
+event.listen(Session, "do_orm_execute", _do_orm_execute)
+
+# (method, route, statement) combinations already logged as N+1 suspects
+_reported_n_plus_one: set = set()
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the matched route, e.g. "/api/v1/forms/{form_id}".
+    Depending on the FastAPI version, scope["route"] carries either the full
+    template or only the part below the router's (static) prefix; the prefix
+    is recovered from the concrete path in the latter case.
+    """
+    route = scope.get("route")
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is None:
+        return "unmatched"
+    path = scope.get("path", "")
+    for i, char in enumerate(path):
+        if char == "/" and path_regex.match(path[i:]):
+            return path[:i] + getattr(route, "path_format", route.path)
+    return getattr(route, "path_format", route.path)
+
+
+def observe_request(method: str, route: str, status_code: int, elapsed: float, stats: RequestStats) -> None:
+    http_requests.inc(method, route, str(status_code))
+    http_duration.observe(method, route, value=elapsed)
+    db_queries.observe(method, route, value=stats.queries)
+    db_time.observe(method, route, value=stats.db_time)
+    if stats.relationship_loads:
+        relationship_loads.inc(method, route, amount=stats.relationship_loads)
+
+    repeated = stats.repeated_statements(settings.N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        n_plus_one.inc(method, route)
+        for statement, count in repeated:
+            key = (method, route, statement)
+            if key not in _reported_n_plus_one:
+                _reported_n_plus_one.add(key)
+                logger.warning("Possible N+1 in %s %s: statement ran %d times: %s", method, route, count, statement[:500])
+
+    if settings.SLOW_REQUEST_MS and elapsed * 1000 >= settings.SLOW_REQUEST_MS:
+        slow_requests.inc(method, route)
+        breakdown = "".join(
+            f"\n  {count}x {seconds * 1000:.1f} ms  {statement[:300]}"
+            for statement, count, seconds in stats.breakdown()
+        )
+        logger.warning(
+            "Slow request %s %s -> %d in %.1f ms: %d queries (%d relationship loads), %.1f ms in DB%s",
+            method, route, status_code, elapsed * 1000, stats.queries,
+            stats.relationship_loads, stats.db_time * 1000, breakdown,
+        )
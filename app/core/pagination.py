@@ -0,0 +1,39 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+# Keyset pagination: a page is addressed by the (created_at, id) of the last
+# row of the previous page, so fetching page N costs the same index range scan
+# as page 1. Cursors are opaque to clients (urlsafe base64 of a small JSON list).
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+Cursor = Tuple[datetime, uuid.UUID]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at, row_id = datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid pagination cursor") from exc
+    # Our cursors always carry an offset (timestamptz columns); a hand-made
+    # naive one is read as UTC rather than failing comparisons against
+    # aware datetimes further down
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at, row_id
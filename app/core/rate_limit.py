@@ -0,0 +1,132 @@
+import math
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+
+class RateLimited(Exception):
+    """
+    Raised when a request is refused by admission control.
+    `retry_after` is the number of seconds the client should wait.
+    """
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets, one per key. Each bucket holds up to `burst`
+    tokens and refills at `rate` tokens per second; a request takes one (or
+    `cost`, e.g. one per response of a batch submission).
+    Rate and burst are passed on every call so per-key overrides (e.g. from a
+    form's settings) take effect without resetting the bucket.
+
+    Buckets are kept LRU-ordered and capped at `maxsize` keys; an evicted
+    bucket was idle the longest and would have been refilled anyway.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        # key -> (tokens, last refill time)
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def acquire(
+        self, key: Hashable, *, rate: float, burst: float, cost: float = 1.0, now: Optional[float] = None
+    ) -> float:
+        """
+        Take `cost` tokens for `key`. Returns 0 on success, otherwise the
+        seconds until enough tokens will be available (nothing is taken in
+        that case), or math.inf if `cost` exceeds what the bucket can hold.
+        A rate <= 0 disables the limit.
+        """
+        _, wait = self.acquire_all([(key, rate, burst)], cost=cost, now=now)
+        return wait
+
+    def acquire_all(
+        self, buckets: Sequence[Tuple[Hashable, float, float]], *, cost: float = 1.0, now: Optional[float] = None
+    ) -> Tuple[Optional[int], float]:
+        """
+        Take `cost` tokens from every (key, rate, burst) bucket, or from none
+        of them. Returns (None, 0) on success, otherwise the index of the first
+        bucket short of tokens and the wait as `acquire` reports it.
+        """
+        if cost <= 0:
+            return None, 0.0
+        limited = [(index, key, rate, max(burst, 1.0)) for index, (key, rate, burst) in enumerate(buckets) if rate > 0]
+        for index, _, _, burst in limited:
+            if cost > burst:
+                return index, math.inf
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            refilled: List[Tuple[Hashable, float]] = []
+            short: Optional[Tuple[int, float]] = None
+            for index, key, rate, burst in limited:
+                tokens, updated = self._buckets.pop(key, (burst, now))
+                tokens = min(burst, tokens + (now - updated) * rate)
+                refilled.append((key, tokens))
+                if short is None and tokens < cost:
+                    short = (index, (cost - tokens) / rate)
+            taken = 0.0 if short is not None else cost
+            for key, tokens in refilled:
+                self._buckets[key] = (tokens - taken, now)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return short if short is not None else (None, 0.0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class ConcurrencyLimiter:
+    """
+    Non-blocking cap on concurrent work: `try_acquire` fails immediately when
+    `limit` holders are active instead of queueing. A limit <= 0 disables it.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.rejected = 0
+
+    def try_acquire(self) -> bool:
+        # Only touched from the event loop, so no lock is needed
+        if self.limit > 0 and self.active >= self.limit:
+            self.rejected += 1
+            return False
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"limit": self.limit, "active": self.active, "rejected": self.rejected}
+
+
+def form_rate_limits(form_settings: Optional[Dict[str, Any]], defaults: Dict[str, float]) -> Dict[str, float]:
+    """
+    Merge a form's `settings.rateLimit` overrides over the defaults.
+
+        "settings": {"rateLimit": {"perSecond": 100, "burst": 500,
+                                   "perIpPerSecond": 1, "perIpBurst": 5}}
+
+    Unknown keys and non-numeric values are ignored.
+    """
+    limits = dict(defaults)
+    overrides = (form_settings or {}).get("rateLimit")
+    if isinstance(overrides, dict):
+        for key in limits:
+            value = overrides.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0:
+                limits[key] = float(value)
+    return limits
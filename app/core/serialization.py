@@ -0,0 +1,75 @@
+from typing import Any, Dict, Iterable, List
+
+import orjson
+from fastapi import Response
+
+# Trusted output path for listings.
+#
+# Form and response `data` was validated against the pydantic schemas when it
+# was written, so re-validating it through FormData/FormField/... on every
+# read only burns CPU. These helpers turn ORM rows (or cached snapshots)
+# straight into JSON bytes with orjson, producing the same shape as the
+# form_schema.Form / response_schema.Response models. Endpoints still declare
+# response_model for the OpenAPI docs; returning a Response skips it at runtime.
+
+JSON_OPTIONS = orjson.OPT_UTC_Z # "...Z" for UTC, matching pydantic's output
+
+
+def user_to_dict(user: Any) -> Dict[str, Any]:
+    return {
+        "email": user.email,
+        "is_active": user.is_active,
+        "is_superuser": user.is_superuser,
+        "id": user.id,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+    }
+
+
+def form_to_dict(form: Any, *, include_owner: bool = True) -> Dict[str, Any]:
+    item = {
+        "id": form.id,
+        "owner_id": form.owner_id,
+        "data": form.data,
+        "created_at": form.created_at,
+        "updated_at": form.updated_at,
+    }
+    if include_owner:
+        item["owner"] = user_to_dict(form.owner)
+    return item
+
+
+def form_list_item_to_dict(row: Any) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "field_count": row.field_count or 0,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+    }
+
+
+def response_to_dict(response: Any) -> Dict[str, Any]:
+    return {
+        "id": response.id,
+        "form_id": response.form_id,
+        "data": response.data,
+        "created_at": response.created_at,
+        "updated_at": response.updated_at,
+    }
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=JSON_OPTIONS)
+
+
+def json_response(content: Any, *, status_code: int = 200, headers: Dict[str, str] = None) -> Response:
+    return Response(content=dumps(content), status_code=status_code, headers=headers, media_type="application/json")
+
+
+def forms_json(forms: Iterable[Any]) -> List[Dict[str, Any]]:
+    return [form_to_dict(form) for form in forms]
+
+
+def responses_json(responses: Iterable[Any]) -> List[Dict[str, Any]]:
+    return [response_to_dict(response) for response in responses]
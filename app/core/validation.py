@@ -0,0 +1,285 @@
+import logging
+import re
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+# Kept deliberately simple: the goal is catching obvious typos, not RFC 5322.
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+CHOICE_TYPES = frozenset({"multiple_choice", "dropdown"})
+MULTI_CHOICE_TYPES = frozenset({"checkbox"})
+TEXT_TYPES = frozenset({"text", "email", "textarea"})
+NON_INPUT_TYPES = frozenset({"description"})
+
+# Stats key shared by every answer outside a choice field's defined options
+OTHER_OPTION = ""
+
+# Owner-supplied `validation.pattern` regexes run against every submission,
+# so they are kept short and free of nested repetition (`(a+)+$` and the
+# like), which backtracks exponentially on near-miss input.
+MAX_PATTERN_LENGTH = 500
+_REPEATS = tuple(
+    getattr(sre_parse, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_parse, name)
+)
+
+
+class ResponseValidationError(Exception):
+    """
+    Raised when a submission does not satisfy the form definition.
+    `errors` maps field IDs to a human readable message.
+    """
+
+    def __init__(self, errors: Dict[str, str]):
+        super().__init__("Response failed validation")
+        self.errors = errors
+
+
+def _has_nested_repeat(items, inside_repeat: bool = False) -> bool:
+    for op, arg in items:
+        if op in _REPEATS:
+            _, high, sub = arg
+            repeats = high > 1
+            if repeats and inside_repeat:
+                return True
+            if _has_nested_repeat(sub, inside_repeat or repeats):
+                return True
+        elif op is sre_parse.SUBPATTERN:
+            if _has_nested_repeat(arg[-1], inside_repeat):
+                return True
+        elif op is sre_parse.BRANCH:
+            if any(_has_nested_repeat(branch, inside_repeat) for branch in arg[1]):
+                return True
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if _has_nested_repeat(arg[1], inside_repeat):
+                return True
+    return False
+
+
+def compile_pattern(pattern: Any) -> re.Pattern:
+    """
+    Compile a field's `validation.pattern`, raising ValueError if it is not
+    a string, too long, invalid, or nests repetition.
+    """
+    if not isinstance(pattern, str):
+        raise ValueError("Pattern must be a string.")
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        raise ValueError(f"Pattern must be at most {MAX_PATTERN_LENGTH} characters.")
+    try:
+        compiled = re.compile(pattern)
+        parsed = sre_parse.parse(pattern)
+    except re.error as exc:
+        raise ValueError(f"Invalid pattern: {exc}") from None
+    if _has_nested_repeat(parsed):
+        raise ValueError("Pattern must not repeat a group that itself repeats.")
+    return compiled
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+class _FieldRule:
+    """
+    Precompiled checks for a single FormField.
+    Everything derived from the definition is computed once in __init__.
+    """
+
+    __slots__ = (
+        "id", "type", "required", "min_length", "max_length",
+        "options", "allow_other", "pattern",
+    )
+
+    def __init__(self, field: Mapping[str, Any]):
+        self.id: str = field["id"]
+        self.type: str = field.get("type", "text")
+        self.required: bool = bool(field.get("required"))
+        self.min_length: Optional[int] = field.get("minLength")
+        self.max_length: Optional[int] = field.get("maxLength")
+        self.allow_other: bool = bool(field.get("otherOption"))
+        options = field.get("options") or []
+        self.options: Optional[FrozenSet[str]] = (
+            frozenset(opt["value"] for opt in options) if options else None
+        )
+        pattern = (field.get("validation") or {}).get("pattern")
+        self.pattern: Optional[re.Pattern] = None
+        if pattern:
+            try:
+                self.pattern = compile_pattern(pattern)
+            except ValueError as exc:
+                # Definitions stored before patterns were checked on write:
+                # skip the check rather than fail every submission
+                logger.warning("Ignoring pattern of field %s: %s", self.id, exc)
+
+    def check(self, value: Any) -> Optional[str]:
+        """
+        Return an error message for `value`, or None if it is acceptable.
+        """
+        if _is_empty(value):
+            return "This field is required." if self.required else None
+
+        if self.type in MULTI_CHOICE_TYPES:
+            if not isinstance(value, list):
+                return "Expected a list of options."
+            if self.options is not None and not self.allow_other:
+                for item in value:
+                    if item not in self.options:
+                        return f"'{item}' is not a valid option."
+            for item in value:
+                if isinstance(item, str) and not self._matches(item):
+                    return f"'{item}' does not match the expected format."
+            return None
+
+        if self.type in CHOICE_TYPES:
+            if not isinstance(value, str):
+                return "Expected a single option."
+            if self.options is not None and not self.allow_other and value not in self.options:
+                return f"'{value}' is not a valid option."
+
+        elif self.type in TEXT_TYPES or self.min_length is not None or self.max_length is not None:
+            if not isinstance(value, str):
+                return "Expected a string."
+            if self.min_length is not None and len(value) < self.min_length:
+                return f"Must be at least {self.min_length} characters."
+            if self.max_length is not None and len(value) > self.max_length:
+                return f"Must be at most {self.max_length} characters."
+            if self.type == "email" and not EMAIL_RE.match(value):
+                return "Enter a valid email address."
+
+        # The pattern applies to any string answer, whatever the field type
+        if isinstance(value, str) and not self._matches(value):
+            return "Value does not match the expected format."
+        return None
+
+    def _matches(self, value: str) -> bool:
+        return self.pattern is None or self.pattern.fullmatch(value) is not None
+
+
+class CompiledFormValidator:
+    """
+    A form definition compiled into per-field rules indexed by field ID.
+    """
+
+    __slots__ = ("rules", "required_ids", "choice_ids", "multi_choice_ids")
+
+    def __init__(self, form_data: Mapping[str, Any]):
+        self.rules: Dict[str, _FieldRule] = {}
+        for field in form_data.get("fields", []):
+            if field.get("type") in NON_INPUT_TYPES:
+                continue
+            rule = _FieldRule(field)
+            self.rules[rule.id] = rule
+        self.required_ids: Tuple[str, ...] = tuple(
+            rule.id for rule in self.rules.values() if rule.required
+        )
+        self.choice_ids: Tuple[str, ...] = tuple(
+            rule.id for rule in self.rules.values() if rule.type in CHOICE_TYPES
+        )
+        self.multi_choice_ids: Tuple[str, ...] = tuple(
+            rule.id for rule in self.rules.values() if rule.type in MULTI_CHOICE_TYPES
+        )
+
+    def validate(self, answers: Mapping[str, Any]) -> None:
+        """
+        Raise ResponseValidationError if `answers` does not fit the form.
+        """
+        errors: Dict[str, str] = {}
+        rules = self.rules
+        for field_id, value in answers.items():
+            rule = rules.get(field_id)
+            if rule is None:
+                errors[field_id] = "Unknown field."
+                continue
+            message = rule.check(value)
+            if message is not None:
+                errors[field_id] = message
+        for field_id in self.required_ids:
+            if field_id not in answers:
+                errors[field_id] = "This field is required."
+        if errors:
+            raise ResponseValidationError(errors)
+
+    def count_options(self, answers: Mapping[str, Any], counts: Dict[Tuple[str, str], int]) -> None:
+        """
+        Add the (field_id, option_value) pairs chosen in `answers` to `counts`.
+        Only choice fields (multiple_choice, dropdown, checkbox) are counted,
+        and only their defined options: free-text "other" answers (or any
+        answer to a field without options) share the OTHER_OPTION bucket so
+        respondents can't grow the counter table without bound.
+        """
+        for field_id in self.choice_ids:
+            value = answers.get(field_id)
+            if isinstance(value, str) and value:
+                key = (field_id, self._bucket(field_id, value))
+                counts[key] = counts.get(key, 0) + 1
+        for field_id in self.multi_choice_ids:
+            value = answers.get(field_id)
+            if isinstance(value, list):
+                buckets = {self._bucket(field_id, item) for item in value if isinstance(item, str) and item}
+                for bucket in buckets:
+                    key = (field_id, bucket)
+                    counts[key] = counts.get(key, 0) + 1
+
+    def _bucket(self, field_id: str, value: str) -> str:
+        options = self.rules[field_id].options
+        return value if options is not None and value in options else OTHER_OPTION
+
+
+class ValidatorCache:
+    """
+    Bounded LRU of compiled validators keyed by (form_id, updated_at).
+    A changed definition bumps updated_at, so stale entries are simply
+    never hit again and age out of the LRU.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[uuid.UUID, Optional[datetime]], CompiledFormValidator]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(
+        self, form_id: uuid.UUID, updated_at: Optional[datetime], form_data: Mapping[str, Any]
+    ) -> CompiledFormValidator:
+        key = (form_id, updated_at)
+        with self._lock:
+            validator = self._entries.get(key)
+            if validator is not None:
+                self._entries.move_to_end(key)
+                return validator
+        validator = CompiledFormValidator(form_data)
+        with self._lock:
+            self._entries[key] = validator
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return validator
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+validator_cache = ValidatorCache()
+
+
+def validate_response(form: Any, answers: Mapping[str, Any]) -> None:
+    """
+    Validate `answers` against a Form ORM object (or anything with
+    id / updated_at / data attributes) using the cached compiled validator.
+    """
+    validator = validator_cache.get(form.id, form.updated_at, form.data)
+    validator.validate(answers)
+
+
+def format_errors(errors: Mapping[str, str]) -> List[Dict[str, str]]:
+    return [{"field": field_id, "message": message} for field_id, message in errors.items()]
@@ -0,0 +1,29 @@
+import hashlib
+import hmac
+import time
+
+# Header carrying the signature of a webhook request body
+SIGNATURE_HEADER = "X-Formflow-Signature"
+# Receivers should reject signatures older than this as replays
+MAX_SIGNATURE_AGE = 300
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """
+    Signature header value: "t=<unix time>,v1=<hex HMAC-SHA256 of
+    '<unix time>.<body>'>". Covering the timestamp lets receivers reject
+    replays of old requests.
+    """
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify(secret: str, header: str, body: bytes, *, max_age: float = MAX_SIGNATURE_AGE) -> bool:
+    """
+    Check a signature header as a receiver would.
+    """
+    parts = dict(part.split("=", 1) for part in header.split(",") if "=" in part)
+    timestamp = parts.get("t", "")
+    if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > max_age:
+        return False
+    return hmac.compare_digest(sign(secret, timestamp, body), header)
@@ -0,0 +1,112 @@
+import asyncio
+import ipaddress
+import socket
+from typing import List
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+
+from app.core.config import settings
+
+# Webhook URLs come from form owners but are requested by the server, so they
+# must not reach into the server's own network: only https, and only hosts
+# whose every address is public. Deliveries check again when connecting,
+# against the address actually connected to, so a hostname that starts
+# resolving to an internal address after the subscription was created (DNS
+# rebinding) gets nothing. WEBHOOK_ALLOW_HTTP and
+# WEBHOOK_ALLOW_PRIVATE_TARGETS relax this for local testing.
+
+
+class UnsafeTarget(ValueError):
+    pass
+
+
+def is_public(address: str) -> bool:
+    """
+    False for loopback, private, link-local, shared, reserved, multicast and
+    unspecified addresses (IPv4-mapped IPv6 addresses are judged as IPv4).
+    """
+    ip = ipaddress.ip_address(address)
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def check_scheme(url: str) -> None:
+    scheme = urlsplit(url).scheme.lower()
+    if scheme == "https" or (scheme == "http" and settings.WEBHOOK_ALLOW_HTTP):
+        return
+    raise UnsafeTarget("Webhook URLs must use https.")
+
+
+async def resolve(host: str, port: int) -> List[str]:
+    """
+    The addresses `host` resolves to, refusing hosts with any non-public one
+    unless WEBHOOK_ALLOW_PRIVATE_TARGETS is set.
+    """
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as exc:
+        raise UnsafeTarget(f"Could not resolve {host}: {exc}") from None
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    if not settings.WEBHOOK_ALLOW_PRIVATE_TARGETS:
+        for address in addresses:
+            if not is_public(address):
+                raise UnsafeTarget(f"{host} resolves to a non-public address ({address}).")
+    return addresses
+
+
+async def check_url(url: str) -> None:
+    """
+    Refuse a webhook URL that deliveries would not be allowed to reach.
+    """
+    check_scheme(url)
+    parts = urlsplit(url)
+    if not parts.hostname:
+        raise UnsafeTarget("Webhook URLs must have a host.")
+    await resolve(parts.hostname, parts.port or (443 if parts.scheme.lower() == "https" else 80))
+
+
+class _CheckedBackend(httpcore.AsyncNetworkBackend):
+    """
+    Resolves each new connection's host itself and connects to a checked
+    address; TLS still verifies the certificate against the hostname.
+    """
+
+    def __init__(self):
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await resolve(host, port)
+        except UnsafeTarget as exc:
+            raise httpcore.ConnectError(str(exc)) from None
+        return await self._backend.connect_tcp(
+            addresses[0], port, timeout=timeout, local_address=local_address, socket_options=socket_options
+        )
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise httpcore.ConnectError("Webhooks can't be delivered to unix sockets.")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class CheckedTransport(httpx.AsyncHTTPTransport):
+    """
+    HTTP transport for webhook deliveries: connections only go to public
+    addresses (see _CheckedBackend). Proxy settings from the environment are
+    ignored, since a proxy would connect on our behalf unchecked.
+    """
+
+    def __init__(self, *, limits: httpx.Limits):
+        super().__init__(limits=limits, trust_env=False)
+        # The pool httpx builds, with connections made through the check
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(trust_env=False),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=_CheckedBackend(),
+        )
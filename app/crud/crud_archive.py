@@ -0,0 +1,126 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, List, Optional
+
+from sqlalchemy import delete, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core import archive
+from app.core.config import settings
+from app.core.pagination import Cursor
+from app.db.partitions import responses_since
+from app.models.response import Response
+from app.models.response_archive_chunk import ResponseArchiveChunk
+
+
+def archive_after_days(form_data: Any) -> int:
+    """
+    Retention window in days before a form's responses are archived;
+    FormData.settings["archiveAfterDays"] overrides the global default.
+    0 means never.
+    """
+    form_settings = (form_data or {}).get("settings") or {}
+    days = form_settings.get("archiveAfterDays", settings.RESPONSE_ARCHIVE_AFTER_DAYS)
+    if not isinstance(days, int) or isinstance(days, bool) or days < 0:
+        return settings.RESPONSE_ARCHIVE_AFTER_DAYS
+    return days
+
+
+def archive_cutoff(form_data: Any, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Responses created before the returned time are due for archival (None: never).
+    """
+    days = archive_after_days(form_data)
+    if not days:
+        return None
+    return (now or datetime.now(timezone.utc)) - timedelta(days=days)
+
+
+async def get_chunks(
+    db: AsyncSession, *, form_id: uuid.UUID, after: Optional[Cursor] = None
+) -> List[ResponseArchiveChunk]:
+    """
+    Manifest entries of a form, oldest first. With `after`, only chunks that
+    hold rows past that (created_at, id) key.
+    """
+    query = select(ResponseArchiveChunk).filter(ResponseArchiveChunk.form_id == form_id)
+    if after is not None:
+        query = query.filter(
+            tuple_(ResponseArchiveChunk.last_created_at, ResponseArchiveChunk.last_id) > tuple(after)
+        )
+    result = await db.execute(
+        query.order_by(ResponseArchiveChunk.first_created_at.asc(), ResponseArchiveChunk.first_id.asc())
+    )
+    return list(result.scalars().all())
+
+
+async def iter_archived(db: AsyncSession, *, form_id: uuid.UUID) -> AsyncIterator[archive.ArchivedResponse]:
+    """
+    Yield every archived response of a form, chunk by chunk, oldest first.
+    Only one decoded chunk is held at a time.
+    """
+    for chunk in await get_chunks(db, form_id=form_id):
+        for row in await archive.read_chunk(chunk.id, chunk.path):
+            yield row
+
+
+async def archive_form(
+    db: AsyncSession, *, form: Any, cutoff: datetime, chunk_rows: int = 1000
+) -> int:
+    """
+    Move a form's responses created before `cutoff` into archive chunks of up
+    to `chunk_rows` rows, oldest first. Each chunk is written to disk, then
+    its manifest row is inserted and its rows deleted in one transaction, so
+    every response is always readable from exactly one place. Answer counters
+    are left alone: they keep counting archived responses.
+    Returns the number of responses archived.
+    """
+    archived = 0
+    clauses = [Response.form_id == form.id, Response.created_at < cutoff]
+    since = responses_since(form.created_at)
+    if since is not None:
+        clauses.append(Response.created_at >= since)
+    while True:
+        result = await db.execute(
+            select(Response.id, Response.form_id, Response.data, Response.created_at, Response.updated_at)
+            .filter(*clauses)
+            .order_by(Response.created_at.asc(), Response.id.asc())
+            .limit(chunk_rows)
+        )
+        rows = result.all()
+        if not rows:
+            return archived
+
+        chunk_id = uuid.uuid4()
+        path = archive.chunk_path(form.id, chunk_id)
+        await archive.write_chunk(path, rows)
+        first, last = rows[0], rows[-1]
+        try:
+            db.add(ResponseArchiveChunk(
+                id=chunk_id, form_id=form.id, path=path, row_count=len(rows),
+                first_created_at=first.created_at, first_id=first.id,
+                last_created_at=last.created_at, last_id=last.id,
+            ))
+            deleted = await db.execute(
+                delete(Response)
+                .where(
+                    Response.form_id == form.id,
+                    # The range lets Postgres prune to the chunk's partitions
+                    Response.created_at >= first.created_at,
+                    Response.created_at <= last.created_at,
+                    Response.id.in_([row.id for row in rows]),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if deleted.rowcount != len(rows):
+                raise RuntimeError(f"Responses of form {form.id} changed while being archived")
+            await db.commit()
+        except BaseException:
+            await db.rollback()
+            await archive.delete_chunk_file(path)
+            raise
+        archived += len(rows)
+        if len(rows) < chunk_rows:
+            return archived
+
@@ -1,110 +1,373 @@
 import uuid
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, Tuple
 
-from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
 
-from app.models.form import Form
-from app.schemas.form import FormCreate, FormUpdate, FormData
+from app.core import archive, conditional, serialization
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pagination import Cursor
+from app.crud import crud_job
+from app.db.session import is_replica
+from app.models.form import Form, summary_columns
+from app.models.job import Job
+from app.schemas.form import FormCreate, FormUpdate
+from app.schemas.user import User as UserSchema
+
 
-async def create_form(db: AsyncSession, *, form_in: FormCreate, owner_id: uuid.UUID) -> Optional[Form]:
+class CachedForm:
     """
-    Create a new form with a client-provided ID.
-    Returns the created form or None if the ID already exists.
+    Detached, read-only snapshot of a Form row (plus its owner) kept in the
+    in-process form cache. It exposes the same attributes as the ORM model,
+    so it can be returned from endpoints using `form_schema.Form` and passed
+    to the response validator. It is never attached to a session.
     """
-    # Check if ID already exists first (optional but good practice)
-    existing_form = await get_form(db=db, form_id=form_in.id)
-    if existing_form:
-        return None # Indicate conflict
 
-    # Pydantic V2+ .model_dump() replaces .dict()
-    form_data_dict = form_in.data.model_dump()
-    db_form = Form(
-        id=form_in.id, # Use the provided ID
-        data=form_data_dict,
-        owner_id=owner_id
+    __slots__ = ("id", "owner_id", "data", "created_at", "updated_at", "owner", "_body", "_etag")
+
+    def __init__(self, db_form: Any, owner: Optional[Any] = None):
+        # `db_form` can also be a RETURNING row, with the owner passed in
+        self.id = db_form.id
+        self.owner_id = db_form.owner_id
+        self.data = db_form.data
+        self.created_at = db_form.created_at
+        self.updated_at = db_form.updated_at
+        self.owner = UserSchema.model_validate(owner if owner is not None else db_form.owner)
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+
+    @property
+    def body(self) -> bytes:
+        """
+        The serialized form (as returned by GET /forms/{form_id}), built once
+        per snapshot.
+        """
+        if self._body is None:
+            self._body = serialization.dumps(serialization.form_to_dict(self))
+        return self._body
+
+    @property
+    def etag(self) -> str:
+        # Content hash, so owner changes are reflected too, not just updated_at
+        if self._etag is None:
+            self._etag = conditional.content_etag(self.body)
+        return self._etag
+
+
+form_cache: TTLCache[CachedForm] = TTLCache(
+    maxsize=settings.FORM_CACHE_MAXSIZE, ttl=settings.FORM_CACHE_TTL_SECONDS
+)
+
+
+# Columns handed back by INSERT/UPDATE ... RETURNING, enough to build a CachedForm
+_RETURNED_COLUMNS = (Form.id, Form.owner_id, Form.data, Form.created_at, Form.updated_at)
+
+
+async def create_form(db: AsyncSession, *, form_in: FormCreate, owner: Any) -> Optional[CachedForm]:
+    """
+    Create a new form with a client-provided ID, owned by `owner` (the
+    authenticated user), in one INSERT ... ON CONFLICT DO NOTHING RETURNING.
+    Returns a snapshot of the created form (also placed in the form cache),
+    or None if the ID already exists.
+    """
+    # Dump the full model (defaults included) so stored definitions have a
+    # normalized shape; reads serialize them as stored.
+    data = form_in.data.model_dump()
+    version = form_cache.version
+    result = await db.execute(
+        pg_insert(Form)
+        .values(id=form_in.id, owner_id=owner.id, data=data, **summary_columns(data))
+        .on_conflict_do_nothing(index_elements=[Form.id])
+        .returning(*_RETURNED_COLUMNS)
     )
-    db.add(db_form)
-    try:
-        await db.commit()
-        await db.refresh(db_form, attribute_names=['created_at']) # Refresh essential fields
-        # Eager load owner for the response object
-        await db.refresh(db_form, attribute_names=['owner'])
-        return db_form
-    except IntegrityError: # Catch potential race condition if ID was created between check and commit
+    row = result.first()
+    await db.commit()
+    if row is None:
+        return None # ID taken (possibly by a form still being purged)
+    snapshot = CachedForm(row, owner=owner)
+    # Nothing can have cached this id yet, unless invalidated meanwhile
+    form_cache.set(form_in.id, snapshot, version=version)
+    return snapshot
+
+
+async def _insert_forms(
+    db: AsyncSession, *, rows: List[Dict[str, Any]], owner: Any
+) -> Tuple[List[CachedForm], List[uuid.UUID]]:
+    """
+    Insert form rows (id, data) owned by `owner` with one multi-row
+    INSERT ... ON CONFLICT DO NOTHING RETURNING, all or nothing.
+    Returns (snapshots in row order, []) after committing, or
+    ([], ids that already exist) after rolling back.
+    """
+    version = form_cache.version
+    result = await db.execute(
+        pg_insert(Form)
+        .values([
+            {"id": row["id"], "owner_id": owner.id, "data": row["data"], **summary_columns(row["data"])}
+            for row in rows
+        ])
+        .on_conflict_do_nothing(index_elements=[Form.id])
+        .returning(*_RETURNED_COLUMNS)
+    )
+    returned = {returned_row.id: returned_row for returned_row in result.all()}
+    if len(returned) < len(rows):
         await db.rollback()
-        return None
+        return [], [row["id"] for row in rows if row["id"] not in returned]
+    await db.commit()
+    snapshots = [CachedForm(returned[row["id"]], owner=owner) for row in rows]
+    for snapshot in snapshots:
+        form_cache.set(snapshot.id, snapshot, version=version)
+    return snapshots, []
+
+
+async def create_forms(
+    db: AsyncSession, *, forms_in: List[FormCreate], owner: Any
+) -> Tuple[List[CachedForm], List[uuid.UUID]]:
+    """
+    Create many forms owned by `owner` in one statement and one transaction.
+    Either all are created, or none are and the ids already taken are returned.
+    """
+    rows = [{"id": form_in.id, "data": form_in.data.model_dump()} for form_in in forms_in]
+    return await _insert_forms(db, rows=rows, owner=owner)
+
+
+async def clone_form(
+    db: AsyncSession, *, source: Any, ids: List[uuid.UUID], owner: Any, title: Optional[str] = None
+) -> Tuple[List[CachedForm], List[uuid.UUID]]:
+    """
+    Copy the definition of `source` (ORM form or snapshot) into new forms
+    with the given ids, owned by `owner`, in one statement and one
+    transaction. `title` replaces the source's title in the copies.
+    Same all-or-nothing result as `create_forms`.
+    """
+    data = dict(source.data)
+    if title is not None:
+        data["title"] = title
+    # Copies share one (never mutated) definition dict; it is serialized per row
+    return await _insert_forms(db, rows=[{"id": form_id, "data": data} for form_id in ids], owner=owner)
 
 
 async def get_form(db: AsyncSession, *, form_id: uuid.UUID) -> Optional[Form]:
     """
     Get a single form by ID, including owner details.
+    Deleted forms (still being purged) are treated as missing.
     """
     result = await db.execute(
         select(Form)
         .options(selectinload(Form.owner)) # Eager load owner
-        .filter(Form.id == form_id)
+        .filter(Form.id == form_id, Form.deleted_at.is_(None))
     )
     return result.scalars().first()
 
 
+async def get_form_cached(db: AsyncSession, *, form_id: uuid.UUID) -> Optional[CachedForm]:
+    """
+    Get a read-only snapshot of a form, served from the in-process cache when
+    possible. Use this on read paths (public submissions, form reads); mutating
+    paths must use `get_form` to obtain a session-bound ORM instance.
+    Missing forms are not cached, so a form created after a miss is seen at once.
+    Only primary sessions fill the cache: a replica may return a row from
+    before a write whose invalidation already ran, and caching it would serve
+    the stale form to every request of the process until the TTL runs out.
+    """
+    cached = form_cache.get(form_id)
+    if cached is not None:
+        return cached
+    version = form_cache.version
+    db_form = await get_form(db=db, form_id=form_id)
+    if db_form is None:
+        return None
+    snapshot = CachedForm(db_form)
+    if not is_replica(db):
+        form_cache.set(form_id, snapshot, version=version)
+    return snapshot
+
+
 async def get_forms_by_owner(
-    db: AsyncSession, *, owner_id: uuid.UUID, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    *,
+    owner_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Cursor] = None,
 ) -> List[Form]:
     """
-    Get all forms owned by a specific user, with pagination.
+    Get all forms owned by a specific user, newest first.
     Includes owner details.
+    Pass `after` (the (created_at, id) of the last form already seen) for
+    keyset pagination; `skip` is kept for older clients but gets slower with depth.
     """
-    result = await db.execute(
+    query = (
         select(Form)
         .options(selectinload(Form.owner)) # Eager load owner
-        .filter(Form.owner_id == owner_id)
-        .offset(skip)
+        .filter(Form.owner_id == owner_id, Form.deleted_at.is_(None))
+    )
+    if after is not None:
+        query = query.filter(tuple_(Form.created_at, Form.id) < tuple(after))
+    elif skip:
+        query = query.offset(skip)
+    result = await db.execute(
+        query
+        .order_by(Form.created_at.desc(), Form.id.desc()) # Matches ix_forms_owner_id_created_at_id
         .limit(limit)
-        .order_by(Form.created_at.desc()) # Optional: order by creation date
     )
     return result.scalars().all()
 
 
+async def get_form_summaries_by_owner(
+    db: AsyncSession,
+    *,
+    owner_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Cursor] = None,
+) -> List[Any]:
+    """
+    Same listing as get_forms_by_owner, but only the columns a dashboard list
+    needs (id, title, field_count, timestamps). Never reads `data` and never
+    loads the owner, so it is a single narrow query.
+    """
+    query = (
+        select(Form.id, Form.title, Form.field_count, Form.created_at, Form.updated_at)
+        .filter(Form.owner_id == owner_id, Form.deleted_at.is_(None))
+    )
+    if after is not None:
+        query = query.filter(tuple_(Form.created_at, Form.id) < tuple(after))
+    elif skip:
+        query = query.offset(skip)
+    result = await db.execute(
+        query
+        .order_by(Form.created_at.desc(), Form.id.desc())
+        .limit(limit)
+    )
+    return result.all()
+
+
 async def update_form(
-    db: AsyncSession, *, db_form: Form, form_in: FormUpdate
-) -> Form:
+    db: AsyncSession, *, form_id: uuid.UUID, form_in: FormUpdate, owner: Any
+) -> Optional[CachedForm]:
     """
-    Update an existing form.
+    Replace the definition of a form owned by `owner` in one UPDATE ...
+    RETURNING. Returns a snapshot of the updated form, or None if no live
+    form with that id belongs to `owner` (see `get_form_cached` to tell
+    missing from forbidden).
     """
-    # Pydantic V2+ .model_dump() replaces .dict()
-    # Use exclude_unset=True to only update fields that were actually passed
-    update_data = form_in.model_dump(exclude_unset=True)
+    if form_in.data is None:
+        # Nothing to change (data is the only updatable field)
+        form = await get_form_cached(db=db, form_id=form_id)
+        return form if form is not None and form.owner_id == owner.id else None
+    data = form_in.data.model_dump()
+    result = await db.execute(
+        update(Form)
+        .where(Form.id == form_id, Form.owner_id == owner.id, Form.deleted_at.is_(None))
+        .values(data=data, updated_at=func.now(), **summary_columns(data))
+        .returning(*_RETURNED_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.first()
+    await db.commit()
+    if row is None:
+        return None
+    form_cache.invalidate(form_id)
+    return CachedForm(row, owner=owner)
 
-    if "data" in update_data and update_data["data"] is not None:
-        # If 'data' is being updated, replace the whole JSON structure
-        # You could implement more granular updates (merging JSON) if needed
-        db_form.data = update_data["data"] # Assuming form_in.data is the structured FormData
 
-    # Update other top-level fields of the Form model if they existed
-    # for field, value in update_data.items():
-    #    if field != "data": # Exclude 'data' as it's handled above
-    #        setattr(db_form, field, value)
+def form_version(form: Any) -> datetime:
+    """
+    The optimistic-concurrency version of a form: when it was last written.
+    """
+    return form.updated_at or form.created_at
+
 
-    db.add(db_form)
+async def get_form_fresh(db: AsyncSession, *, form_id: uuid.UUID) -> Optional[CachedForm]:
+    """
+    Like `get_form_cached`, but always re-reads the row (e.g. when the cached
+    snapshot may be behind a write made by another process).
+    """
+    form_cache.invalidate(form_id)
+    return await get_form_cached(db=db, form_id=form_id)
+
+
+async def update_form_data_if_unchanged(
+    db: AsyncSession, *, form_id: uuid.UUID, data: Dict[str, Any], expected_version: datetime
+) -> Optional[datetime]:
+    """
+    Store a new definition only if the form is still at `expected_version`,
+    in a single UPDATE ... RETURNING. Returns the new version, or None if the
+    form changed (or disappeared) in the meantime.
+    """
+    result = await db.execute(
+        update(Form)
+        .where(
+            Form.id == form_id,
+            Form.deleted_at.is_(None),
+            func.coalesce(Form.updated_at, Form.created_at) == expected_version,
+        )
+        .values(data=data, updated_at=func.now(), **summary_columns(data))
+        .returning(Form.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    new_version = result.scalar_one_or_none()
+    await db.commit()
+    if new_version is not None:
+        form_cache.invalidate(form_id)
+    return new_version
+
+
+async def mark_forms_deleted(
+    db: AsyncSession, *, form_ids: List[uuid.UUID], owner_id: uuid.UUID
+) -> Tuple[List[uuid.UUID], Optional[Job]]:
+    """
+    Soft-delete the live forms among `form_ids` that belong to `owner_id`
+    in one UPDATE ... RETURNING, and queue the job that purges their
+    responses in the same transaction. From then on the forms are hidden
+    from every read and write path. Returns (ids deleted, purge job).
+    """
+    result = await db.execute(
+        update(Form)
+        .where(Form.id.in_(form_ids), Form.owner_id == owner_id, Form.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+        .returning(Form.id, Form.created_at)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = result.all()
+    if not deleted:
+        await db.rollback()
+        return [], None
+    job = crud_job.add_job(
+        db, kind=crud_job.PURGE_FORMS, owner_id=owner_id,
+        form_id=deleted[0].id if len(deleted) == 1 else None,
+        params={"forms": [[str(form_id), created_at.isoformat() if created_at else None] for form_id, created_at in deleted]},
+        # Other processes keep accepting submissions from their form cache
+        # until its entries expire; purging before then would leave those
+        # inserts pointing at a deleted form
+        run_after=datetime.now(timezone.utc) + timedelta(seconds=settings.FORM_CACHE_TTL_SECONDS),
+    )
     await db.commit()
-    await db.refresh(db_form)
-    # Ensure owner is loaded if needed after refresh
-    await db.refresh(db_form, attribute_names=['owner'])
-    return db_form
+    for form_id, _ in deleted:
+        form_cache.invalidate(form_id)
+    return [form_id for form_id, _ in deleted], job
 
 
-async def remove_form(db: AsyncSession, *, form_id: uuid.UUID) -> Optional[Form]:
+async def remove_form(db: AsyncSession, *, form_id: uuid.UUID) -> bool:
     """
-    Delete a form by ID.
-    Also deletes associated responses due to cascade="all, delete-orphan".
+    Delete a form row with a single DELETE. Responses, answer counters and
+    archive manifest rows go with it through ON DELETE CASCADE, without being
+    loaded; archive files are removed afterwards. On forms with many
+    responses purge them in batches first (see job_handlers.purge_forms), so this
+    statement stays short.
     """
-    result = await db.execute(select(Form).filter(Form.id == form_id))
-    db_form = result.scalars().first()
-    if db_form:
-        await db.delete(db_form)
-        await db.commit()
-    return db_form # Return the deleted object (or None if not found)
\ No newline at end of file
+    result = await db.execute(
+        delete(Form).where(Form.id == form_id).execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    form_cache.invalidate(form_id)
+    await archive.remove_form_archive(form_id)
+    return result.rowcount > 0
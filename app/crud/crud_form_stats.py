@@ -0,0 +1,184 @@
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Tuple
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.validation import OTHER_OPTION, validator_cache
+from app.crud import crud_archive
+from app.db.partitions import responses_since
+from app.models.form_field_stat import FormFieldStat
+from app.models.response import Response
+
+# (field_id, option_value) -> count. ("", "") is the form's response total.
+Counts = Dict[Tuple[str, str], int]
+
+TOTAL_KEY = ("", "")
+
+
+def count_answers(form: Any, answers_list: Iterable[Mapping[str, Any]]) -> Counts:
+    """
+    Tally the options chosen across `answers_list` for a form (ORM object or
+    cached snapshot), using the form's cached compiled validator to know
+    which fields are choice fields.
+    """
+    validator = validator_cache.get(form.id, form.updated_at, form.data)
+    counts: Counts = {}
+    total = 0
+    for answers in answers_list:
+        validator.count_options(answers, counts)
+        total += 1
+    if total:
+        counts[TOTAL_KEY] = total
+    return counts
+
+
+def merge_counts(target: Counts, counts: Counts) -> None:
+    for key, count in counts.items():
+        target[key] = target.get(key, 0) + count
+
+
+async def increment_counts(db: AsyncSession, *, form_id: uuid.UUID, counts: Counts) -> None:
+    """
+    Add `counts` to the stored counters with one INSERT ... ON CONFLICT DO UPDATE.
+    Does not commit, so it joins the caller's transaction (the response insert).
+    Rows are sorted so concurrent writers lock them in the same order.
+    """
+    if not counts:
+        return
+    rows = [
+        {"form_id": form_id, "field_id": field_id, "option_value": option_value, "count": count}
+        for (field_id, option_value), count in sorted(counts.items())
+    ]
+    stmt = pg_insert(FormFieldStat).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[FormFieldStat.form_id, FormFieldStat.field_id, FormFieldStat.option_value],
+        set_={"count": FormFieldStat.count + stmt.excluded.count},
+    )
+    await db.execute(stmt)
+
+
+async def get_counts(db: AsyncSession, *, form_id: uuid.UUID) -> Counts:
+    """
+    Read every counter of a form; cost is O(fields x options), not O(responses).
+    """
+    result = await db.execute(
+        select(FormFieldStat.field_id, FormFieldStat.option_value, FormFieldStat.count)
+        .filter(FormFieldStat.form_id == form_id)
+    )
+    return {(field_id, option_value): count for field_id, option_value, count in result.all()}
+
+
+@asynccontextmanager
+async def _rebuild_lock(db: AsyncSession, form_id: uuid.UUID) -> AsyncIterator[None]:
+    """
+    Serialize rebuilds of one form with a session-level advisory lock held on
+    a connection of its own, so it spans the rebuild's transactions. Nothing
+    else takes it: submissions are never blocked.
+    """
+    key = int.from_bytes(form_id.bytes[:8], "big", signed=True)
+    async with db.bind.connect() as conn:
+        await conn.execute(select(func.pg_advisory_lock(key)))
+        await conn.commit()
+        try:
+            yield
+        finally:
+            await conn.execute(select(func.pg_advisory_unlock(key)))
+            await conn.commit()
+
+
+async def rebuild_counts(db: AsyncSession, *, form: Any, batch_size: int = 5000) -> Counts:
+    """
+    Recompute a form's counters from the responses table (and its archived
+    responses). Needed after a form definition changes (options renamed,
+    fields added or turned into choice fields).
+    Responses are streamed, so memory only grows with the number of counters.
+
+    The recount and the stored counters are read from one REPEATABLE READ
+    snapshot, and only their difference is then added to the stored
+    counters. Submissions committing meanwhile keep their increments and are
+    never blocked; the write is a short upsert. Returns the recount.
+    """
+    validator = validator_cache.get(form.id, form.updated_at, form.data)
+    async with _rebuild_lock(db, form.id):
+        # End whatever the caller started so the snapshot begins here
+        await db.commit()
+        await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        counts: Counts = {}
+        total = 0
+        query = select(Response.data).filter(Response.form_id == form.id)
+        since = responses_since(form.created_at)
+        if since is not None:
+            # Lets Postgres skip partitions from before the form existed
+            query = query.filter(Response.created_at >= since)
+        result = await db.stream(
+            query
+            .execution_options(yield_per=batch_size)
+        )
+        async for (answers,) in result:
+            validator.count_options(answers or {}, counts)
+            total += 1
+        async for archived in crud_archive.iter_archived(db, form_id=form.id):
+            validator.count_options(archived.data or {}, counts)
+            total += 1
+        if total:
+            counts[TOTAL_KEY] = total
+        stored = await get_counts(db, form_id=form.id)
+        await db.commit()
+
+        corrections = {
+            key: counts.get(key, 0) - stored.get(key, 0)
+            for key in counts.keys() | stored.keys()
+            if counts.get(key, 0) != stored.get(key, 0)
+        }
+        if corrections:
+            await increment_counts(db, form_id=form.id, counts=corrections)
+            await db.execute(
+                delete(FormFieldStat)
+                .where(FormFieldStat.form_id == form.id, FormFieldStat.count <= 0)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+    return counts
+
+
+def build_summary(form: Any, counts: Counts) -> Dict[str, Any]:
+    """
+    Shape stored counters into a per-field breakdown following the form's
+    field order. Every defined option is listed (zero if never chosen);
+    answers outside the option list, including options since removed from
+    the form, are summed into one trailing "other" entry.
+    """
+    fields: List[Dict[str, Any]] = []
+    by_field: Dict[str, Dict[str, int]] = {}
+    for (field_id, option_value), count in counts.items():
+        if field_id:
+            by_field.setdefault(field_id, {})[option_value] = count
+
+    validator = validator_cache.get(form.id, form.updated_at, form.data)
+    choice_ids = set(validator.choice_ids) | set(validator.multi_choice_ids)
+    for field in sorted(form.data.get("fields", []), key=lambda f: f.get("order", 0)):
+        if field["id"] not in choice_ids:
+            continue
+        field_counts = dict(by_field.get(field["id"], {}))
+        options = [
+            {"value": opt["value"], "label": opt.get("label"), "count": field_counts.pop(opt["value"], 0)}
+            for opt in field.get("options") or []
+        ]
+        other = sum(field_counts.values())
+        if other:
+            options.append({"value": OTHER_OPTION, "label": None, "count": other})
+        fields.append({
+            "field_id": field["id"],
+            "label": field.get("label"),
+            "type": field["type"],
+            "options": options,
+        })
+    return {
+        "form_id": form.id,
+        "total_responses": counts.get(TOTAL_KEY, 0),
+        "fields": fields,
+    }
@@ -0,0 +1,220 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.job import Job
+
+# Job kinds; handlers live in app.crud.job_handlers
+PURGE_FORMS = "purge_forms"
+EXPORT_RESPONSES = "export_responses"
+REBUILD_STATS = "rebuild_stats"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def add_job(
+    db: AsyncSession,
+    *,
+    kind: str,
+    owner_id: Optional[uuid.UUID] = None,
+    form_id: Optional[uuid.UUID] = None,
+    params: Optional[Dict[str, Any]] = None,
+    run_after: Optional[datetime] = None,
+) -> Job:
+    """
+    Queue a job, due at once or at `run_after`. Does not commit, so the job is
+    created atomically with the caller's other changes (e.g. the soft-delete
+    it will finish). Call job_runner.wake() after committing to start it
+    without waiting for a poll.
+    """
+    job = Job(
+        id=uuid.uuid4(), kind=kind, status=QUEUED, owner_id=owner_id, form_id=form_id,
+        params=params or {}, attempts=0,
+    )
+    if run_after is not None:
+        job.run_after = run_after
+    db.add(job)
+    return job
+
+
+async def create_job(db: AsyncSession, **kw: Any) -> Job:
+    """
+    `add_job` and commit.
+    """
+    job = add_job(db, **kw)
+    await db.commit()
+    await db.refresh(job, attribute_names=["created_at", "run_after"])
+    return job
+
+
+async def get_job(db: AsyncSession, *, job_id: uuid.UUID) -> Optional[Job]:
+    result = await db.execute(select(Job).filter(Job.id == job_id))
+    return result.scalars().first()
+
+
+async def fail_stale_jobs(db: AsyncSession, *, lease: float, max_attempts: int) -> List[Job]:
+    """
+    Mark running jobs whose worker stopped heartbeating more than `lease`
+    seconds ago as failed once they have used up `max_attempts`, so a job
+    that keeps killing its worker isn't reclaimed forever. Returns them.
+    """
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=lease)
+    exhausted = (
+        select(Job.id)
+        .where(Job.status == RUNNING, Job.heartbeat_at < stale_before, Job.attempts >= max_attempts)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(Job)
+        .where(Job.id.in_(exhausted.scalar_subquery()))
+        .values(
+            status=FAILED,
+            error=f"Worker stopped responding ({max_attempts} attempts)",
+            heartbeat_at=None,
+            finished_at=func.now(),
+        )
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    )
+    jobs = list(result.scalars().all())
+    await db.commit()
+    return jobs
+
+
+async def claim_jobs(db: AsyncSession, *, limit: int, lease: float, max_attempts: int) -> List[Job]:
+    """
+    Atomically mark up to `limit` due jobs as running and return them: queued
+    jobs whose run_after has passed, plus running jobs with attempts left
+    whose worker stopped heartbeating more than `lease` seconds ago (see
+    fail_stale_jobs for the others). SKIP LOCKED lets concurrent workers
+    claim disjoint sets without waiting on each other.
+    """
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=lease)
+    due = (
+        select(Job.id)
+        .where(or_(
+            and_(Job.status == QUEUED, Job.run_after <= func.now()),
+            and_(Job.status == RUNNING, Job.heartbeat_at < stale_before, Job.attempts < max_attempts),
+        ))
+        .order_by(Job.run_after.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(Job)
+        .where(Job.id.in_(due.scalar_subquery()))
+        .values(status=RUNNING, attempts=Job.attempts + 1, started_at=func.now(), heartbeat_at=func.now())
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    )
+    jobs = list(result.scalars().all())
+    await db.commit()
+    return jobs
+
+
+async def heartbeat(db: AsyncSession, *, job_ids: List[uuid.UUID]) -> None:
+    if not job_ids:
+        return
+    await db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.status == RUNNING)
+        .values(heartbeat_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def set_progress(db: AsyncSession, *, job_id: uuid.UUID, progress: Dict[str, Any]) -> None:
+    await db.execute(
+        update(Job).where(Job.id == job_id).values(progress=progress).execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def finish_job(
+    db: AsyncSession,
+    *,
+    job_id: uuid.UUID,
+    status: str,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+    retry_at: Optional[datetime] = None,
+) -> None:
+    """
+    Record a job's outcome. With `retry_at` the job goes back to the queue
+    (keeping the error for inspection) instead of being finished.
+    """
+    values: Dict[str, Any] = {"result": result, "error": error, "heartbeat_at": None}
+    if retry_at is not None:
+        values.update(status=QUEUED, run_after=retry_at)
+    else:
+        values.update(status=status, finished_at=func.now())
+    await db.execute(
+        update(Job).where(Job.id == job_id).values(**values).execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def requeue(db: AsyncSession, *, job_ids: List[uuid.UUID]) -> None:
+    """
+    Put jobs interrupted by a shutdown back in the queue straight away,
+    without counting the interrupted run as an attempt.
+    """
+    if not job_ids:
+        return
+    await db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.status == RUNNING)
+        .values(status=QUEUED, attempts=Job.attempts - 1, heartbeat_at=None, run_after=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def prune_jobs(db: AsyncSession, *, finished_before: datetime) -> List[Any]:
+    """
+    Delete finished jobs older than `finished_before`. Returns their
+    (kind, result) so files they produced can be removed too.
+    """
+    result = await db.execute(
+        delete(Job)
+        .where(Job.status.in_((SUCCEEDED, FAILED)), Job.finished_at < finished_before)
+        .returning(Job.kind, Job.result)
+        .execution_options(synchronize_session=False)
+    )
+    pruned = result.all()
+    await db.commit()
+    return pruned
+
+
+class JobContext:
+    """
+    Handed to job handlers: the job being run, a session factory for the
+    handler's own short transactions, and throttled progress reporting.
+    """
+
+    def __init__(self, job: Job, session_factory, *, progress_interval: float = 1.0):
+        self.job = job
+        self.session_factory = session_factory
+        self.progress_interval = progress_interval
+        self._last_report = 0.0
+
+    async def report(self, progress: Dict[str, Any], *, force: bool = False) -> None:
+        """
+        Store the job's progress, at most once per `progress_interval` seconds
+        unless `force` is set.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_report < self.progress_interval:
+            return
+        self._last_report = now
+        async with self.session_factory() as session:
+            await set_progress(session, job_id=self.job.id, progress=progress)
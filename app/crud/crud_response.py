@@ -1,30 +1,89 @@
+import heapq
 import uuid
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Tuple
 
+from sqlalchemy import and_, delete, func, insert, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.core import archive
+from app.core.config import settings
+from app.core.live import live_hub
+from app.core import filters as response_filters
+from app.core.pagination import Cursor
+from app.crud import crud_archive, crud_form_stats, crud_webhook, webhook_dispatcher
+from app.db.partitions import responses_since
+from app.models.form_field_stat import FormFieldStat
 from app.models.response import Response
+from app.models.response_archive_chunk import ResponseArchiveChunk
 from app.schemas.response import ResponseCreate
 
 async def create_response(
-    db: AsyncSession, *, response_in: ResponseCreate, form_id: uuid.UUID
+    db: AsyncSession, *, response_in: ResponseCreate, form_id: uuid.UUID, form: Optional[Any] = None
 ) -> Response:
     """
     Create a new response for a specific form.
+    If the form definition is passed, the per-option answer counters are
+    updated in the same transaction. Webhook deliveries are queued in the
+    same transaction too and sent in the background; once committed, the
+    response goes out to live feeds.
     """
     # Pydantic V2+ .model_dump() replaces .dict()
-    db_response = Response(
-        data=response_in.model_dump()["data"], # Get the inner data dict
-        form_id=form_id,
+    row = {
+        "id": uuid.uuid4(),
+        "data": response_in.model_dump()["data"], # Get the inner data dict
+        "form_id": form_id,
         # submitter_id can be added here if tracking logged-in submitters
-    )
-    db.add(db_response)
+    }
+    # INSERT ... RETURNING hands back the server-generated created_at (part of
+    # the partitioned table's primary key) without a refresh query.
+    (db_response,) = await insert_response_rows(db, rows=[row])
+    counts = crud_form_stats.count_answers(form, [row["data"]]) if form is not None else {}
+    await crud_form_stats.increment_counts(db, form_id=form_id, counts=counts)
+    queued = await crud_webhook.enqueue_deliveries(db, responses=[db_response])
     await db.commit()
-    await db.refresh(db_response)
+    if queued:
+        webhook_dispatcher.wake()
+    live_hub.publish(form_id, [db_response], counts)
     return db_response
 
 
+async def insert_response_rows(db: AsyncSession, *, rows: List[Dict[str, Any]]) -> List[Response]:
+    """
+    Insert many response rows with a single multi-row INSERT ... RETURNING.
+    Each row is a dict of column values (id, form_id, data). Does not commit.
+    Responses are returned in the same order as `rows`.
+    """
+    if not rows:
+        return []
+    result = await db.scalars(insert(Response).returning(Response, sort_by_parameter_order=True), rows)
+    return list(result.all())
+
+
+async def create_responses(
+    db: AsyncSession, *, responses_in: List[ResponseCreate], form_id: uuid.UUID, form: Optional[Any] = None
+) -> List[Response]:
+    """
+    Create many responses for a form in one statement and one transaction.
+    Returned responses are in the same order as `responses_in`.
+    If the form definition is passed, answer counters are updated in the same transaction.
+    """
+    rows = [
+        {"id": uuid.uuid4(), "form_id": form_id, "data": response_in.data}
+        for response_in in responses_in
+    ]
+    created = await insert_response_rows(db, rows=rows)
+    counts = crud_form_stats.count_answers(form, (row["data"] for row in rows)) if form is not None else {}
+    await crud_form_stats.increment_counts(db, form_id=form_id, counts=counts)
+    queued = await crud_webhook.enqueue_deliveries(db, responses=created)
+    await db.commit()
+    if queued:
+        webhook_dispatcher.wake()
+    live_hub.publish(form_id, created, counts)
+    return created
+
+
 async def get_response(db: AsyncSession, *, response_id: uuid.UUID) -> Optional[Response]:
     """
     Get a single response by ID.
@@ -35,20 +94,229 @@ async def get_response(db: AsyncSession, *, response_id: uuid.UUID) -> Optional[
     return result.scalars().first()
 
 
-async def get_responses_by_form(
-    db: AsyncSession, *, form_id: uuid.UUID, skip: int = 0, limit: int = 1000 # Higher limit common for responses
-) -> List[Response]:
+def _form_responses(form_id: uuid.UUID, form_created_at: Optional[datetime]) -> List[Any]:
     """
-    Get all responses for a specific form, with pagination.
+    WHERE clauses selecting a form's responses. With the form's creation time
+    they also bound created_at, so partitions older than the form are pruned.
     """
+    clauses = [Response.form_id == form_id]
+    since = responses_since(form_created_at)
+    if since is not None:
+        clauses.append(Response.created_at >= since)
+    return clauses
+
+
+def _predicate_clause(predicate: response_filters.Predicate):
+    """
+    Compile one filter predicate to a JSONB operator on Response.data.
+    """
+    field_id = predicate.field_id
+    if predicate.op == "exists":
+        return Response.data.path_exists(response_filters.jsonpath_key(field_id))
+    if predicate.op in response_filters.RANGE_OPS:
+        return Response.data.path_exists(response_filters.jsonpath_range(predicate))
+    if predicate.op == "contains":
+        return Response.data.contains({field_id: [predicate.value]})
+    # eq: a single answer equal to the value, or a multi-select including it
+    return or_(
+        Response.data.contains({field_id: predicate.value}),
+        Response.data.contains({field_id: [predicate.value]}),
+    )
+
+
+async def _select_responses(
+    db: AsyncSession,
+    *,
+    form_id: uuid.UUID,
+    skip: int,
+    limit: int,
+    after: Optional[Cursor],
+    predicates: Sequence[response_filters.Predicate],
+    form_created_at: Optional[datetime],
+) -> List[Response]:
+    query = select(Response).filter(*_form_responses(form_id, form_created_at))
+    if predicates:
+        query = query.filter(and_(*(_predicate_clause(predicate) for predicate in predicates)))
+    if after is not None:
+        # The row comparison does the paging; the plain created_at bound is
+        # redundant but is what partition pruning can use.
+        query = query.filter(
+            Response.created_at >= after[0],
+            tuple_(Response.created_at, Response.id) > tuple(after),
+        )
+    elif skip:
+        query = query.offset(skip)
     result = await db.execute(
-        select(Response)
-        .filter(Response.form_id == form_id)
-        .offset(skip)
+        query
+        .order_by(Response.created_at.asc(), Response.id.asc()) # Matches ix_responses_form_id_created_at_id
         .limit(limit)
-        .order_by(Response.created_at.asc()) # Often oldest first for responses
     )
     return result.scalars().all()
 
+
+def _response_key(response: Any) -> Tuple[datetime, uuid.UUID]:
+    return (response.created_at, response.id)
+
+
+async def _select_archived(
+    db: AsyncSession,
+    *,
+    form_id: uuid.UUID,
+    wanted: int,
+    after: Optional[Cursor],
+    predicates: Sequence[response_filters.Predicate],
+    until: Optional[Tuple[datetime, uuid.UUID]] = None,
+) -> List[Any]:
+    """
+    The first `wanted` archived responses past `after` matching `predicates`,
+    in key order. Chunks are read oldest first and reading stops once the
+    next chunk can only hold later rows than the ones already collected, or
+    than `until` (the last key the caller can use, e.g. the hot rows' bound).
+    A filtered read that would decode more than ARCHIVE_FILTER_MAX_CHUNKS
+    chunks is refused with InvalidFilter instead of scanning the archive.
+    """
+    selected: List[Any] = []
+    read = 0
+    for chunk in await crud_archive.get_chunks(db, form_id=form_id, after=after):
+        first = (chunk.first_created_at, chunk.first_id)
+        if len(selected) >= wanted and first > _response_key(selected[wanted - 1]):
+            break
+        if until is not None and first > until:
+            break
+        if predicates and settings.ARCHIVE_FILTER_MAX_CHUNKS and read >= settings.ARCHIVE_FILTER_MAX_CHUNKS:
+            raise response_filters.InvalidFilter(
+                "Too few archived responses match these filters to page through them; "
+                "narrow the filters or export the responses instead."
+            )
+        read += 1
+        for row in await archive.read_chunk(chunk.id, chunk.path):
+            if after is not None and _response_key(row) <= tuple(after):
+                continue
+            if all(response_filters.matches(predicate, row.data) for predicate in predicates):
+                selected.append(row)
+        selected.sort(key=_response_key)
+    return selected[:wanted]
+
+
+async def get_responses_by_form(
+    db: AsyncSession,
+    *,
+    form_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 1000, # Higher limit common for responses
+    after: Optional[Cursor] = None,
+    predicates: Sequence[response_filters.Predicate] = (),
+    form_created_at: Optional[datetime] = None,
+    archived_until: Optional[datetime] = None,
+) -> List[Any]:
+    """
+    Get all responses for a specific form, oldest first.
+    Pass `after` (the (created_at, id) of the last response already seen) for
+    keyset pagination; `skip` is kept for older clients but gets slower with depth.
+    `predicates` (see app.core.filters) are ANDed and evaluated in the database.
+    Pass `form_created_at` so partitions from before the form are skipped.
+    `archived_until` is the newest archived created_at (from
+    get_change_marker); when the page reaches back that far, archived
+    responses are merged in, so callers see one continuous history.
+    """
+    if archived_until is None or (after is not None and after[0] > archived_until):
+        return await _select_responses(
+            db, form_id=form_id, skip=skip, limit=limit, after=after,
+            predicates=predicates, form_created_at=form_created_at,
+        )
+    wanted = limit if after is not None else skip + limit
+    hot_rows = await _select_responses(
+        db, form_id=form_id, skip=0, limit=wanted, after=after,
+        predicates=predicates, form_created_at=form_created_at,
+    )
+    # With a full page of hot rows, archived rows past the last of them can't
+    # make it into the page, so chunks starting after it are never read
+    until = _response_key(hot_rows[wanted - 1]) if len(hot_rows) >= wanted else None
+    archived_rows = await _select_archived(
+        db, form_id=form_id, wanted=wanted, after=after, predicates=predicates, until=until
+    )
+    merged = list(heapq.merge(archived_rows, hot_rows, key=_response_key))
+    return merged[wanted - limit:wanted]
+
+async def get_change_marker(
+    db: AsyncSession, *, form_id: uuid.UUID, form_created_at: Optional[datetime] = None
+) -> Tuple[Optional[datetime], Optional[int], Optional[datetime]]:
+    """
+    (newest response timestamp, response total, newest archived timestamp)
+    for a form, in one round trip of three index lookups. Responses are
+    append-only, so the first two change whenever any page of the form's
+    responses can; the total also catches rows committed late with an older
+    created_at. The last is None when nothing is archived and tells listing
+    how far back it has to read archive chunks.
+    """
+    newest = (
+        select(Response.created_at)
+        .filter(*_form_responses(form_id, form_created_at))
+        .order_by(Response.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    total = (
+        select(FormFieldStat.count)
+        .filter(
+            FormFieldStat.form_id == form_id,
+            FormFieldStat.field_id == crud_form_stats.TOTAL_KEY[0],
+            FormFieldStat.option_value == crud_form_stats.TOTAL_KEY[1],
+        )
+        .scalar_subquery()
+    )
+    archived_until = (
+        select(func.max(ResponseArchiveChunk.last_created_at))
+        .filter(ResponseArchiveChunk.form_id == form_id)
+        .scalar_subquery()
+    )
+    result = await db.execute(select(newest, total, archived_until))
+    return tuple(result.one())
+
+async def stream_responses_by_form(
+    db: AsyncSession, *, form_id: uuid.UUID, batch_size: int = 1000, form_created_at: Optional[datetime] = None
+) -> AsyncIterator[Any]:
+    """
+    Yield (id, form_id, data, created_at) rows for a form, oldest first:
+    archived responses chunk by chunk, then the rest from a server-side
+    cursor. Only one chunk or `batch_size` rows are buffered at a time, so
+    memory stays flat regardless of how many responses the form has.
+    """
+    async for row in crud_archive.iter_archived(db, form_id=form_id):
+        yield row
+    result = await db.stream(
+        select(Response.id, Response.form_id, Response.data, Response.created_at)
+        .filter(*_form_responses(form_id, form_created_at))
+        .order_by(Response.created_at.asc(), Response.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    async for row in result:
+        yield row
+
+async def delete_responses_batch(
+    db: AsyncSession, *, form_id: uuid.UUID, batch_size: int, form_created_at: Optional[datetime] = None
+) -> int:
+    """
+    Delete up to `batch_size` of a form's responses, oldest first, and commit.
+    One bounded statement per call keeps locks and WAL bursts short while a
+    deleted form is purged. Returns the number of rows deleted.
+    """
+    oldest = (
+        select(Response.created_at, Response.id)
+        .filter(*_form_responses(form_id, form_created_at))
+        .order_by(Response.created_at.asc(), Response.id.asc())
+        .limit(batch_size)
+    )
+    result = await db.execute(
+        delete(Response)
+        .where(
+            *_form_responses(form_id, form_created_at),
+            tuple_(Response.created_at, Response.id).in_(oldest),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
 # Update/Delete for responses are less common for end-users,
 # but could be added for admins/owners later.
\ No newline at end of file
@@ -1,16 +1,72 @@
+import uuid
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.models.user import User
-from app.schemas.user import UserCreate
-from app.core.security import get_password_hash
+from app.schemas.user import UserCreate, UserUpdate
+from app.core.security import get_password_hash_async
+
+
+class CachedUser:
+    """
+    Detached, read-only snapshot of an active User kept in the principal
+    cache. It exposes the same public attributes as the ORM model (never the
+    password hash) and is never attached to a session.
+    """
+
+    __slots__ = ("id", "email", "is_active", "is_superuser", "created_at", "updated_at")
+
+    def __init__(self, db_user: User):
+        self.id = db_user.id
+        self.email = db_user.email
+        self.is_active = db_user.is_active
+        self.is_superuser = db_user.is_superuser
+        self.created_at = db_user.created_at
+        self.updated_at = db_user.updated_at
+
+
+principal_cache: TTLCache[CachedUser] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_principal(user_id: uuid.UUID) -> None:
+    """
+    Drop a user from the principal cache. Must be called after committing
+    any change that affects authentication: deactivation, password or email change.
+    """
+    principal_cache.invalidate(user_id)
+
 
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     result = await db.execute(select(User).filter(User.email == email))
     return result.scalars().first()
 
+async def get_user(db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+    result = await db.execute(select(User).filter(User.id == user_id))
+    return result.scalars().first()
+
+async def get_principal(db: AsyncSession, user_id: uuid.UUID) -> Optional[CachedUser]:
+    """
+    Get a user snapshot by ID, served from the principal cache when possible.
+    Only active users are cached, so inactive ones are always re-read.
+    """
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        return cached
+    version = principal_cache.version
+    db_user = await get_user(db, user_id=user_id)
+    if db_user is None:
+        return None
+    principal = CachedUser(db_user)
+    if principal.is_active:
+        principal_cache.set(user_id, principal, version=version)
+    return principal
+
 async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash_async(user_in.password)
     db_user = User(
         email=user_in.email,
         hashed_password=hashed_password,
@@ -21,4 +77,41 @@ async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
     await db.refresh(db_user)
     return db_user
 
-# Add get_user(db: AsyncSession, user_id: uuid.UUID) later
\ No newline at end of file
+async def update_user(db: AsyncSession, *, db_user: User, user_in: UserUpdate) -> User:
+    """
+    Update a user's email, password and/or active flag.
+    The cached principal is invalidated once the change is committed.
+    """
+    update_data = user_in.model_dump(exclude_unset=True)
+    if update_data.get("email") is not None:
+        db_user.email = update_data["email"]
+    if update_data.get("password") is not None:
+        db_user.hashed_password = await get_password_hash_async(update_data["password"])
+    if update_data.get("is_active") is not None:
+        db_user.is_active = update_data["is_active"]
+    db.add(db_user)
+    await db.commit()
+    invalidate_principal(db_user.id)
+    await db.refresh(db_user)
+    return db_user
+
+async def update_password_hash(db: AsyncSession, *, db_user: User, hashed_password: str) -> User:
+    """
+    Store a re-computed hash of the *same* password (e.g. after BCRYPT_ROUNDS
+    changed). The principal cache holds no hash, so nothing is invalidated.
+    """
+    db_user.hashed_password = hashed_password
+    db.add(db_user)
+    await db.commit()
+    return db_user
+
+async def set_user_active(db: AsyncSession, *, db_user: User, is_active: bool) -> User:
+    """
+    Activate or deactivate a user. Deactivation takes effect on this process
+    immediately and on others within PRINCIPAL_CACHE_TTL_SECONDS.
+    """
+    db_user.is_active = is_active
+    db.add(db_user)
+    await db.commit()
+    invalidate_principal(db_user.id)
+    return db_user
@@ -0,0 +1,243 @@
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import delete, func, insert, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.response import Response
+from app.models.webhook_outbox import WebhookOutboxEntry
+from app.models.webhook_subscription import WebhookSubscription
+from app.schemas.webhook import WebhookCreate
+
+
+async def create_subscription(
+    db: AsyncSession, *, form_id: uuid.UUID, webhook_in: WebhookCreate
+) -> WebhookSubscription:
+    """
+    Subscribe a URL to a form's new responses. A signing secret is generated
+    unless the caller provides one.
+    """
+    subscription = WebhookSubscription(
+        id=uuid.uuid4(),
+        form_id=form_id,
+        url=str(webhook_in.url),
+        secret=webhook_in.secret or secrets.token_urlsafe(32),
+        consecutive_failures=0,
+    )
+    db.add(subscription)
+    await db.commit()
+    await db.refresh(subscription, attribute_names=["created_at"])
+    return subscription
+
+
+async def get_subscriptions(db: AsyncSession, *, form_id: uuid.UUID) -> List[WebhookSubscription]:
+    result = await db.execute(
+        select(WebhookSubscription)
+        .filter(WebhookSubscription.form_id == form_id)
+        .order_by(WebhookSubscription.created_at.asc(), WebhookSubscription.id.asc())
+    )
+    return list(result.scalars().all())
+
+
+async def count_subscriptions(db: AsyncSession, *, form_id: uuid.UUID) -> int:
+    return await db.scalar(
+        select(func.count()).select_from(WebhookSubscription).filter(WebhookSubscription.form_id == form_id)
+    )
+
+
+async def remove_subscription(db: AsyncSession, *, form_id: uuid.UUID, subscription_id: uuid.UUID) -> bool:
+    """
+    Delete a subscription; its pending deliveries go with it (ON DELETE CASCADE).
+    """
+    result = await db.execute(
+        delete(WebhookSubscription)
+        .where(WebhookSubscription.id == subscription_id, WebhookSubscription.form_id == form_id)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def enqueue_deliveries(db: AsyncSession, *, responses: Iterable[Any]) -> int:
+    """
+    Queue newly inserted responses for every subscription of their form.
+    Does not commit: call it in the transaction that inserts the responses,
+    so each committed response has its outbox rows and nothing else does.
+    Costs one indexed SELECT when the forms have no subscriptions.
+    Returns the number of deliveries queued.
+    """
+    responses = list(responses)
+    if not responses:
+        return 0
+    form_ids = {response.form_id for response in responses}
+    result = await db.execute(
+        select(WebhookSubscription.id, WebhookSubscription.form_id)
+        .filter(WebhookSubscription.form_id.in_(form_ids))
+    )
+    subscriptions_by_form: Dict[uuid.UUID, List[uuid.UUID]] = {}
+    for subscription_id, form_id in result.all():
+        subscriptions_by_form.setdefault(form_id, []).append(subscription_id)
+    if not subscriptions_by_form:
+        return 0
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "subscription_id": subscription_id,
+            "response_id": response.id,
+            "response_created_at": response.created_at,
+            "attempts": 0,
+        }
+        for response in responses
+        for subscription_id in subscriptions_by_form.get(response.form_id, ())
+    ]
+    if rows:
+        await db.execute(insert(WebhookOutboxEntry), rows)
+    return len(rows)
+
+
+async def claim_deliveries(db: AsyncSession, *, limit: int, lease: float) -> List[WebhookOutboxEntry]:
+    """
+    Take up to `limit` due outbox entries, oldest first, and push their
+    next_attempt_at `lease` seconds out so no other dispatcher takes them
+    while they are being sent. SKIP LOCKED lets concurrent dispatchers claim
+    disjoint sets without waiting on each other.
+    """
+    due = (
+        select(WebhookOutboxEntry.id)
+        .where(WebhookOutboxEntry.next_attempt_at <= func.now())
+        .order_by(WebhookOutboxEntry.next_attempt_at.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(WebhookOutboxEntry)
+        .where(WebhookOutboxEntry.id.in_(due.scalar_subquery()))
+        .values(
+            attempts=WebhookOutboxEntry.attempts + 1,
+            next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=lease),
+        )
+        .returning(WebhookOutboxEntry)
+        .execution_options(synchronize_session=False)
+    )
+    entries = list(result.scalars().all())
+    await db.commit()
+    return entries
+
+
+async def get_subscriptions_by_id(
+    db: AsyncSession, *, subscription_ids: Iterable[uuid.UUID]
+) -> Dict[uuid.UUID, WebhookSubscription]:
+    result = await db.execute(
+        select(WebhookSubscription).filter(WebhookSubscription.id.in_(set(subscription_ids)))
+    )
+    return {subscription.id: subscription for subscription in result.scalars().all()}
+
+
+async def get_outbox_responses(db: AsyncSession, *, entries: List[WebhookOutboxEntry]) -> Dict[uuid.UUID, Response]:
+    """
+    Load the responses referenced by outbox entries in one query, keyed by id.
+    Responses deleted (or archived) since they were queued are missing.
+    """
+    if not entries:
+        return {}
+    keys = {(entry.response_created_at, entry.response_id) for entry in entries}
+    result = await db.execute(
+        select(Response)
+        .filter(
+            tuple_(Response.created_at, Response.id).in_(list(keys)),
+            # Lets the planner skip partitions older than the oldest entry
+            Response.created_at >= min(created_at for created_at, _ in keys),
+        )
+    )
+    return {response.id: response for response in result.scalars().all()}
+
+
+async def complete_deliveries(
+    db: AsyncSession, *, subscription_id: uuid.UUID, entry_ids: List[uuid.UUID]
+) -> None:
+    """
+    Remove delivered entries and record the success on the subscription.
+    """
+    await db.execute(
+        delete(WebhookOutboxEntry)
+        .where(WebhookOutboxEntry.id.in_(entry_ids))
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        update(WebhookSubscription)
+        .where(WebhookSubscription.id == subscription_id)
+        .values(last_success_at=func.now(), consecutive_failures=0)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def fail_deliveries(
+    db: AsyncSession,
+    *,
+    subscription_id: uuid.UUID,
+    retry_ids: List[uuid.UUID],
+    drop_ids: List[uuid.UUID],
+    retry_at: datetime,
+    error: str,
+) -> None:
+    """
+    Record a failed delivery: entries in `retry_ids` are due again at
+    `retry_at`; those in `drop_ids` have used up their attempts and are
+    deleted. The error is kept on the subscription for the owner to see.
+    """
+    if retry_ids:
+        await db.execute(
+            update(WebhookOutboxEntry)
+            .where(WebhookOutboxEntry.id.in_(retry_ids))
+            .values(next_attempt_at=retry_at, last_error=error)
+            .execution_options(synchronize_session=False)
+        )
+    if drop_ids:
+        await db.execute(
+            delete(WebhookOutboxEntry)
+            .where(WebhookOutboxEntry.id.in_(drop_ids))
+            .execution_options(synchronize_session=False)
+        )
+    await db.execute(
+        update(WebhookSubscription)
+        .where(WebhookSubscription.id == subscription_id)
+        .values(
+            last_failure_at=func.now(),
+            last_error=error,
+            consecutive_failures=WebhookSubscription.consecutive_failures + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def discard_deliveries(db: AsyncSession, *, entry_ids: List[uuid.UUID]) -> None:
+    """
+    Drop entries that can't be delivered (their response no longer exists).
+    """
+    if not entry_ids:
+        return
+    await db.execute(
+        delete(WebhookOutboxEntry)
+        .where(WebhookOutboxEntry.id.in_(entry_ids))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def count_pending(db: AsyncSession, *, subscription_ids: List[uuid.UUID]) -> Dict[uuid.UUID, int]:
+    """
+    Undelivered entries per subscription.
+    """
+    if not subscription_ids:
+        return {}
+    result = await db.execute(
+        select(WebhookOutboxEntry.subscription_id, func.count())
+        .filter(WebhookOutboxEntry.subscription_id.in_(subscription_ids))
+        .group_by(WebhookOutboxEntry.subscription_id)
+    )
+    return dict(result.all())
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from app.core import export
+from app.core.config import settings
+from app.crud import crud_form, crud_form_stats, crud_job, crud_response
+from app.crud.crud_job import JobContext
+
+
+class JobFailed(Exception):
+    """
+    A permanent failure (e.g. the form is gone): the job is not retried.
+    """
+
+
+def export_path(file_name: str) -> Path:
+    return Path(settings.EXPORT_DIR) / file_name
+
+
+async def purge_forms(ctx: JobContext) -> Dict[str, Any]:
+    """
+    Delete the responses of soft-deleted forms in bounded batches, then the
+    forms themselves. params: {"forms": [[form_id, form_created_at], ...]}.
+    Safe to re-run after an interruption: it just continues deleting.
+    """
+    forms = ctx.job.params["forms"]
+    batch_size = settings.FORM_PURGE_BATCH_SIZE
+    deleted_total = 0
+    for index, (form_id, created_at) in enumerate(forms):
+        form_id = uuid.UUID(form_id)
+        form_created_at = datetime.fromisoformat(created_at) if created_at else None
+        while True:
+            async with ctx.session_factory() as session:
+                deleted = await crud_response.delete_responses_batch(
+                    session, form_id=form_id, batch_size=batch_size, form_created_at=form_created_at
+                )
+            deleted_total += deleted
+            await ctx.report({"forms_done": index, "forms": len(forms), "responses_deleted": deleted_total})
+            if deleted < batch_size:
+                break
+            # Leave room for foreground traffic between batches
+            await asyncio.sleep(settings.FORM_PURGE_BATCH_PAUSE_MS / 1000)
+        async with ctx.session_factory() as session:
+            await crud_form.remove_form(session, form_id=form_id)
+        await ctx.report({"forms_done": index + 1, "forms": len(forms), "responses_deleted": deleted_total}, force=True)
+    return {"forms_deleted": len(forms), "responses_deleted": deleted_total}
+
+
+async def export_responses(ctx: JobContext) -> Dict[str, Any]:
+    """
+    Write every response of a form (archived ones included) to a CSV or
+    NDJSON file under EXPORT_DIR, for download from GET /jobs/{job_id}/result.
+    params: {"format": "csv" | "ndjson"}.
+    """
+    file_format = ctx.job.params.get("format", "csv")
+    file_name = f"{ctx.job.id}.{file_format}"
+    target = export_path(file_name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_suffix(target.suffix + ".tmp")
+    rows_written = 0
+
+    async with ctx.session_factory() as session:
+        form = await crud_form.get_form_cached(db=session, form_id=ctx.job.form_id)
+        if form is None:
+            raise JobFailed("Form not found")
+
+        async def counted(rows: AsyncIterator[Any]) -> AsyncIterator[Any]:
+            nonlocal rows_written
+            async for row in rows:
+                rows_written += 1
+                yield row
+            await ctx.report({"rows": rows_written}, force=True)
+
+        rows = counted(crud_response.stream_responses_by_form(
+            db=session, form_id=form.id, form_created_at=form.created_at
+        ))
+        chunks = (
+            export.iter_csv(rows, export.export_columns(form.data))
+            if file_format == "csv" else export.iter_ndjson(rows)
+        )
+        out = await asyncio.to_thread(open, tmp_path, "w", encoding="utf-8", newline="")
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(out.write, chunk)
+                await ctx.report({"rows": rows_written})
+        finally:
+            await asyncio.to_thread(out.close)
+    await asyncio.to_thread(os.replace, tmp_path, target)
+    return {"file": file_name, "format": file_format, "rows": rows_written, "bytes": target.stat().st_size}
+
+
+async def rebuild_stats(ctx: JobContext) -> Dict[str, Any]:
+    """
+    Recompute a form's answer counters (crud_form_stats.rebuild_counts).
+    """
+    async with ctx.session_factory() as session:
+        form = await crud_form.get_form(db=session, form_id=ctx.job.form_id)
+        if form is None:
+            raise JobFailed("Form not found")
+        counts = await crud_form_stats.rebuild_counts(session, form=form)
+    return {"total_responses": counts.get(crud_form_stats.TOTAL_KEY, 0), "counters": len(counts)}
+
+
+HANDLERS: Dict[str, Callable[[JobContext], Awaitable[Optional[Dict[str, Any]]]]] = {
+    crud_job.PURGE_FORMS: purge_forms,
+    crud_job.EXPORT_RESPONSES: export_responses,
+    crud_job.REBUILD_STATS: rebuild_stats,
+}
+
+
+def discard_result(kind: str, result: Optional[Dict[str, Any]]) -> None:
+    """
+    Remove files a pruned job left behind.
+    """
+    if kind == crud_job.EXPORT_RESPONSES and result and result.get("file"):
+        try:
+            os.unlink(export_path(result["file"]))
+        except FileNotFoundError:
+            pass
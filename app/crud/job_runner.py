@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.crud import crud_job, job_handlers
+from app.db.session import AsyncSessionFactory
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# How often finished jobs past JOB_RETENTION_DAYS are pruned
+PRUNE_INTERVAL = 3600.0
+
+
+class JobRunner:
+    """
+    Runs jobs from the jobs table with at most `concurrency` at a time.
+
+    A dispatcher task claims due jobs (crud_job.claim_jobs) whenever a slot
+    is free, waking up every `poll_interval` seconds or at once when `wake`
+    is called after a job is queued in this process. While jobs run, their
+    heartbeat is refreshed every third of `lease` so other processes don't
+    take them over. Failures are retried with a growing delay up to
+    `max_attempts` (runs whose worker died count as attempts too); handlers raise job_handlers.JobFailed for failures that
+    retrying can't fix. On shutdown, running jobs are cancelled and queued
+    again.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int = settings.JOB_WORKERS,
+        poll_interval: float = settings.JOB_POLL_SECONDS,
+        lease: float = settings.JOB_LEASE_SECONDS,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        handlers=job_handlers.HANDLERS,
+        session_factory=AsyncSessionFactory,
+    ):
+        self.concurrency = max(concurrency, 1)
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.handlers = handlers
+        self.session_factory = session_factory
+        self._wakeup = asyncio.Event()
+        self._running: Dict[uuid.UUID, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self.finished: Dict[tuple, int] = {} # (kind, status) -> count
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def stats(self) -> Dict[str, object]:
+        return {"running": len(self._running), "finished": dict(self.finished)}
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._dispatch(), name="job-dispatcher")
+            self._heartbeat_task = asyncio.create_task(self._heartbeat(), name="job-heartbeat")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        interrupted = list(self._running)
+        tasks = [self._task, self._heartbeat_task, *self._running.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._running.clear()
+        self._task = self._heartbeat_task = None
+        try:
+            async with self.session_factory() as session:
+                await crud_job.requeue(session, job_ids=interrupted)
+        except Exception:
+            # They are reclaimed once their heartbeat goes stale
+            logger.exception("Could not requeue %d interrupted jobs", len(interrupted))
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_prune = loop.time()
+        while True:
+            self._wakeup.clear()
+            free = self.concurrency - len(self._running)
+            claimed = []
+            if free > 0:
+                try:
+                    async with self.session_factory() as session:
+                        for job in await crud_job.fail_stale_jobs(
+                            session, lease=self.lease, max_attempts=self.max_attempts
+                        ):
+                            logger.error("Job %s (%s) failed: %s", job.id, job.kind, job.error)
+                            key = (job.kind, crud_job.FAILED)
+                            self.finished[key] = self.finished.get(key, 0) + 1
+                        claimed = await crud_job.claim_jobs(
+                            session, limit=free, lease=self.lease, max_attempts=self.max_attempts
+                        )
+                except Exception:
+                    logger.exception("Could not claim jobs")
+            for job in claimed:
+                task = asyncio.create_task(self._execute(job), name=f"job-{job.kind}-{job.id}")
+                self._running[job.id] = task
+                task.add_done_callback(lambda _, job_id=job.id: self._job_done(job_id))
+            if loop.time() >= next_prune:
+                next_prune = loop.time() + PRUNE_INTERVAL
+                await self._prune()
+            if claimed and len(claimed) == free:
+                # There may be more due jobs; wait only for a slot to free up
+                await self._wakeup.wait()
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _job_done(self, job_id: uuid.UUID) -> None:
+        self._running.pop(job_id, None)
+        self._wakeup.set()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                async with self.session_factory() as session:
+                    await crud_job.heartbeat(session, job_ids=list(self._running))
+            except Exception:
+                logger.exception("Could not refresh job heartbeats")
+
+    async def _prune(self) -> None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.JOB_RETENTION_DAYS)
+        try:
+            async with self.session_factory() as session:
+                pruned = await crud_job.prune_jobs(session, finished_before=cutoff)
+            for kind, result in pruned:
+                await asyncio.to_thread(job_handlers.discard_result, kind, result)
+        except Exception:
+            logger.exception("Could not prune finished jobs")
+
+    async def _execute(self, job: Job) -> None:
+        handler = self.handlers.get(job.kind)
+        ctx = crud_job.JobContext(job, self.session_factory)
+        retry_at = None
+        try:
+            if handler is None:
+                raise job_handlers.JobFailed(f"Unknown job kind '{job.kind}'")
+            result = await handler(ctx)
+            status, error = crud_job.SUCCEEDED, None
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            status, result, error = crud_job.FAILED, None, f"{type(exc).__name__}: {exc}"
+            if not isinstance(exc, job_handlers.JobFailed) and job.attempts < self.max_attempts:
+                retry_at = datetime.now(timezone.utc) + timedelta(seconds=30 * job.attempts)
+                logger.warning("Job %s (%s) failed, retrying: %s", job.id, job.kind, error, exc_info=exc)
+            else:
+                logger.error("Job %s (%s) failed: %s", job.id, job.kind, error, exc_info=exc)
+        try:
+            async with self.session_factory() as session:
+                await crud_job.finish_job(
+                    session, job_id=job.id, status=status, result=result, error=error, retry_at=retry_at
+                )
+        except Exception:
+            # The stale heartbeat gets the job run again
+            logger.exception("Could not record the outcome of job %s", job.id)
+            return
+        if retry_at is None:
+            key = (job.kind, status)
+            self.finished[key] = self.finished.get(key, 0) + 1
+
+
+job_runner: Optional[JobRunner] = None
+
+
+def wake() -> None:
+    """
+    Start newly committed jobs right away if this process runs workers
+    (otherwise the next poll of whichever process does picks them up).
+    """
+    if job_runner is not None:
+        job_runner.wake()
+
+
+async def start_job_runner() -> None:
+    global job_runner
+    if job_runner is None:
+        job_runner = JobRunner()
+        await job_runner.start()
+
+
+async def stop_job_runner() -> None:
+    global job_runner
+    if job_runner is not None:
+        await job_runner.stop()
+        job_runner = None
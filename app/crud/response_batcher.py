@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.live import live_hub
+from app.crud import crud_form_stats, crud_response, crud_webhook, webhook_dispatcher
+from app.db.session import AsyncSessionFactory
+from app.models.response import Response
+
+logger = logging.getLogger(__name__)
+
+# (row, answer counts, caller's future)
+_Pending = Tuple[Dict[str, Any], crud_form_stats.Counts, "asyncio.Future[Response]"]
+
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+class FormDeleted(Exception):
+    """
+    Raised to submitters whose form row was purged before their batch was
+    written (another process still had the form cached).
+    """
+
+
+def _is_fk_violation(exc: IntegrityError) -> bool:
+    return getattr(exc.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION
+
+
+class ResponseBatcher:
+    """
+    Write-behind ingestion for public submissions.
+
+    `submit` enqueues a row and waits; a background task collects queued rows
+    until `max_batch_size` is reached or `max_delay` seconds have passed since
+    the first one, then writes them with one multi-row INSERT and one commit.
+    Every caller is resolved with its own persisted Response (or the flush
+    error) once its batch has committed, so nothing is acknowledged early.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_batch_size: int = settings.RESPONSE_BATCH_MAX_SIZE,
+        max_delay: float = settings.RESPONSE_BATCH_MAX_DELAY_MS / 1000,
+        max_concurrent_flushes: int = settings.RESPONSE_BATCH_MAX_CONCURRENT_FLUSHES,
+        session_factory=AsyncSessionFactory,
+    ):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.session_factory = session_factory
+        # Bounded so a stalled database pushes back on submitters instead of
+        # buffering without limit.
+        self._queue: "asyncio.Queue[Optional[_Pending]]" = asyncio.Queue(
+            maxsize=max_batch_size * max(max_concurrent_flushes, 1) * 4
+        )
+        self._flush_slots = asyncio.Semaphore(max_concurrent_flushes)
+        self._flushes: set = set()
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.rows = 0
+        self.failed_batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "flushing": len(self._flushes),
+            "batches": self.batches,
+            "rows": self.rows,
+            "failed_batches": self.failed_batches,
+        }
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="response-batcher")
+
+    async def stop(self) -> None:
+        """
+        Flush everything still queued, then stop the collector.
+        """
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def submit(self, *, form_id: uuid.UUID, data: Dict[str, Any], form: Optional[Any] = None) -> Response:
+        """
+        Queue one response and wait until its batch has committed.
+        If the form definition is passed, its answer counters are updated in
+        the same transaction as the batch.
+        """
+        future: "asyncio.Future[Response]" = asyncio.get_running_loop().create_future()
+        row = {"id": uuid.uuid4(), "form_id": form_id, "data": data}
+        counts = crud_form_stats.count_answers(form, [data]) if form is not None else {}
+        await self._queue.put((row, counts, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch: List[_Pending] = [first]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    item = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush_slots.acquire()
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[_Pending]) -> None:
+        try:
+            # Callers that went away (client disconnect) are still written:
+            # the submission was accepted, only the acknowledgement is lost.
+            try:
+                await self._write(batch)
+            except IntegrityError as exc:
+                by_form: Dict[uuid.UUID, List[_Pending]] = {}
+                for pending in batch:
+                    by_form.setdefault(pending[0]["form_id"], []).append(pending)
+                if not _is_fk_violation(exc) or len(by_form) == 1:
+                    raise
+                # A form was purged under a batch spanning several forms:
+                # write each form's rows on their own so only its submitters fail
+                for group in by_form.values():
+                    try:
+                        await self._write(group)
+                    except Exception as group_exc:
+                        self._fail(group, group_exc)
+        except Exception as exc:
+            self._fail(batch, exc)
+        finally:
+            self._flush_slots.release()
+
+    async def _write(self, batch: List[_Pending]) -> None:
+        """
+        Insert a batch in one transaction and resolve its callers.
+        """
+        rows = [row for row, _, _ in batch]
+        counts_by_form: Dict[uuid.UUID, crud_form_stats.Counts] = {}
+        for row, counts, _ in batch:
+            if counts:
+                crud_form_stats.merge_counts(counts_by_form.setdefault(row["form_id"], {}), counts)
+        async with self.session_factory() as session:
+            created = await crud_response.insert_response_rows(session, rows=rows)
+            for form_id in sorted(counts_by_form):
+                await crud_form_stats.increment_counts(session, form_id=form_id, counts=counts_by_form[form_id])
+            queued = await crud_webhook.enqueue_deliveries(session, responses=created)
+            await session.commit()
+        if queued:
+            webhook_dispatcher.wake()
+        self.batches += 1
+        self.rows += len(rows)
+        responses_by_form: Dict[uuid.UUID, List[Response]] = {}
+        for (row, _, future), db_response in zip(batch, created):
+            responses_by_form.setdefault(row["form_id"], []).append(db_response)
+            if not future.done():
+                future.set_result(db_response)
+        for form_id, responses in responses_by_form.items():
+            live_hub.publish(form_id, responses, counts_by_form.get(form_id, {}))
+
+    def _fail(self, batch: List[_Pending], exc: Exception) -> None:
+        self.failed_batches += 1
+        if isinstance(exc, IntegrityError) and _is_fk_violation(exc):
+            logger.warning("Dropped %d responses to a deleted form", len(batch))
+            exc = FormDeleted()
+        else:
+            logger.error("Failed to flush batch of %d responses", len(batch), exc_info=exc)
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
+
+
+response_batcher: Optional[ResponseBatcher] = None
+
+
+async def start_response_batcher() -> None:
+    """
+    Start the process-wide batcher if RESPONSE_BATCHING_ENABLED is set.
+    """
+    global response_batcher
+    if settings.RESPONSE_BATCHING_ENABLED and response_batcher is None:
+        response_batcher = ResponseBatcher()
+        await response_batcher.start()
+
+
+async def stop_response_batcher() -> None:
+    global response_batcher
+    if response_batcher is not None:
+        await response_batcher.stop()
+        response_batcher = None
@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.core import serialization, webhook_signature, webhook_targets
+from app.core.config import settings
+from app.crud import crud_webhook
+from app.db.session import AsyncSessionFactory
+from app.models.webhook_outbox import WebhookOutboxEntry
+from app.models.webhook_subscription import WebhookSubscription
+
+logger = logging.getLogger(__name__)
+
+EVENT = "response.created"
+# Upper bound on the delay between retries of a failing delivery
+MAX_RETRY_DELAY = 3600.0
+# Longest error text kept on outbox entries and subscriptions
+MAX_ERROR_LENGTH = 500
+
+
+def retry_delay(attempts: int, base: float = settings.WEBHOOK_RETRY_BASE_SECONDS) -> float:
+    """
+    Exponential backoff with jitter, so receivers coming back up aren't hit
+    by every queued delivery at the same moment.
+    """
+    delay = min(base * 2 ** max(attempts - 1, 0), MAX_RETRY_DELAY)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class WebhookDispatcher:
+    """
+    Drains the webhook outbox.
+
+    Submissions only write outbox rows in their own transaction; this task
+    claims due entries (crud_webhook.claim_deliveries), groups them by
+    subscription and POSTs each group as one signed JSON batch of up to
+    `batch_size` responses through a pooled HTTP client that only connects
+    to public addresses (webhook_targets.CheckedTransport), with at most
+    `concurrency` requests in flight. After `wake` it waits `batch_delay`
+    seconds first so bursts of submissions go out together; otherwise it
+    polls every `poll_interval` seconds (for entries queued by other
+    processes and retries). A 2xx reply removes the entries; anything else
+    reschedules them with backoff until `max_attempts`, then drops them.
+    Delivery is at least once: receivers should dedupe on response id.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int = settings.WEBHOOK_BATCH_SIZE,
+        batch_delay: float = settings.WEBHOOK_BATCH_DELAY_MS / 1000,
+        concurrency: int = settings.WEBHOOK_CONCURRENCY,
+        timeout: float = settings.WEBHOOK_TIMEOUT_SECONDS,
+        max_attempts: int = settings.WEBHOOK_MAX_ATTEMPTS,
+        poll_interval: float = settings.WEBHOOK_POLL_SECONDS,
+        session_factory=AsyncSessionFactory,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.batch_size = max(batch_size, 1)
+        self.batch_delay = batch_delay
+        self.concurrency = max(concurrency, 1)
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        # Entries stay claimed for longer than a full round of requests takes
+        self.lease = max(timeout * 3, 30.0)
+        self.session_factory = session_factory
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.in_flight = 0
+        self.batches = 0
+        self.delivered = 0
+        self.failed_batches = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "batches": self.batches,
+            "delivered": self.delivered,
+            "failed_batches": self.failed_batches,
+            "dropped": self.dropped,
+        }
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if not self.running:
+            limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=limits,
+                transport=self.transport or webhook_targets.CheckedTransport(limits=limits),
+                follow_redirects=False,
+                trust_env=False,
+            )
+            self._task = asyncio.create_task(self._run(), name="webhook-dispatcher")
+
+    async def stop(self) -> None:
+        """
+        Stop the dispatcher. Batches cut short are sent again once their
+        lease expires.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self._client.aclose()
+        self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                # Let a burst of submissions accumulate into fewer, larger batches
+                await asyncio.sleep(self.batch_delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while await self._dispatch_once():
+                pass
+
+    async def _dispatch_once(self) -> bool:
+        """
+        Claim and deliver one round of due entries. True if there may be more.
+        """
+        limit = self.batch_size * self.concurrency
+        try:
+            async with self.session_factory() as session:
+                entries = await crud_webhook.claim_deliveries(session, limit=limit, lease=self.lease)
+                if not entries:
+                    return False
+                subscriptions = await crud_webhook.get_subscriptions_by_id(
+                    session, subscription_ids=[entry.subscription_id for entry in entries]
+                )
+                responses = await crud_webhook.get_outbox_responses(session, entries=entries)
+        except Exception:
+            logger.exception("Could not claim webhook deliveries")
+            return False
+
+        missing = [entry.id for entry in entries if entry.response_id not in responses]
+        if missing:
+            await self._discard(missing)
+        by_subscription: Dict[uuid.UUID, List[WebhookOutboxEntry]] = {}
+        for entry in entries:
+            if entry.response_id in responses and entry.subscription_id in subscriptions:
+                by_subscription.setdefault(entry.subscription_id, []).append(entry)
+        deliveries = []
+        for subscription_id, group in by_subscription.items():
+            for start in range(0, len(group), self.batch_size):
+                batch = group[start:start + self.batch_size]
+                deliveries.append(self._deliver(
+                    subscriptions[subscription_id], batch, [responses[entry.response_id] for entry in batch]
+                ))
+        await asyncio.gather(*deliveries)
+        return len(entries) == limit
+
+    async def _deliver(self, subscription: WebhookSubscription, entries: List[WebhookOutboxEntry], responses) -> None:
+        body = serialization.dumps({
+            "event": EVENT,
+            "form_id": subscription.form_id,
+            "webhook_id": subscription.id,
+            "responses": serialization.responses_json(responses),
+        })
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": f"{settings.PROJECT_NAME}-Webhooks",
+            "X-Formflow-Event": EVENT,
+            "X-Formflow-Delivery": str(uuid.uuid4()),
+            webhook_signature.SIGNATURE_HEADER: webhook_signature.sign(subscription.secret, timestamp, body),
+        }
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                # Subscriptions created before https was required
+                webhook_targets.check_scheme(subscription.url)
+                reply = await self._client.post(subscription.url, content=body, headers=headers)
+                error = None if reply.is_success else f"HTTP {reply.status_code}"
+            except (httpx.HTTPError, webhook_targets.UnsafeTarget) as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            finally:
+                self.in_flight -= 1
+
+        entry_ids = [entry.id for entry in entries]
+        try:
+            async with self.session_factory() as session:
+                if error is None:
+                    await crud_webhook.complete_deliveries(session, subscription_id=subscription.id, entry_ids=entry_ids)
+                else:
+                    error = error[:MAX_ERROR_LENGTH]
+                    # Entries in a batch share their fate; back off by the most-tried one
+                    attempts = max(entry.attempts for entry in entries)
+                    give_up = attempts >= self.max_attempts
+                    await crud_webhook.fail_deliveries(
+                        session,
+                        subscription_id=subscription.id,
+                        retry_ids=[] if give_up else entry_ids,
+                        drop_ids=entry_ids if give_up else [],
+                        retry_at=datetime.now(timezone.utc) + timedelta(seconds=retry_delay(attempts)),
+                        error=error,
+                    )
+        except Exception:
+            # The lease runs out and the batch is sent again
+            logger.exception("Could not record webhook delivery to %s", subscription.url)
+            return
+        if error is None:
+            self.batches += 1
+            self.delivered += len(entries)
+        else:
+            self.failed_batches += 1
+            if give_up:
+                self.dropped += len(entries)
+                logger.error("Dropped %d webhook deliveries to %s after %d attempts: %s",
+                             len(entries), subscription.url, attempts, error)
+            else:
+                logger.warning("Webhook delivery to %s failed (attempt %d): %s", subscription.url, attempts, error)
+
+    async def _discard(self, entry_ids: List[uuid.UUID]) -> None:
+        try:
+            async with self.session_factory() as session:
+                await crud_webhook.discard_deliveries(session, entry_ids=entry_ids)
+            self.dropped += len(entry_ids)
+        except Exception:
+            logger.exception("Could not discard %d webhook deliveries", len(entry_ids))
+
+
+webhook_dispatcher: Optional[WebhookDispatcher] = None
+
+
+def wake() -> None:
+    """
+    Deliver newly committed outbox entries soon if this process runs the
+    dispatcher (otherwise the next poll of whichever process does sends them).
+    """
+    if webhook_dispatcher is not None:
+        webhook_dispatcher.wake()
+
+
+async def start_webhook_dispatcher() -> None:
+    global webhook_dispatcher
+    if webhook_dispatcher is None:
+        webhook_dispatcher = WebhookDispatcher()
+        await webhook_dispatcher.start()
+
+
+async def stop_webhook_dispatcher() -> None:
+    global webhook_dispatcher
+    if webhook_dispatcher is not None:
+        await webhook_dispatcher.stop()
+        webhook_dispatcher = None
@@ -5,4 +5,9 @@ from app.db.base_class import Base
 from app.models.user import User  # noqa F401 - Import user model
 # Import other models here as you create them
 from app.models.form import Form # noqa F401
-from app.models.response import Response # noqa F401
\ No newline at end of file
+from app.models.response import Response # noqa F401
+from app.models.form_field_stat import FormFieldStat # noqa F401
+from app.models.response_archive_chunk import ResponseArchiveChunk # noqa F401
+from app.models.job import Job # noqa F401
+from app.models.webhook_subscription import WebhookSubscription # noqa F401
+from app.models.webhook_outbox import WebhookOutboxEntry # noqa F401
@@ -0,0 +1,111 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+# Monthly range partitions of the responses table (see migration
+# e7a14c9b3d52). Partitions are named responses_pYYYYMM and cover
+# [first day of the month, first day of the next month) in UTC.
+# responses_default catches rows outside every partition so inserts never
+# fail; ensure_partitions moves such rows into their month when it creates it.
+
+PARENT = "responses"
+DEFAULT_PARTITION = "responses_default"
+
+# Responses can't be older than their form, so the form's creation time is a
+# lower bound on created_at that lets Postgres prune every partition from
+# before the form existed. The slack covers transaction-start vs commit order.
+FORM_WINDOW_SLACK = timedelta(days=1)
+
+
+def responses_since(form_created_at: Optional[datetime]) -> Optional[datetime]:
+    """
+    Earliest created_at a response of a form created at `form_created_at` can have.
+    """
+    return form_created_at - FORM_WINDOW_SLACK if form_created_at is not None else None
+
+
+class Partition(NamedTuple):
+    name: str
+    start: datetime
+    end: datetime
+
+
+def month_start(moment: datetime) -> date:
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def monthly_partition(month: date) -> Partition:
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    next_month = add_months(month, 1)
+    end = datetime(next_month.year, next_month.month, 1, tzinfo=timezone.utc)
+    return Partition(f"{PARENT}_p{month.year:04d}{month.month:02d}", start, end)
+
+
+async def list_partitions(conn: AsyncConnection) -> List[str]:
+    result = await conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent ORDER BY c.relname"
+    ), {"parent": PARENT})
+    return list(result.scalars().all())
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    result = await conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :parent"
+    ), {"parent": PARENT})
+    return result.first() is not None
+
+
+async def create_partition(conn: AsyncConnection, partition: Partition) -> bool:
+    """
+    Create one monthly partition if it doesn't exist. Rows for that month
+    that landed in the default partition are moved into it first, as
+    Postgres refuses to attach a range that the default partition overlaps.
+    Returns True if the partition was created.
+    """
+    if partition.name in await list_partitions(conn):
+        return False
+    bounds = {"start": partition.start, "end": partition.end}
+    stray = await conn.execute(text(
+        f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end LIMIT 1"
+    ), bounds)
+    # Literal bounds: partition DDL does not accept bind parameters
+    for_values = f"FOR VALUES FROM ('{partition.start.isoformat()}') TO ('{partition.end.isoformat()}')"
+    if stray.first() is None:
+        await conn.execute(text(f"CREATE TABLE {partition.name} PARTITION OF {PARENT} {for_values}"))
+        return True
+    await conn.execute(text(
+        f"CREATE TABLE {partition.name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    await conn.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end RETURNING *) "
+        f"INSERT INTO {partition.name} SELECT * FROM moved"
+    ), bounds)
+    await conn.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {partition.name} {for_values}"))
+    return True
+
+
+async def ensure_partitions(engine: AsyncEngine, *, ahead: int) -> List[str]:
+    """
+    Make sure monthly partitions exist for the current month and the `ahead`
+    months after it. Idempotent; each partition is created in its own
+    transaction to keep the lock on the parent short. Returns the names of
+    the partitions created.
+    """
+    month = month_start(datetime.now(timezone.utc))
+    created = []
+    for offset in range(ahead + 1):
+        partition = monthly_partition(add_months(month, offset))
+        async with engine.begin() as conn:
+            if await create_partition(conn, partition):
+                created.append(partition.name)
+    return created
@@ -1,12 +1,40 @@
 # app/db/session.py
+import itertools
+import time
+from typing import Optional
+
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core import metrics, security
+
+
+def _create_engine(url: str, *, pool_size: int, max_overflow: int):
+    # connect_args={"check_same_thread": False} is only needed for SQLite
+    return create_async_engine(
+        url,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        echo=settings.SQL_ECHO, # SQL_ECHO=true for debugging SQL
+    )
+
+
+# Create the async engine (primary: all writes and consistency-sensitive reads)
+engine = _create_engine(
+    settings.DATABASE_URL, pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW
+)
 
-# Create the async engine
-# connect_args only needed for SQLite, remove for PostgreSQL
-# engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True, connect_args={"check_same_thread": False}) # For SQLite
-engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True, echo=True) # echo=True for debugging SQL
+# Optional read replicas, each with its own pool
+replica_engines = [
+    _create_engine(url, pool_size=settings.DB_REPLICA_POOL_SIZE, max_overflow=settings.DB_REPLICA_MAX_OVERFLOW)
+    for url in settings.replica_urls
+]
+
+for _engine in [engine] + replica_engines:
+    metrics.instrument_engine(_engine)
 
 # Create a session factory bound to the engine
 # expire_on_commit=False prevents attributes from being expired after commit in async context
@@ -14,7 +42,87 @@ AsyncSessionFactory = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Replica sessions are tagged so shared caches can tell their (possibly
+# lagging) reads apart from the primary's; see is_replica
+ReplicaSessionFactories = [
+    sessionmaker(replica, class_=AsyncSession, expire_on_commit=False, info={"replica": True})
+    for replica in replica_engines
+]
+_next_replica = itertools.cycle(ReplicaSessionFactories)
+
+# Read-your-writes: user id -> time of their last successful write. Entries
+# expire after READ_YOUR_WRITES_SECONDS, so presence alone means "sticky".
+# This is per process; the READ_PRIMARY_COOKIE covers multi-worker setups for
+# browser clients.
+_recent_writers: TTLCache[bool] = TTLCache(maxsize=100_000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+READ_PRIMARY_COOKIE = "ff_read_primary_until"
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def _token_user_id(request: Request) -> Optional[str]:
+    """
+    The "uid" claim of the request's bearer token, if any. Only used for
+    routing, never for authorization.
+    """
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = security.decode_access_token(token)
+    return payload.get("uid") if payload else None
+
+
+def record_write(request: Request) -> Optional[float]:
+    """
+    Mark the requesting user as having just written. Returns the epoch time
+    until which their reads should hit the primary (for the cookie), or None
+    if the request is anonymous.
+    """
+    user_id = _token_user_id(request)
+    if user_id is None:
+        return None
+    _recent_writers.set(user_id, True)
+    return time.time() + settings.READ_YOUR_WRITES_SECONDS
+
+
+def _must_read_primary(request: Request) -> bool:
+    until = request.cookies.get(READ_PRIMARY_COOKIE)
+    if until:
+        try:
+            if float(until) > time.time():
+                return True
+        except ValueError:
+            pass
+    user_id = _token_user_id(request)
+    return user_id is not None and _recent_writers.get(user_id) is not None
+
+
+def is_replica(session: AsyncSession) -> bool:
+    """
+    True if the session reads from a replica, whose rows may be behind the primary.
+    """
+    return bool(session.info.get("replica"))
+
+
 # Dependency to get DB session
 async def get_db() -> AsyncSession:
     async with AsyncSessionFactory() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+def read_session_factory(request: Request) -> sessionmaker:
+    """
+    Session factory for a read-only request: the next replica (round-robin),
+    or the primary if no replicas are configured or the user wrote within
+    READ_YOUR_WRITES_SECONDS.
+    """
+    if not ReplicaSessionFactories or _must_read_primary(request):
+        return AsyncSessionFactory
+    return next(_next_replica)
+
+
+# Dependency for read-only endpoints
+async def get_read_db(request: Request) -> AsyncSession:
+    async with read_session_factory(request)() as session:
+        yield session
@@ -1,15 +1,19 @@
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+import math
+import uuid
+from typing import Hashable, List, Optional, Tuple
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core import security
-from app.db.session import get_db
+from app.core import metrics, security
+from app.core.rate_limit import ConcurrencyLimiter, RateLimited, TokenBucketLimiter, form_rate_limits
+from app.db.session import AsyncSessionFactory, get_db, get_read_db # noqa F401 - re-exported for endpoints
 from app.models.user import User
 from app.schemas.token import TokenData
-from app.crud import crud_user
+from app.crud import crud_form, crud_user
 
 # OAuth2PasswordBearer points to the URL where the client can get a token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
@@ -28,9 +32,22 @@ async def get_current_user(
     email: Optional[str] = payload.get("sub")
     if email is None:
         raise credentials_exception
-    token_data = TokenData(email=email)
+    try:
+        token_data = TokenData(email=email, user_id=payload.get("uid"))
+    except ValidationError:
+        raise credentials_exception
 
-    user = await crud_user.get_user_by_email(db, email=token_data.email)
+    if token_data.user_id is not None:
+        # Fast path: active principals are cached by user id for a short TTL,
+        # so most authenticated requests skip the users query entirely.
+        user = await crud_user.get_principal(db, user_id=token_data.user_id)
+        # A token issued for the user's previous email must stop working once
+        # the email changes, as it did when users were looked up by email
+        if user is not None and user.email != token_data.email:
+            raise credentials_exception
+    else:
+        # Tokens issued before the "uid" claim existed only carry the email
+        user = await crud_user.get_user_by_email(db, email=token_data.email)
     if user is None:
         raise credentials_exception
     if not user.is_active:
@@ -42,4 +59,124 @@ async def get_current_active_user(
 ) -> User:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
\ No newline at end of file
+    return current_user
+
+# Admission control for public submissions (see the RATE_LIMIT_* settings)
+submission_buckets = TokenBucketLimiter(maxsize=settings.RATE_LIMIT_MAX_KEYS)
+submission_slots = ConcurrencyLimiter(settings.SUBMISSION_MAX_CONCURRENCY)
+
+
+def _submission_buckets(form_id: uuid.UUID, client_ip: str) -> List[Tuple[str, Hashable, float, float]]:
+    """
+    The (reason, key, rate, burst) buckets a submission to `form_id` draws from.
+    """
+    # Per-form overrides come from the form cache only: admission must not
+    # touch the database. On a cold cache the defaults apply until the
+    # submission itself loads the form.
+    cached_form = crud_form.form_cache.peek(form_id)
+    defaults = {
+        "perSecond": settings.SUBMISSION_RATE_PER_FORM,
+        "burst": settings.SUBMISSION_BURST_PER_FORM,
+        "perIpPerSecond": settings.SUBMISSION_RATE_PER_IP,
+        "perIpBurst": settings.SUBMISSION_BURST_PER_IP,
+    }
+    limits = form_rate_limits(cached_form.data.get("settings") if cached_form is not None else None, defaults)
+    # A client's bucket is shared across forms, except on forms that set
+    # their own per-IP limits: those get a bucket of their own so a generous
+    # form can't refill the client's budget for every other form.
+    ip_key = ("ip", client_ip)
+    if (limits["perIpPerSecond"], limits["perIpBurst"]) != (defaults["perIpPerSecond"], defaults["perIpBurst"]):
+        ip_key = ("ip", client_ip, form_id)
+    return [
+        ("ip", ip_key, limits["perIpPerSecond"], limits["perIpBurst"]),
+        ("form", ("form", form_id), limits["perSecond"], limits["burst"]),
+    ]
+
+
+def _check_submission_rate(form_id: uuid.UUID, client_ip: str, cost: int = 1) -> None:
+    # Both buckets are debited together or not at all, so a submission the
+    # form's budget refuses doesn't cost the client its own tokens.
+    buckets = _submission_buckets(form_id, client_ip)
+    index, wait = submission_buckets.acquire_all([bucket[1:] for bucket in buckets], cost=cost)
+    if index is not None:
+        raise RateLimited(buckets[index][0], wait)
+
+
+def max_submission_batch(request: Request, form_id: uuid.UUID) -> int:
+    """
+    Largest batch submission the rate limits can ever admit for this client
+    and form: the smallest burst of its buckets (a batch costs one token per
+    response), capped at RESPONSE_BULK_MAX_ITEMS.
+    """
+    largest = settings.RESPONSE_BULK_MAX_ITEMS
+    if settings.RATE_LIMIT_ENABLED:
+        for _, _, rate, burst in _submission_buckets(form_id, _client_ip(request)):
+            if rate > 0:
+                largest = min(largest, int(max(burst, 1)))
+    return largest
+
+
+async def admit_submission(request: Request, form_id: uuid.UUID):
+    """
+    Refuse public submissions over the per-IP / per-form rate or beyond the
+    global concurrency cap with a 429, and hold a concurrency slot for the
+    rest of the request otherwise.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        yield
+        return
+    try:
+        _check_submission_rate(form_id, _client_ip(request))
+        if not submission_slots.try_acquire():
+            raise RateLimited("concurrency", 1)
+    except RateLimited as exc:
+        raise _rejected(exc)
+    try:
+        yield
+    finally:
+        submission_slots.release()
+
+
+def charge_submissions(request: Request, form_id: uuid.UUID, count: int) -> None:
+    """
+    Take `count` more submissions from the request's rate buckets, so a batch
+    submission costs as much as sending its responses one by one (admission
+    already took one). Call it once the body is parsed and checked against
+    max_submission_batch.
+    """
+    if not settings.RATE_LIMIT_ENABLED or count <= 0:
+        return
+    try:
+        _check_submission_rate(form_id, _client_ip(request), cost=count)
+    except RateLimited as exc:
+        raise _rejected(exc)
+
+
+def _client_ip(request: Request) -> str:
+    # Behind a proxy, run uvicorn with --proxy-headers so this is the real client
+    return request.client.host if request.client else "unknown"
+
+
+def _rejected(exc: RateLimited) -> HTTPException:
+    metrics.submissions_rejected.inc(exc.reason)
+    if math.isinf(exc.retry_after):
+        # More responses than the bucket can ever hold: waiting won't help
+        # (callers check max_submission_batch first, so this is a safety net)
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Batch exceeds the submission rate limit, send fewer responses per request.",
+        )
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many submissions, please retry shortly.",
+        headers={"Retry-After": exc.retry_after_header},
+    )
+
+
+async def get_submission_db(_: None = Depends(admit_submission)) -> AsyncSession:
+    """
+    DB session for public submission endpoints, only opened once admission
+    control has let the request through.
+    """
+    async with AsyncSessionFactory() as session:
+        yield session
@@ -1,12 +1,40 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from app import dependencies
+from app.core import archive, live, metrics
 from app.core.config import settings
+from app.core.security import password_hasher
 from app.api.v1.api import api_router
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.crud import crud_form, crud_user, job_runner, response_batcher, webhook_dispatcher
+from app.db import session as db_session
 from fastapi.middleware.cors import CORSMiddleware
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background services that live for the whole process
+    await response_batcher.start_response_batcher()
+    if settings.JOBS_ENABLED:
+        await job_runner.start_job_runner()
+    if settings.WEBHOOKS_ENABLED:
+        await webhook_dispatcher.start_webhook_dispatcher()
+    try:
+        yield
+    finally:
+        await webhook_dispatcher.stop_webhook_dispatcher()
+        await job_runner.stop_job_runner()
+        await response_batcher.stop_response_batcher()
+        password_hasher.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 origins = [
@@ -21,8 +49,112 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],  # Let browser clients read pagination cursors and validators
 )
 
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    # After a successful write, pin the user's reads to the primary for a
+    # short window so replica lag never hides their own changes.
+    response = await call_next(request)
+    if db_session.ReplicaSessionFactories and request.method in db_session.WRITE_METHODS and response.status_code < 400:
+        until = db_session.record_write(request)
+        if until is not None:
+            response.set_cookie(
+                db_session.READ_PRIMARY_COOKIE, f"{until:.3f}",
+                max_age=int(settings.READ_YOUR_WRITES_SECONDS) + 1, httponly=True, samesite="lax",
+            )
+    return response
+
+
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    # Outermost middleware: times the whole request and collects the SQL it
+    # ran (see app.core.metrics). For streaming responses the time is to the
+    # first byte, not to the end of the body.
+    stats = metrics.RequestStats()
+    token = metrics.request_stats.set(stats)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.request_stats.reset(token)
+        # Label by path template so per-id URLs don't explode cardinality
+        route = metrics.route_template(request.scope)
+        metrics.observe_request(request.method, route, status_code, elapsed, stats)
+
+
+def _component_metrics():
+    caches = {
+        "form": crud_form.form_cache,
+        "principal": crud_user.principal_cache,
+        "archive_chunk": archive.chunk_cache,
+    }
+    cache_stats = {name: cache.stats() for name, cache in caches.items()}
+    for key, metric_type, documentation in (
+        ("hits", "counter", "Cache hits."),
+        ("misses", "counter", "Cache misses."),
+        ("evictions", "counter", "Cache LRU evictions."),
+        ("size", "gauge", "Entries currently cached."),
+    ):
+        samples = [({"cache": name}, stats[key]) for name, stats in cache_stats.items()]
+        yield f"formflow_cache_{key}" + ("_total" if metric_type == "counter" else ""), metric_type, documentation, samples
+
+    hasher = password_hasher.stats()
+    yield "formflow_password_hash_pending", "gauge", "Password hashes queued or running.", [({}, hasher["pending"])]
+    yield "formflow_password_hash_completed_total", "counter", "Password hashes completed.", [({}, hasher["completed"])]
+    yield "formflow_password_hash_rejected_total", "counter", "Password hashes rejected (pool full).", [({}, hasher["rejected"])]
+
+    slots = dependencies.submission_slots.stats()
+    yield "formflow_submission_slots_active", "gauge", "Submissions currently holding a concurrency slot.", [({}, slots["active"])]
+
+    batcher = response_batcher.response_batcher
+    if batcher is not None:
+        batcher_stats = batcher.stats()
+        yield "formflow_response_batcher_queued", "gauge", "Submissions waiting for a flush.", [({}, batcher_stats["queued"])]
+        yield "formflow_response_batcher_batches_total", "counter", "Batches flushed.", [({}, batcher_stats["batches"])]
+        yield "formflow_response_batcher_rows_total", "counter", "Responses written by the batcher.", [({}, batcher_stats["rows"])]
+        yield "formflow_response_batcher_failed_batches_total", "counter", "Batches that failed to flush.", [({}, batcher_stats["failed_batches"])]
+
+    runner = job_runner.job_runner
+    if runner is not None:
+        runner_stats = runner.stats()
+        yield "formflow_jobs_running", "gauge", "Background jobs running in this process.", [({}, runner_stats["running"])]
+        yield "formflow_jobs_finished_total", "counter", "Background jobs finished, by kind and outcome.", [
+            ({"kind": kind, "status": job_status}, count) for (kind, job_status), count in runner_stats["finished"].items()
+        ]
+
+    live_stats = live.live_hub.stats()
+    yield "formflow_live_feeds", "gauge", "Open live response feeds.", [({}, live_stats["subscribers"])]
+    yield "formflow_live_responses_published_total", "counter", "Responses published to live feeds.", [({}, live_stats["published"])]
+    yield "formflow_live_responses_dropped_total", "counter", "Responses skipped for live feeds that fell behind.", [({}, live_stats["dropped"])]
+
+    dispatcher = webhook_dispatcher.webhook_dispatcher
+    if dispatcher is not None:
+        dispatcher_stats = dispatcher.stats()
+        yield "formflow_webhook_requests_in_flight", "gauge", "Webhook requests in flight.", [({}, dispatcher_stats["in_flight"])]
+        yield "formflow_webhook_batches_total", "counter", "Webhook batches, by outcome.", [
+            ({"outcome": "delivered"}, dispatcher_stats["batches"]),
+            ({"outcome": "failed"}, dispatcher_stats["failed_batches"]),
+        ]
+        yield "formflow_webhook_responses_delivered_total", "counter", "Responses delivered to webhooks.", [({}, dispatcher_stats["delivered"])]
+        yield "formflow_webhook_responses_dropped_total", "counter", "Webhook deliveries given up on.", [({}, dispatcher_stats["dropped"])]
+
+
+metrics.registry.register_collector(_component_metrics)
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def read_metrics():
+        return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/", tags=["Root"])
@@ -1,18 +1,54 @@
 import uuid
-from sqlalchemy import UUID, Column, DateTime, func, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from typing import Any, Dict
+from sqlalchemy import UUID, Column, DateTime, func, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, validates
 
 from app.db.base_class import Base
 
 
+def summary_columns(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Denormalized listing columns derived from a form definition.
+    Also used by bulk (Core) inserts, which bypass the ORM validator below.
+    """
+    return {
+        "title": (data or {}).get("title"),
+        "field_count": len((data or {}).get("fields") or []),
+    }
+
+
 class Form(Base):
     __tablename__ = "forms"
+    __table_args__ = (
+        # Owner listing: newest first, keyset-paginated on (created_at, id)
+        Index("ix_forms_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        # Forms awaiting a purge, looked up when the purger starts
+        Index("ix_forms_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    data = Column(JSON, nullable=False)
+    data = Column(JSONB, nullable=False)
+    # Copies of data["title"] / len(data["fields"]) so the dashboard list can
+    # be served without reading (or detoasting) the full definition.
+    title = Column(String, nullable=True)
+    field_count = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set when the owner deletes the form; the form is hidden from then on and
+    # its responses are purged in the background (a purge_forms job, app.crud.job_handlers).
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
 
     owner = relationship("User", back_populates="forms")
-    responses = relationship("Response", back_populates="form", cascade="all, delete-orphan")
\ No newline at end of file
+    # Responses go with the form through ON DELETE CASCADE; passive_deletes
+    # keeps the ORM from loading them just to delete them one by one.
+    responses = relationship("Response", back_populates="form", cascade="all, delete-orphan", passive_deletes=True)
+
+    @validates("data")
+    def _sync_summary_columns(self, key: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Runs whenever data is assigned (constructor or update), keeping
+        # the summary columns in step with the definition.
+        for column, value in summary_columns(data).items():
+            setattr(self, column, value)
+        return data
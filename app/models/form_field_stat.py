@@ -0,0 +1,17 @@
+from sqlalchemy import UUID, BigInteger, Column, ForeignKey, String
+
+from app.db.base_class import Base
+
+
+class FormFieldStat(Base):
+    """
+    Running count of how often an option was chosen for a choice field.
+    The row with field_id == "" and option_value == "" holds the form's
+    total number of responses.
+    """
+    __tablename__ = "form_field_stats"
+
+    form_id = Column(UUID(as_uuid=True), ForeignKey("forms.id", ondelete="CASCADE"), primary_key=True)
+    field_id = Column(String, primary_key=True)
+    option_value = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
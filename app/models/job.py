@@ -0,0 +1,38 @@
+import uuid
+from sqlalchemy import UUID, Column, DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.db.base_class import Base
+
+
+class Job(Base):
+    """
+    A unit of background work (export, stats rebuild, purge) run by the job
+    runner (app.crud.job_runner). Rows are claimed with FOR UPDATE SKIP
+    LOCKED, so any number of worker processes can share the table.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claiming: queued jobs that are due, oldest first
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+        Index("ix_jobs_owner_id_created_at", "owner_id", "created_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued") # queued | running | succeeded | failed
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    # No foreign key: purge jobs outlive their form
+    form_id = Column(UUID(as_uuid=True), nullable=True)
+    params = Column(JSONB, nullable=False, default=dict)
+    progress = Column(JSONB, nullable=True)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Refreshed by the worker while it runs the job; a stale heartbeat means
+    # the worker died and the job may be claimed again.
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
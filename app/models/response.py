@@ -1,5 +1,6 @@
 import uuid
-from sqlalchemy import UUID, Column, DateTime, func, ForeignKey, JSON
+from sqlalchemy import UUID, Column, DateTime, func, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -7,11 +8,22 @@ from app.db.base_class import Base
 
 class Response(Base):
     __tablename__ = "responses"
+    __table_args__ = (
+        # Per-form listing: oldest first, keyset-paginated on (created_at, id)
+        Index("ix_responses_form_id_created_at_id", "form_id", "created_at", "id"),
+        # Server-side answer filters (@> containment and @? jsonpath)
+        Index("ix_responses_data_path_ops", "data", postgresql_using="gin", postgresql_ops={"data": "jsonb_path_ops"}),
+        # Monthly range partitions, managed by app.db.partitions
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    form_id = Column(UUID(as_uuid=True), ForeignKey("forms.id"), nullable=False)
-    data = Column(JSON, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # The partition key must be part of the primary key. `id` is generated
+    # client-side, so it doubles as the sentinel that lets a multi-row
+    # INSERT ... RETURNING hand rows back in parameter order in one statement
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, insert_sentinel=True)
+    form_id = Column(UUID(as_uuid=True), ForeignKey("forms.id", ondelete="CASCADE"), nullable=False)
+    data = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     form = relationship("Form", back_populates="responses")
\ No newline at end of file
@@ -0,0 +1,27 @@
+import uuid
+from sqlalchemy import UUID, Column, DateTime, ForeignKey, Index, Integer, String, func
+
+from app.db.base_class import Base
+
+
+class ResponseArchiveChunk(Base):
+    """
+    Manifest entry for one compressed file of archived responses (see
+    app.core.archive). The rows it holds were deleted from `responses` in
+    the same transaction that inserted this entry. first/last are the
+    (created_at, id) keys of the oldest and newest row in the file.
+    """
+    __tablename__ = "response_archive_chunks"
+    __table_args__ = (
+        Index("ix_response_archive_chunks_form_id_first", "form_id", "first_created_at", "first_id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    form_id = Column(UUID(as_uuid=True), ForeignKey("forms.id", ondelete="CASCADE"), nullable=False)
+    path = Column(String, nullable=False) # Relative to ARCHIVE_DIR
+    row_count = Column(Integer, nullable=False)
+    first_created_at = Column(DateTime(timezone=True), nullable=False)
+    first_id = Column(UUID(as_uuid=True), nullable=False)
+    last_created_at = Column(DateTime(timezone=True), nullable=False)
+    last_id = Column(UUID(as_uuid=True), nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,34 @@
+import uuid
+from sqlalchemy import UUID, Column, DateTime, ForeignKey, Index, Integer, Text, func
+
+from app.db.base_class import Base
+
+
+class WebhookOutboxEntry(Base):
+    """
+    One response waiting to be delivered to one webhook subscription.
+    Written in the same transaction as the response, so a committed response
+    is never lost to a crash before delivery; deleted once the receiver
+    acknowledges it. While a dispatcher holds an entry its next_attempt_at
+    is pushed out by a lease, so entries of a dispatcher that died are
+    retried when the lease runs out.
+    """
+    __tablename__ = "webhook_outbox"
+    __table_args__ = (
+        # Claiming: due entries, oldest first
+        Index("ix_webhook_outbox_next_attempt_at", "next_attempt_at"),
+        Index("ix_webhook_outbox_subscription_id", "subscription_id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    subscription_id = Column(
+        UUID(as_uuid=True), ForeignKey("webhook_subscriptions.id", ondelete="CASCADE"), nullable=False
+    )
+    # No foreign key into the partitioned responses table; both halves of its
+    # primary key are kept so the response is read with partition pruning.
+    response_id = Column(UUID(as_uuid=True), nullable=False)
+    response_created_at = Column(DateTime(timezone=True), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,27 @@
+import uuid
+from sqlalchemy import UUID, Column, DateTime, ForeignKey, Index, Integer, String, Text, func
+
+from app.db.base_class import Base
+
+
+class WebhookSubscription(Base):
+    """
+    A URL that receives a form's new responses. Deliveries are queued in
+    webhook_outbox and sent in signed batches by app.crud.webhook_dispatcher.
+    """
+    __tablename__ = "webhook_subscriptions"
+    __table_args__ = (
+        # Looked up on every submission to fill the outbox
+        Index("ix_webhook_subscriptions_form_id", "form_id"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    form_id = Column(UUID(as_uuid=True), ForeignKey("forms.id", ondelete="CASCADE"), nullable=False)
+    url = Column(String, nullable=False)
+    secret = Column(String, nullable=False) # HMAC key for the X-Formflow-Signature header
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Delivery health, for the owner's inspection
+    last_success_at = Column(DateTime(timezone=True), nullable=True)
+    last_failure_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    consecutive_failures = Column(Integer, nullable=False, default=0)
@@ -1,8 +1,9 @@
 import uuid
-from pydantic import BaseModel, Field
-from typing import List, Any, Optional, Dict
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from typing import List, Any, Literal, Optional, Dict
 from datetime import datetime
 
+from app.core.validation import compile_pattern
 from .user import User # Import User schema for relationship
 
 # Define the structure for a single field within the form definition
@@ -27,6 +28,15 @@ class FormField(BaseModel):
     validation: Optional[Dict[str, Any]] = {}
     config: Optional[Dict[str, Any]] = {}
 
+    @field_validator("validation")
+    @classmethod
+    def check_pattern(cls, validation: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        # Rejected here (422) rather than discovered on the first submission
+        pattern = (validation or {}).get("pattern")
+        if pattern:
+            compile_pattern(pattern)
+        return validation
+
 
 # Define the overall structure of the form 'data' field (now more specific)
 class FormData(BaseModel):
@@ -49,6 +59,60 @@ class FormUpdate(BaseModel):
     data: Optional[FormData] = None # New way
 
 
+# Many forms created in one request (POST /forms:batch)
+class FormBatchCreate(BaseModel):
+    forms: List[FormCreate] = Field(..., min_length=1)
+
+# Copies of an existing form (POST /forms/{form_id}:clone): either the ids to
+# give the copies, or how many copies to make with server-generated ids
+class FormClone(BaseModel):
+    ids: Optional[List[uuid.UUID]] = Field(None, min_length=1)
+    count: Optional[int] = Field(None, ge=1)
+    title: Optional[str] = None # Title for the copies; defaults to the source's
+
+    @model_validator(mode="after")
+    def _ids_or_count(self) -> "FormClone":
+        if (self.ids is None) == (self.count is None):
+            raise ValueError("Pass exactly one of 'ids' or 'count'")
+        return self
+
+# Forms deleted in one request (POST /forms:batchDelete)
+class FormBatchDelete(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1)
+
+class FormBatchDeleteResult(BaseModel):
+    deleted: List[uuid.UUID]
+    not_found: List[uuid.UUID] # Missing, already deleted, or owned by someone else
+    job_id: Optional[uuid.UUID] = None # Purges the deleted forms' responses; see GET /jobs/{job_id}
+
+
+# One RFC 6902 operation of a PATCH /forms/{form_id} body, applied to FormData
+class FormPatchOperation(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str = Field(..., examples=["/fields/3/label"])
+    value: Optional[Any] = None
+    from_: Optional[str] = Field(None, alias="from")
+
+    def to_patch(self) -> Dict[str, Any]:
+        # "value" may legitimately be null, so only keys the client sent are kept
+        operation = {"op": self.op, "path": self.path}
+        if "value" in self.model_fields_set:
+            operation["value"] = self.value
+        if self.from_ is not None:
+            operation["from"] = self.from_
+        return operation
+
+
+# Returned by PATCH: just the new version, so autosave replies stay small
+class FormPatchResult(BaseModel):
+    id: uuid.UUID
+    updated_at: datetime
+    title: Optional[str] = None
+    field_count: int = 0
+
+
 # Properties shared by models stored in DB
 class FormInDBBase(BaseModel):
     id: uuid.UUID
@@ -67,6 +131,18 @@ class Form(FormInDBBase):
     owner: User # Include owner information
 
 
+# Lightweight projection for the owner's form list (GET /forms/?view=summary)
+class FormListItem(BaseModel):
+    id: uuid.UUID
+    title: Optional[str] = None
+    field_count: int = 0
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 # Properties stored in DB
 class FormInDB(FormInDBBase):
     pass
\ No newline at end of file
@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+# Status of a background job (GET /jobs/{job_id}); long operations answer
+# 202 with this and a Location header pointing at it
+class Job(BaseModel):
+    id: uuid.UUID
+    kind: str
+    status: str # queued | running | succeeded | failed
+    form_id: Optional[uuid.UUID] = None
+    progress: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
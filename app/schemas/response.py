@@ -1,6 +1,6 @@
 import uuid
 from pydantic import BaseModel, Field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 # Properties to receive via API on creation
@@ -13,6 +13,10 @@ class ResponseCreate(BaseModel):
         "fld_jkl012": ["react", "python"]
     })
 
+# Many responses submitted to the same form in one request
+class ResponseBatchCreate(BaseModel):
+    responses: List[ResponseCreate] = Field(..., min_length=1)
+
 # Properties shared by models stored in DB
 class ResponseInDBBase(BaseModel):
     id: uuid.UUID
@@ -0,0 +1,23 @@
+import uuid
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class OptionCount(BaseModel):
+    value: str
+    label: Optional[str] = None # None for the "other" bucket (value ""), answers outside the defined options
+    count: int
+
+
+class FieldSummary(BaseModel):
+    field_id: str
+    label: Optional[str] = None
+    type: str
+    options: List[OptionCount]
+
+
+# Per-option answer breakdown for a form's choice fields
+class FormSummary(BaseModel):
+    form_id: uuid.UUID
+    total_responses: int
+    fields: List[FieldSummary]
@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from pydantic import AnyHttpUrl, BaseModel, Field
+
+
+# Subscribe a URL to a form's new responses
+class WebhookCreate(BaseModel):
+    url: AnyHttpUrl = Field(..., examples=["https://example.com/hooks/formflow"])
+    # Generated when omitted; returned only once, on creation
+    secret: Optional[str] = Field(None, min_length=16, max_length=256)
+
+
+class Webhook(BaseModel):
+    id: uuid.UUID
+    form_id: uuid.UUID
+    url: str
+    created_at: Optional[datetime] = None
+    last_success_at: Optional[datetime] = None
+    last_failure_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    consecutive_failures: int = 0
+    pending_deliveries: int = 0
+
+    class Config:
+        from_attributes = True
+
+
+# Returned by POST only: the secret for verifying X-Formflow-Signature
+class WebhookCreated(Webhook):
+    secret: str
@@ -0,0 +1,93 @@
+"""
+Compare response ingestion throughput: per-row commits vs write-behind batches.
+
+Runs against the database in DATABASE_URL (migrated with `alembic upgrade head`).
+A throwaway user and form are created and removed again afterwards.
+
+    python -m benchmarks.bench_ingest --count 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import delete
+
+from app.crud import crud_response
+from app.crud.response_batcher import ResponseBatcher
+from app.db.session import AsyncSessionFactory, engine
+from app.models.form import Form
+from app.models.response import Response
+from app.models.user import User
+from app.schemas.response import ResponseCreate
+
+ANSWERS = {"fld_name": "Alice Smith", "fld_email": "alice@example.com", "fld_color": "blue"}
+
+
+async def create_fixture() -> uuid.UUID:
+    async with AsyncSessionFactory() as db:
+        user = User(id=uuid.uuid4(), email=f"bench-{uuid.uuid4().hex}@example.com", hashed_password="x")
+        form = Form(id=uuid.uuid4(), owner_id=user.id, data={"title": "bench", "fields": []})
+        db.add_all([user, form])
+        await db.commit()
+        return form.id
+
+
+async def drop_fixture(form_id: uuid.UUID) -> None:
+    async with AsyncSessionFactory() as db:
+        owner_id = (await db.get(Form, form_id)).owner_id
+        await db.execute(delete(Response).where(Response.form_id == form_id))
+        await db.execute(delete(Form).where(Form.id == form_id))
+        await db.execute(delete(User).where(User.id == owner_id))
+        await db.commit()
+
+
+async def drive(count: int, concurrency: int, submit_one) -> float:
+    """
+    Run `count` submissions with at most `concurrency` in flight.
+    Returns elapsed wall-clock seconds.
+    """
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            await submit_one()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    return time.perf_counter() - started
+
+
+async def main(count: int, concurrency: int, batch_size: int, delay_ms: int) -> None:
+    form_id = await create_fixture()
+    try:
+        response_in = ResponseCreate(data=ANSWERS)
+
+        async def per_row():
+            async with AsyncSessionFactory() as db:
+                await crud_response.create_response(db, response_in=response_in, form_id=form_id)
+
+        elapsed = await drive(count, concurrency, per_row)
+        print(f"per-row : {count} responses in {elapsed:.2f}s -> {count / elapsed:,.0f} rows/s")
+
+        batcher = ResponseBatcher(max_batch_size=batch_size, max_delay=delay_ms / 1000)
+        await batcher.start()
+        try:
+            elapsed = await drive(count, concurrency, lambda: batcher.submit(form_id=form_id, data=ANSWERS))
+        finally:
+            await batcher.stop()
+        print(f"batched : {count} responses in {elapsed:.2f}s -> {count / elapsed:,.0f} rows/s "
+              f"(batch_size={batch_size}, delay={delay_ms}ms)")
+    finally:
+        await drop_fixture(form_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--delay-ms", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.concurrency, args.batch_size, args.delay_ms))
@@ -0,0 +1,86 @@
+"""
+Compare listing serialization: response_model re-validation vs the trusted path.
+
+"validated" mirrors what FastAPI does for `response_model=List[...]`: validate
+every ORM row through the pydantic schema (including the nested FormData tree
+and owner) and dump it to JSON. "trusted" is app.core.serialization, which
+writes the stored data straight to JSON bytes. No database is needed.
+
+    python -m benchmarks.bench_serialization --forms 100 --fields 200 --responses 5000
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from app.core import serialization
+from app.db import base # noqa F401 - register all mappers
+from app.models.form import Form
+from app.models.response import Response
+from app.models.user import User
+from app.schemas import form as form_schema
+from app.schemas import response as response_schema
+
+
+def make_forms(count: int, field_count: int) -> List[Form]:
+    now = datetime.now(timezone.utc)
+    owner = User(id=uuid.uuid4(), email="owner@example.com", hashed_password="x",
+                 is_active=True, is_superuser=False, created_at=now)
+    fields = []
+    for i in range(field_count):
+        field = form_schema.FormField(
+            id=f"fld_{i}", type="dropdown" if i % 3 == 0 else "text", order=i, label=f"Question {i}",
+            options=[form_schema.FormFieldOption(id=f"opt_{j}", value=f"v{j}", label=f"Option {j}") for j in range(5)]
+            if i % 3 == 0 else None,
+        )
+        fields.append(field)
+    data = form_schema.FormData(title="Benchmark form", fields=fields).model_dump()
+    return [
+        Form(id=uuid.uuid4(), owner_id=owner.id, owner=owner, data=data, created_at=now)
+        for _ in range(count)
+    ]
+
+
+def make_responses(count: int, form_id: uuid.UUID) -> List[Response]:
+    now = datetime.now(timezone.utc)
+    answers = {f"fld_{i}": f"answer {i}" for i in range(20)}
+    return [Response(id=uuid.uuid4(), form_id=form_id, data=answers, created_at=now) for _ in range(count)]
+
+
+def measure(label: str, fn: Callable[[], bytes], repeat: int) -> float:
+    fn() # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        size = len(fn())
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"  {label:<10} {elapsed * 1000:8.2f} ms/page  ({size / 1024:,.0f} KiB)")
+    return elapsed
+
+
+def main(form_count: int, field_count: int, response_count: int, repeat: int) -> None:
+    forms = make_forms(form_count, field_count)
+    forms_adapter = TypeAdapter(List[form_schema.Form])
+    print(f"forms listing: {form_count} forms x {field_count} fields")
+    slow = measure("validated", lambda: forms_adapter.dump_json(forms_adapter.validate_python(forms, from_attributes=True)), repeat)
+    fast = measure("trusted", lambda: serialization.dumps(serialization.forms_json(forms)), repeat)
+    print(f"  speedup    {slow / fast:8.1f}x")
+
+    responses = make_responses(response_count, forms[0].id)
+    responses_adapter = TypeAdapter(List[response_schema.Response])
+    print(f"responses listing: {response_count} rows")
+    slow = measure("validated", lambda: responses_adapter.dump_json(responses_adapter.validate_python(responses, from_attributes=True)), repeat)
+    fast = measure("trusted", lambda: serialization.dumps(serialization.responses_json(responses)), repeat)
+    print(f"  speedup    {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--forms", type=int, default=100)
+    parser.add_argument("--fields", type=int, default=200)
+    parser.add_argument("--responses", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    main(args.forms, args.fields, args.responses, args.repeat)
@@ -0,0 +1,117 @@
+"""
+In-process load and latency benchmark for the API.
+
+Starts the FastAPI app in this process (httpx ASGI transport, lifespan
+included) against the database in DATABASE_URL (migrated with
+`alembic upgrade head`), seeds synthetic users, forms and responses, and runs
+each scenario, reporting p50/p95/p99 latency, throughput and SQL queries per
+request. Exits with status 1 when a scenario regresses past the stored
+baseline by more than --tolerance.
+
+    python -m benchmarks.load --responses 1000000 --save-baseline
+    python -m benchmarks.load --manifest /tmp/bench.json --keep     # seed once
+    python -m benchmarks.load --manifest /tmp/bench.json --reuse    # re-run
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+
+from app.core.config import settings
+from app.db.session import engine, replica_engines
+from app.main import app
+from benchmarks.load import runner, seed
+from benchmarks.load.scenarios import API, SCENARIOS
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+
+
+async def login_all(client: httpx.AsyncClient, manifest) -> dict:
+    tokens = {}
+    for user in manifest["users"]:
+        response = await client.post(
+            f"{API}/auth/token", data={"username": user["email"], "password": seed.PASSWORD}
+        )
+        response.raise_for_status()
+        tokens[user["email"]] = response.json()["access_token"]
+    return tokens
+
+
+async def main(args: argparse.Namespace) -> int:
+    # SQL echo would dominate the measurements
+    for e in [engine] + replica_engines:
+        e.echo = False
+    # All traffic comes from one client IP; per-IP limits would turn the
+    # submission scenario into a 429 benchmark
+    settings.RATE_LIMIT_ENABLED = args.rate_limits
+
+    manifest_path = Path(args.manifest) if args.manifest else None
+    if args.reuse:
+        manifest = seed.load_manifest(manifest_path)
+    else:
+        print(f"seeding {args.users} users x {args.forms_per_user} forms, {args.responses:,} responses ...")
+        manifest = await seed.seed(
+            users=args.users,
+            forms_per_user=args.forms_per_user,
+            field_counts=args.field_counts,
+            responses=args.responses,
+        )
+        if manifest_path:
+            seed.save_manifest(manifest, manifest_path)
+
+    results = []
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                tokens = await login_all(client, manifest)
+                for name in args.scenarios:
+                    make_request = SCENARIOS[name](client, manifest, tokens)
+                    # Warm up caches and connection pools before measuring
+                    for n in range(args.warmup):
+                        await make_request(n)
+                    results.append(await runner.run_scenario(
+                        name, make_request, requests=args.requests, concurrency=args.concurrency
+                    ))
+    finally:
+        if not (args.keep or args.reuse):
+            await seed.cleanup(manifest)
+        await engine.dispose()
+
+    runner.print_results(results)
+    if args.save_baseline:
+        runner.save_results(results, BASELINE_PATH)
+        print(f"baseline written to {BASELINE_PATH}")
+        return 0
+
+    regressions = runner.compare_with_baseline(results, BASELINE_PATH, tolerance=args.tolerance)
+    if regressions is None:
+        print("no baseline found; run with --save-baseline to record one")
+        return 0
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--forms-per-user", type=int, default=20)
+    parser.add_argument("--field-counts", type=int, nargs="+", default=[5, 20, 50, 100])
+    parser.add_argument("--responses", type=int, default=100_000)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=2000, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95/throughput drift (fraction)")
+    parser.add_argument("--rate-limits", action="store_true", help="keep submission admission control enabled")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--manifest", help="where to write (or, with --reuse, read) the seed manifest")
+    parser.add_argument("--reuse", action="store_true", help="reuse data from --manifest instead of seeding")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded data for later --reuse runs")
+    args = parser.parse_args()
+    if args.reuse and not args.manifest:
+        parser.error("--reuse requires --manifest")
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.db import session as db_session
+
+
+class QueryCounter:
+    """
+    Counts statements sent to the primary and any replicas while enabled.
+    Scenarios run one at a time, so total / requests is the average number
+    of SQL queries per request for that scenario.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._engines = [db_session.engine.sync_engine] + [e.sync_engine for e in db_session.replica_engines]
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        self.count = 0
+        for engine in self._engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._on_execute)
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    throughput: float # requests per second
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries_per_request: float
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    name: str, make_request: Callable[[int], Awaitable[int]], *, requests: int, concurrency: int
+) -> ScenarioResult:
+    """
+    Issue `requests` calls of `make_request(n)` (which returns an HTTP status)
+    with `concurrency` workers and collect latency / throughput / query stats.
+    """
+    latencies: List[float] = []
+    errors = 0
+    counter_value = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for n in counter_value:
+            started = time.perf_counter()
+            status_code = await make_request(n)
+            latencies.append(time.perf_counter() - started)
+            if status_code >= 400:
+                errors += 1
+
+    with QueryCounter() as queries:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return ScenarioResult(
+        name=name,
+        requests=requests,
+        errors=errors,
+        throughput=requests / elapsed if elapsed else 0.0,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p95_ms=percentile(latencies, 95) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        queries_per_request=queries.count / requests if requests else 0.0,
+    )
+
+
+def print_results(results: List[ScenarioResult]) -> None:
+    print(f"{'scenario':<16}{'reqs':>8}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'sql/req':>9}")
+    for r in results:
+        print(f"{r.name:<16}{r.requests:>8}{r.errors:>8}{r.throughput:>10.1f}{r.p50_ms:>10.2f}{r.p95_ms:>10.2f}{r.p99_ms:>10.2f}{r.queries_per_request:>9.2f}")
+
+
+def save_results(results: List[ScenarioResult], path: Path) -> None:
+    path.write_text(json.dumps({r.name: asdict(r) for r in results}, indent=2))
+
+
+def compare_with_baseline(
+    results: List[ScenarioResult], baseline_path: Path, *, tolerance: float
+) -> Optional[List[str]]:
+    """
+    Return a list of regressions against the stored baseline (empty if none),
+    or None when there is no baseline to compare with.
+
+    A scenario regresses when p95 latency grows, or throughput drops, by more
+    than `tolerance` (a fraction), when it issues more SQL queries per request,
+    or when it starts returning errors.
+    """
+    if not baseline_path.exists():
+        return None
+    baseline: Dict[str, Dict[str, Any]] = json.loads(baseline_path.read_text())
+    regressions = []
+    for r in results:
+        base = baseline.get(r.name)
+        if base is None:
+            continue
+        if r.p95_ms > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{r.name}: p95 {r.p95_ms:.2f} ms > baseline {base['p95_ms']:.2f} ms")
+        if r.throughput < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{r.name}: throughput {r.throughput:.1f}/s < baseline {base['throughput']:.1f}/s")
+        if r.queries_per_request > base["queries_per_request"] + 0.01:
+            regressions.append(f"{r.name}: {r.queries_per_request:.2f} queries/request > baseline {base['queries_per_request']:.2f}")
+        if r.errors > base["errors"]:
+            regressions.append(f"{r.name}: {r.errors} errors > baseline {base['errors']}")
+    return regressions
@@ -0,0 +1,93 @@
+import itertools
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from benchmarks.load.seed import PASSWORD, make_answers
+
+API = settings.API_V1_STR
+
+# Each factory gets the HTTP client, the seed manifest and a map of
+# email -> bearer token, and returns a `make_request(n) -> status_code` callable.
+ScenarioFactory = Callable[[httpx.AsyncClient, Dict[str, Any], Dict[str, str]], Callable[[int], Awaitable[int]]]
+
+
+def _auth(tokens: Dict[str, str], email: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {tokens[email]}"}
+
+
+def submission(client, manifest, tokens):
+    """Public submission to the seeded forms, round-robin."""
+    forms = manifest["forms"]
+    form_data = manifest["form_data"]
+
+    async def make_request(n: int) -> int:
+        form = forms[n % len(forms)]
+        response = await client.post(
+            f"{API}/forms/{form['id']}/responses/",
+            json={"data": make_answers(form_data[form["id"]], n)},
+        )
+        return response.status_code
+    return make_request
+
+
+def form_read(client, manifest, tokens):
+    """Public read of a form definition."""
+    forms = manifest["forms"]
+
+    async def make_request(n: int) -> int:
+        response = await client.get(f"{API}/forms/{forms[n % len(forms)]['id']}")
+        return response.status_code
+    return make_request
+
+
+def owner_listing(client, manifest, tokens):
+    """The owner's full form list (first page)."""
+    users = manifest["users"]
+
+    async def make_request(n: int) -> int:
+        email = users[n % len(users)]["email"]
+        response = await client.get(f"{API}/forms/", params={"limit": 100}, headers=_auth(tokens, email))
+        return response.status_code
+    return make_request
+
+
+def response_pagination(client, manifest, tokens):
+    """
+    Walk the big form's responses with cursor pagination; each request fetches
+    the page after the previous one, restarting at the end.
+    """
+    big_form_id = manifest["big_form_id"]
+    owner_email = next(f["owner_email"] for f in manifest["forms"] if f["id"] == big_form_id)
+    headers = _auth(tokens, owner_email)
+    cursor: Optional[str] = None
+
+    async def make_request(n: int) -> int:
+        nonlocal cursor
+        params = {"limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(f"{API}/forms/{big_form_id}/responses/", params=params, headers=headers)
+        cursor = response.headers.get("x-next-cursor")
+        return response.status_code
+    return make_request
+
+
+def login(client, manifest, tokens):
+    """OAuth2 password login (bcrypt-bound)."""
+    emails = itertools.cycle([user["email"] for user in manifest["users"]])
+
+    async def make_request(n: int) -> int:
+        response = await client.post(f"{API}/auth/token", data={"username": next(emails), "password": PASSWORD})
+        return response.status_code
+    return make_request
+
+
+SCENARIOS: Dict[str, ScenarioFactory] = {
+    "submission": submission,
+    "form_read": form_read,
+    "owner_listing": owner_listing,
+    "response_page": response_pagination,
+    "login": login,
+}
@@ -0,0 +1,109 @@
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, insert
+
+from app.core.security import get_password_hash
+from app.db.session import AsyncSessionFactory
+from app.models.form import Form
+from app.models.form_field_stat import FormFieldStat
+from app.models.response import Response
+from app.models.user import User
+from app.schemas.form import FormData
+
+PASSWORD = "benchmark-password"
+INSERT_CHUNK = 5000
+
+FIELD_TYPES = ("text", "email", "dropdown", "checkbox", "textarea")
+
+
+def make_form_data(field_count: int, title: str) -> Dict[str, Any]:
+    fields = []
+    for i in range(field_count):
+        field_type = FIELD_TYPES[i % len(FIELD_TYPES)]
+        field: Dict[str, Any] = {"id": f"fld_{i}", "type": field_type, "order": i, "label": f"Question {i}"}
+        if field_type in ("dropdown", "checkbox"):
+            field["options"] = [{"id": f"opt_{j}", "value": f"v{j}", "label": f"Option {j}"} for j in range(5)]
+        fields.append(field)
+    # Round-trip through the schema so stored data has the normalized shape
+    return FormData(title=title, fields=fields).model_dump()
+
+
+def make_answers(form_data: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    answers: Dict[str, Any] = {}
+    for field in form_data["fields"]:
+        if field["type"] == "email":
+            answers[field["id"]] = f"user{seed}@example.com"
+        elif field["type"] == "dropdown":
+            answers[field["id"]] = field["options"][seed % len(field["options"])]["value"]
+        elif field["type"] == "checkbox":
+            answers[field["id"]] = [field["options"][seed % len(field["options"])]["value"]]
+        else:
+            answers[field["id"]] = f"answer {seed}"
+    return answers
+
+
+async def seed(
+    *, users: int, forms_per_user: int, field_counts: List[int], responses: int
+) -> Dict[str, Any]:
+    """
+    Create synthetic users, forms of varying field counts and `responses`
+    responses on one "big" form. Returns a manifest describing what was made.
+    Responses are written with multi-row INSERTs in chunks, so seeding millions
+    of rows is bounded by the database, not the ORM.
+    """
+    run_id = uuid.uuid4().hex[:8]
+    hashed_password = get_password_hash(PASSWORD)
+    manifest: Dict[str, Any] = {"run_id": run_id, "users": [], "forms": [], "form_data": {}, "big_form_id": None}
+
+    async with AsyncSessionFactory() as db:
+        user_rows, form_rows = [], []
+        for u in range(users):
+            user_id = uuid.uuid4()
+            email = f"bench-{run_id}-{u}@example.com"
+            user_rows.append({"id": user_id, "email": email, "hashed_password": hashed_password, "is_active": True, "is_superuser": False})
+            manifest["users"].append({"id": str(user_id), "email": email})
+            for f in range(forms_per_user):
+                field_count = field_counts[(u + f) % len(field_counts)]
+                data = make_form_data(field_count, f"Benchmark form {u}-{f}")
+                form_id = uuid.uuid4()
+                form_rows.append({"id": form_id, "owner_id": user_id, "data": data, "title": data["title"], "field_count": field_count})
+                manifest["forms"].append({"id": str(form_id), "owner_email": email, "field_count": field_count})
+                manifest["form_data"][str(form_id)] = data
+        await db.execute(insert(User), user_rows)
+        await db.execute(insert(Form), form_rows)
+        await db.commit()
+
+        # The big form belongs to the first user and has the median field count
+        big = sorted(manifest["forms"][:forms_per_user], key=lambda form: form["field_count"])[forms_per_user // 2]
+        manifest["big_form_id"] = big["id"]
+        big_data = manifest["form_data"][big["id"]]
+        for start in range(0, responses, INSERT_CHUNK):
+            rows = [
+                {"id": uuid.uuid4(), "form_id": uuid.UUID(big["id"]), "data": make_answers(big_data, n)}
+                for n in range(start, min(start + INSERT_CHUNK, responses))
+            ]
+            await db.execute(insert(Response), rows)
+            await db.commit()
+    return manifest
+
+
+async def cleanup(manifest: Dict[str, Any]) -> None:
+    form_ids = [uuid.UUID(form["id"]) for form in manifest["forms"]]
+    user_ids = [uuid.UUID(user["id"]) for user in manifest["users"]]
+    async with AsyncSessionFactory() as db:
+        await db.execute(delete(FormFieldStat).where(FormFieldStat.form_id.in_(form_ids)))
+        await db.execute(delete(Response).where(Response.form_id.in_(form_ids)))
+        await db.execute(delete(Form).where(Form.id.in_(form_ids)))
+        await db.execute(delete(User).where(User.id.in_(user_ids)))
+        await db.commit()
+
+
+def save_manifest(manifest: Dict[str, Any], path: Path) -> None:
+    path.write_text(json.dumps(manifest, indent=2))
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text())
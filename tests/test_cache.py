@@ -0,0 +1,54 @@
+from app.core import cache
+from app.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    entries = TTLCache(ttl=10)
+    entries.set("k", "v")
+    clock.now += 9.9
+    assert entries.get("k") == "v"
+    clock.now += 0.1
+    assert entries.get("k") is None
+    assert entries.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    entries = TTLCache(maxsize=2)
+    entries.set("a", 1)
+    entries.set("b", 2)
+    entries.get("a")
+    entries.set("c", 3)
+    assert entries.peek("b") is None
+    assert entries.peek("a") == 1 and entries.peek("c") == 3
+    assert entries.evictions == 1
+
+
+def test_set_with_stale_version_is_dropped():
+    entries = TTLCache()
+    version = entries.version
+    entries.invalidate("k")
+    entries.set("k", "stale", version=version)
+    assert entries.peek("k") is None
+    entries.set("k", "fresh", version=entries.version)
+    assert entries.peek("k") == "fresh"
+
+
+def test_peek_leaves_stats_alone():
+    entries = TTLCache()
+    entries.set("k", 1)
+    entries.peek("k")
+    entries.peek("missing")
+    assert (entries.hits, entries.misses) == (0, 0)
+    entries.get("k")
+    entries.get("missing")
+    assert entries.stats()["hit_ratio"] == 0.5
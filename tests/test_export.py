@@ -0,0 +1,39 @@
+import asyncio
+import csv
+import io
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.core.export import export_columns, iter_csv
+
+
+def export(rows, columns):
+    async def source():
+        for row in rows:
+            yield row
+
+    async def collect():
+        return "".join([chunk async for chunk in iter_csv(source(), columns)])
+
+    return list(csv.reader(io.StringIO(asyncio.run(collect()))))
+
+
+def test_columns_follow_field_order_and_skip_descriptions():
+    data = {"fields": [
+        {"id": "b", "type": "text", "order": 2},
+        {"id": "intro", "type": "description", "order": 0},
+        {"id": "a", "type": "text", "order": 1},
+    ]}
+    assert export_columns(data) == ["a", "b"]
+
+
+def test_formula_like_text_is_escaped():
+    row = SimpleNamespace(
+        id=uuid.uuid4(),
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        data={"a": "=HYPERLINK(\"x\")", "b": ["-1", "ok"], "c": -5, "d": "@sum", "e": "plain"},
+    )
+    header, line = export([row], ["a", "b", "c", "d", "e"])
+    assert header == ["response_id", "submitted_at", "a", "b", "c", "d", "e"]
+    assert line[2:] == ["'=HYPERLINK(\"x\")", "'-1; ok", "-5", "'@sum", "plain"]
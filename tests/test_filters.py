@@ -0,0 +1,50 @@
+import pytest
+
+from app.core.filters import MAX_PREDICATES, InvalidFilter, Predicate, matches, parse_filter, parse_filters
+
+
+@pytest.mark.parametrize(
+    "expression, predicate",
+    [
+        ("color:eq:red", Predicate("color", "eq", "red")),
+        ("note:contains:a:b", Predicate("note", "contains", "a:b")),
+        ("age:gte:18", Predicate("age", "gte", 18.0)),
+        ("email:exists", Predicate("email", "exists")),
+    ],
+)
+def test_parse_filter(expression, predicate):
+    assert parse_filter(expression) == predicate
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["bad id:eq:x", "color", "color:eq", "color:like:x", "age:gt:old", "age:lt:nan", "age:lt:inf"],
+)
+def test_invalid_filters(expression):
+    with pytest.raises(InvalidFilter):
+        parse_filter(expression)
+
+
+def test_too_many_filters():
+    with pytest.raises(InvalidFilter):
+        parse_filters(["a:exists"] * (MAX_PREDICATES + 1))
+
+
+@pytest.mark.parametrize(
+    "expression, answers, expected",
+    [
+        ("color:eq:red", {"color": "red"}, True),
+        ("color:eq:red", {"color": "Red"}, False),
+        ("color:eq:red", {"color": ["red", "blue"]}, True),
+        ("color:contains:red", {"color": ["red"]}, True),
+        ("color:contains:red", {"color": "red"}, False),
+        ("age:gt:18", {"age": 19}, True),
+        ("age:gt:18", {"age": "19"}, False),
+        ("age:gt:18", {"age": True}, False),
+        ("age:lte:18", {"age": [30, 10]}, True),
+        ("email:exists", {"email": None}, True),
+        ("email:exists", {}, False),
+    ],
+)
+def test_matches(expression, answers, expected):
+    assert matches(parse_filter(expression), answers) is expected
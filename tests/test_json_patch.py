@@ -0,0 +1,90 @@
+import pytest
+
+from app.core.form_patch import FormPatchValidationError, apply_form_patch
+from app.core.json_patch import JsonPatchError, JsonPatchTestFailed, apply_patch
+
+DOCUMENT = {"title": "T", "tags": ["a", "b"], "nested": {"x": 1}, "other": {"y": 2}}
+
+
+def test_operations_apply_in_order():
+    patched = apply_patch(DOCUMENT, [
+        {"op": "add", "path": "/tags/-", "value": "c"},
+        {"op": "add", "path": "/tags/0", "value": "z"},
+        {"op": "remove", "path": "/tags/1"},
+        {"op": "replace", "path": "/title", "value": "U"},
+        {"op": "move", "from": "/nested/x", "path": "/moved"},
+        {"op": "copy", "from": "/moved", "path": "/copied"},
+        {"op": "test", "path": "/copied", "value": 1},
+    ])
+    assert patched == {"title": "U", "tags": ["z", "b", "c"], "nested": {}, "other": {"y": 2}, "moved": 1, "copied": 1}
+
+
+def test_input_is_untouched_and_unchanged_parts_are_shared():
+    patched = apply_patch(DOCUMENT, [{"op": "replace", "path": "/nested/x", "value": 5}])
+    assert DOCUMENT["nested"] == {"x": 1}
+    assert patched["nested"] == {"x": 5}
+    assert patched["other"] is DOCUMENT["other"]
+
+
+def test_pointer_escapes():
+    assert apply_patch({"a/b": {"c~d": 1}}, [{"op": "replace", "path": "/a~1b/c~0d", "value": 2}]) == {"a/b": {"c~d": 2}}
+
+
+def test_failed_test_operation():
+    with pytest.raises(JsonPatchTestFailed):
+        apply_patch(DOCUMENT, [{"op": "test", "path": "/title", "value": "nope"}])
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "remove", "path": "/missing"},
+        {"op": "add", "path": "/tags/5", "value": 1},
+        {"op": "add", "path": "/tags/01", "value": 1},
+        {"op": "replace", "path": "/title"},
+        {"op": "move", "from": "/nested", "path": "/nested/inside"},
+        {"op": "add", "path": "no-slash", "value": 1},
+        {"op": "frobnicate", "path": "/title"},
+    ],
+)
+def test_invalid_operations(operation):
+    with pytest.raises(JsonPatchError):
+        apply_patch(DOCUMENT, [operation])
+
+
+FORM = {
+    "title": "Survey",
+    "description": None,
+    "settings": {},
+    "fields": [
+        {"id": "a", "type": "text", "order": 0, "label": "A"},
+        {"id": "b", "type": "text", "order": 1, "label": "B"},
+    ],
+}
+
+
+def test_form_patch_keeps_untouched_fields_and_normalizes_new_ones():
+    patched = apply_form_patch(FORM, [
+        {"op": "add", "path": "/fields/-", "value": {"id": "c", "type": "email", "order": 2}},
+        {"op": "replace", "path": "/title", "value": "Renamed"},
+    ])
+    assert patched["title"] == "Renamed"
+    assert patched["fields"][0] is FORM["fields"][0]
+    assert patched["fields"][2]["required"] is False
+    assert FORM["title"] == "Survey"
+
+
+def test_form_patch_reports_errors_with_their_location():
+    with pytest.raises(FormPatchValidationError) as info:
+        apply_form_patch(FORM, [
+            {"op": "remove", "path": "/fields/1/type"},
+            {"op": "add", "path": "/fields/0/validation", "value": {"pattern": "(a+)+"}},
+        ])
+    locations = [error["loc"][:3] for error in info.value.errors]
+    assert ["fields", 0, "validation"] in locations
+    assert ["fields", 1, "type"] in locations
+
+
+def test_form_patch_needs_a_list_of_fields():
+    with pytest.raises(FormPatchValidationError):
+        apply_form_patch(FORM, [{"op": "replace", "path": "/fields", "value": {}}])
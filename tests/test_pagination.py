@@ -0,0 +1,48 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone(timedelta(hours=2)))
+    row_id = uuid.uuid4()
+    cursor = encode_cursor(created_at, row_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, row_id)
+
+
+@pytest.mark.parametrize("cursor", [None, ""])
+def test_no_cursor(cursor):
+    assert decode_cursor(cursor) is None
+
+
+def test_naive_timestamps_are_read_as_utc():
+    row_id = uuid.uuid4()
+    created_at, decoded_id = decode_cursor(raw_cursor(["2024-05-01T12:00:00", str(row_id)]))
+    assert created_at == datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+    assert decoded_id == row_id
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        raw_cursor({"a": 1}),
+        raw_cursor(["2024-05-01T12:00:00+00:00"]),
+        raw_cursor(["yesterday", str(uuid.uuid4())]),
+        raw_cursor(["2024-05-01T12:00:00+00:00", "not-a-uuid"]),
+        raw_cursor([1, 2]),
+    ],
+)
+def test_malformed_cursors(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
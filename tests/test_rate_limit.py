@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from app.core.rate_limit import TokenBucketLimiter, form_rate_limits
+
+
+def test_burst_then_refill():
+    limiter = TokenBucketLimiter()
+    for _ in range(3):
+        assert limiter.acquire("k", rate=1, burst=3, now=100.0) == 0
+    assert limiter.acquire("k", rate=1, burst=3, now=100.0) == pytest.approx(1.0)
+    assert limiter.acquire("k", rate=1, burst=3, now=100.5) == pytest.approx(0.5)
+    assert limiter.acquire("k", rate=1, burst=3, now=101.0) == 0
+
+
+def test_refill_is_capped_at_burst():
+    limiter = TokenBucketLimiter()
+    assert limiter.acquire("k", rate=10, burst=2, cost=2, now=0.0) == 0
+    assert limiter.acquire("k", rate=10, burst=2, cost=2, now=1000.0) == 0
+    assert limiter.acquire("k", rate=10, burst=2, now=1000.0) > 0
+
+
+def test_cost_above_burst_can_never_succeed():
+    limiter = TokenBucketLimiter()
+    assert limiter.acquire("k", rate=1, burst=5, cost=6, now=0.0) == math.inf
+    # Nothing was taken
+    assert limiter.acquire("k", rate=1, burst=5, cost=5, now=0.0) == 0
+
+
+def test_a_refused_cost_takes_nothing():
+    limiter = TokenBucketLimiter()
+    assert limiter.acquire("k", rate=1, burst=4, cost=3, now=0.0) == 0
+    assert limiter.acquire("k", rate=1, burst=4, cost=3, now=0.0) == pytest.approx(2.0)
+    assert limiter.acquire("k", rate=1, burst=4, cost=1, now=0.0) == 0
+
+
+def test_zero_rate_disables_the_limit():
+    limiter = TokenBucketLimiter()
+    for _ in range(100):
+        assert limiter.acquire("k", rate=0, burst=1, cost=50, now=0.0) == 0
+
+
+def test_acquire_all_takes_from_every_bucket_or_none():
+    limiter = TokenBucketLimiter()
+    assert limiter.acquire("form", rate=1, burst=2, cost=2, now=0.0) == 0
+    index, wait = limiter.acquire_all([("ip", 1, 5), ("form", 1, 2)], cost=1, now=0.0)
+    assert index == 1 and wait == pytest.approx(1.0)
+    # The ip bucket was not debited by the refused call
+    assert limiter.acquire("ip", rate=1, burst=5, cost=5, now=0.0) == 0
+    assert limiter.acquire_all([("ip", 1, 5), ("form", 1, 2)], cost=1, now=1.0) == (None, 0.0)
+
+
+def test_acquire_all_reports_the_first_bucket_too_small():
+    limiter = TokenBucketLimiter()
+    assert limiter.acquire_all([("ip", 1, 10), ("form", 1, 3)], cost=4, now=0.0) == (1, math.inf)
+
+
+def test_least_recently_used_buckets_are_evicted():
+    limiter = TokenBucketLimiter(maxsize=2)
+    for key in ("a", "b", "c"):
+        limiter.acquire(key, rate=1, burst=1, now=0.0)
+    # "a" was evicted and starts over with a full bucket
+    assert limiter.acquire("a", rate=1, burst=1, now=0.0) == 0
+    assert limiter.acquire("c", rate=1, burst=1, now=0.0) > 0
+
+
+def test_form_rate_limit_overrides():
+    defaults = {"perSecond": 10.0, "burst": 20.0}
+    settings = {"rateLimit": {"perSecond": 1, "burst": "lots", "unknown": 5, "perIpBurst": True}}
+    assert form_rate_limits(settings, defaults) == {"perSecond": 1.0, "burst": 20.0}
+    assert form_rate_limits(None, defaults) == defaults
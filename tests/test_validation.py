@@ -0,0 +1,85 @@
+import pytest
+
+from app.core.validation import (
+    OTHER_OPTION,
+    CompiledFormValidator,
+    ResponseValidationError,
+    compile_pattern,
+)
+
+FORM = {
+    "fields": [
+        {"id": "name", "type": "text", "required": True, "minLength": 2, "maxLength": 5},
+        {"id": "email", "type": "email"},
+        {"id": "color", "type": "dropdown", "options": [{"value": "red"}, {"value": "blue"}]},
+        {"id": "tags", "type": "checkbox", "options": [{"value": "a"}, {"value": "b"}]},
+        {"id": "extra", "type": "multiple_choice", "options": [{"value": "x"}], "otherOption": True},
+        {"id": "code", "type": "number", "validation": {"pattern": "[0-9]+"}},
+        {"id": "intro", "type": "description"},
+    ]
+}
+
+
+def errors_for(answers):
+    with pytest.raises(ResponseValidationError) as info:
+        CompiledFormValidator(FORM).validate(answers)
+    return info.value.errors
+
+
+def test_valid_answers_pass():
+    CompiledFormValidator(FORM).validate(
+        {"name": "Ada", "email": "ada@example.com", "color": "red", "tags": ["a", "b"], "extra": "free text", "code": "42"}
+    )
+
+
+def test_missing_required_and_unknown_fields():
+    errors = errors_for({"intro": "x", "nope": 1})
+    assert errors == {"intro": "Unknown field.", "nope": "Unknown field.", "name": "This field is required."}
+
+
+def test_empty_required_answer_is_rejected():
+    assert errors_for({"name": ""}) == {"name": "This field is required."}
+
+
+@pytest.mark.parametrize(
+    "answers, field",
+    [
+        ({"name": "A"}, "name"),
+        ({"name": "Adaline"}, "name"),
+        ({"name": 12}, "name"),
+        ({"name": "Ada", "email": "not-an-email"}, "email"),
+        ({"name": "Ada", "color": "green"}, "color"),
+        ({"name": "Ada", "color": ["red"]}, "color"),
+        ({"name": "Ada", "tags": "a"}, "tags"),
+        ({"name": "Ada", "tags": ["a", "c"]}, "tags"),
+    ],
+)
+def test_invalid_answers_are_reported_per_field(answers, field):
+    assert list(errors_for(answers)) == [field]
+
+
+def test_pattern_applies_to_any_string_answer():
+    assert errors_for({"name": "Ada", "code": "4x"}) == {"code": "Value does not match the expected format."}
+
+
+def test_pattern_must_match_the_whole_value():
+    assert errors_for({"name": "Ada", "code": "42 "}) == {"code": "Value does not match the expected format."}
+
+
+@pytest.mark.parametrize("pattern", ["(a+)+$", "(a*)*", "x" * 501, "([a-z]", 5])
+def test_unsafe_or_invalid_patterns_are_refused(pattern):
+    with pytest.raises(ValueError):
+        compile_pattern(pattern)
+
+
+def test_count_options_buckets_answers_outside_the_options():
+    counts = {}
+    validator = CompiledFormValidator(FORM)
+    validator.count_options({"color": "red", "tags": ["a", "a", "zzz"], "extra": "anything"}, counts)
+    validator.count_options({"color": "red", "extra": "something else"}, counts)
+    assert counts == {
+        ("color", "red"): 2,
+        ("tags", "a"): 1,
+        ("tags", OTHER_OPTION): 1,
+        ("extra", OTHER_OPTION): 2,
+    }